@@ -1,3 +1,7 @@
+import secrets
+from typing import Optional
+from fastapi import Depends, HTTPException, status
+from fastapi.security import HTTPBasic, HTTPBasicCredentials
 from sqladmin.authentication import AuthenticationBackend
 from starlette.requests import Request
 from starlette.responses import RedirectResponse
@@ -24,3 +28,24 @@ class AdminAuth(AuthenticationBackend):
         return True
 
 authentication_backend = AdminAuth(secret_key=settings.SECRET_KEY)
+
+
+http_basic = HTTPBasic(auto_error=False)
+
+def require_admin(request: Request, credentials: Optional[HTTPBasicCredentials] = Depends(http_basic)):
+    """
+    API dependency for admin-only endpoints: accepts the admin panel session
+    or HTTP Basic credentials (for scripts and curl).
+    """
+    if request.session.get("token"):
+        return
+    if credentials and (
+        secrets.compare_digest(credentials.username.encode(), settings.ADMIN_USER.encode())
+        and secrets.compare_digest(credentials.password.encode(), settings.ADMIN_PASSWORD.encode())
+    ):
+        return
+    raise HTTPException(
+        status_code=status.HTTP_401_UNAUTHORIZED,
+        detail="Admin credentials required",
+        headers={"WWW-Authenticate": "Basic"}
+    )
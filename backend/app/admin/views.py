@@ -1,13 +1,13 @@
 from sqladmin import ModelView
-from app.models.models import Debate, DebateParticipant, Turn, Session
+from app.models.models import Debate, DebateParticipant, Turn, Session, ModelStats, Tournament, RejudgeRun, Verdict
 
 class DebateAdmin(ModelView, model=Debate):
-    column_list = [Debate.id, Debate.status, Debate.created_at, Debate.session_id]
+    column_list = [Debate.id, Debate.status, Debate.created_at, Debate.session_id, Debate.winner]
     can_delete = False
     name = "Debate"
     name_plural = "Debates"
     icon = "fa-solid fa-comments"
-    column_searchable_list = [Debate.id, Debate.session_id]
+    column_searchable_list = [Debate.id, Debate.session_id, Debate.title]
     column_sortable_list = [Debate.created_at, Debate.status]
 
 class ParticipantAdmin(ModelView, model=DebateParticipant):
@@ -30,3 +30,39 @@ class SessionAdmin(ModelView, model=Session):
     name = "Session"
     name_plural = "Sessions"
     icon = "fa-solid fa-user"
+
+class ModelStatsAdmin(ModelView, model=ModelStats):
+    column_list = [ModelStats.model_id, ModelStats.role, ModelStats.debates, ModelStats.wins, ModelStats.losses, ModelStats.draws, ModelStats.turns, ModelStats.cost, ModelStats.updated_at]
+    column_sortable_list = [ModelStats.wins, ModelStats.debates, ModelStats.cost, ModelStats.turns]
+    column_searchable_list = [ModelStats.model_id]
+    can_create = False
+    can_edit = False
+    can_delete = False
+    name = "Model Stats"
+    name_plural = "Leaderboard"
+    icon = "fa-solid fa-trophy"
+
+class TournamentAdmin(ModelView, model=Tournament):
+    column_list = [Tournament.id, Tournament.name, Tournament.format, Tournament.status, Tournament.debates_completed, Tournament.debates_failed, Tournament.debates_total, Tournament.created_at]
+    can_create = False
+    can_edit = False
+    name = "Tournament"
+    name_plural = "Tournaments"
+    icon = "fa-solid fa-sitemap"
+
+class RejudgeRunAdmin(ModelView, model=RejudgeRun):
+    column_list = [RejudgeRun.id, RejudgeRun.status, RejudgeRun.judge_models, RejudgeRun.debates_done, RejudgeRun.verdicts_done, RejudgeRun.failures, RejudgeRun.cost, RejudgeRun.updated_at]
+    can_create = False
+    can_edit = False
+    name = "Rejudge Run"
+    name_plural = "Rejudge Runs"
+    icon = "fa-solid fa-gavel"
+
+class VerdictAdmin(ModelView, model=Verdict):
+    column_list = [Verdict.run_id, Verdict.debate_id, Verdict.judge_model, Verdict.winner, Verdict.confidence, Verdict.created_at]
+    column_searchable_list = [Verdict.run_id, Verdict.judge_model]
+    can_create = False
+    can_edit = False
+    name = "Verdict"
+    name_plural = "Verdicts"
+    icon = "fa-solid fa-scale-balanced"
@@ -0,0 +1,54 @@
+from fastapi import APIRouter, Depends, Query
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.future import select
+from typing import List, Dict, Any, Optional
+
+from app.core.db import get_db
+from app.models.models import ModelStats
+from app.services.leaderboard import leaderboard_row
+from app.services.completion_cache import cache_stats
+
+router = APIRouter()
+
+SORT_COLUMNS = {
+    "wins": ModelStats.wins,
+    "debates": ModelStats.debates,
+    "cost": ModelStats.cost,
+    "turns": ModelStats.turns,
+}
+
+@router.get("/leaderboard", response_model=List[Dict[str, Any]])
+async def get_leaderboard(
+    role: Optional[str] = "debater",
+    sort: str = Query("wins", pattern="^(wins|debates|cost|turns)$"),
+    limit: int = Query(50, ge=1, le=500),
+    db: AsyncSession = Depends(get_db)
+) -> List[Dict[str, Any]]:
+    """
+    Model leaderboard. Reads only the incrementally maintained rollups,
+    so the cost does not depend on how many debates have run.
+    """
+    stmt = select(ModelStats)
+    if role:
+        stmt = stmt.where(ModelStats.role == role)
+    stmt = stmt.order_by(SORT_COLUMNS[sort].desc(), ModelStats.model_id).limit(limit)
+    result = await db.execute(stmt)
+    return [leaderboard_row(s) for s in result.scalars().all()]
+
+
+@router.get("/models/{model_id:path}", response_model=List[Dict[str, Any]])
+async def get_model_stats(model_id: str, db: AsyncSession = Depends(get_db)) -> List[Dict[str, Any]]:
+    """
+    Per-role rollups for one model.
+    """
+    stmt = select(ModelStats).where(ModelStats.model_id == model_id).order_by(ModelStats.role)
+    result = await db.execute(stmt)
+    return [leaderboard_row(s) for s in result.scalars().all()]
+
+
+@router.get("/completion-cache", response_model=Dict[str, Any])
+def get_completion_cache_stats() -> Dict[str, Any]:
+    """
+    Hit/miss counters and size of the completion cache (see COMPLETION_CACHE).
+    """
+    return cache_stats()
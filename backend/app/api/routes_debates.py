@@ -1,34 +1,126 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response, status
+from fastapi.responses import FileResponse
+from starlette.concurrency import run_in_threadpool
+from sqlalchemy import func, tuple_
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.future import select
-from sqlalchemy.orm import selectinload
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Optional, Tuple
+from datetime import datetime
+import base64
 import uuid
 
 from app.core.db import get_db
-from app.models.models import Debate, DebateParticipant
+from app.core.serialization import dumps, dumps_str
+from app.models.models import Debate, DebateParticipant, Turn, TurnArchive
 from app.schemas.schemas import DebateConfig, DebateResponse
 from app.services.queue_manager import enqueue_debate_start
+from app.services.debate_cache import get_cached_debate, set_cached_debate, invalidate_debate
+from app.services.snapshots import find_snapshot, snapshot_hash, delete_snapshot
+from app.services.search import search_debates, ts_config_for
+from app.services.analytics import config_filters, participant_filter
+from app.services.archive import read_archived_turns
+from app.services.estimator import new_budget, plan_debate, unpriced_under_cap
 
 router = APIRouter()
 
+# Completed debates are immutable, but can still be deleted
+COMPLETED_CACHE_CONTROL = "public, max-age=3600"
+SNAPSHOT_CACHE_CONTROL = "public, max-age=86400, stale-while-revalidate=604800"
+
+def _encode_cursor(created_at: datetime, debate_id: uuid.UUID) -> str:
+    """Opaque keyset cursor pointing at the last row of a page."""
+    raw = f"{created_at.isoformat()}|{debate_id}"
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+
+def _decode_cursor(cursor: str) -> Tuple[datetime, uuid.UUID]:
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        created_at_str, id_str = base64.urlsafe_b64decode(padded).decode().split("|", 1)
+        return datetime.fromisoformat(created_at_str), uuid.UUID(id_str)
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
+
 @router.get("", response_model=List[Dict[str, Any]])
-async def list_debates(db: AsyncSession = Depends(get_db)) -> List[Dict[str, Any]]:
-    """List all debates ordered by creation time."""
-    stmt = select(Debate).order_by(Debate.created_at.desc())
+async def list_debates(
+    response: Response,
+    limit: int = Query(50, ge=1, le=200),
+    cursor: Optional[str] = None,
+    status_filter: Optional[str] = Query(None, alias="status"),
+    session_id: Optional[str] = None,
+    language: Optional[str] = None,
+    debate_preset_id: Optional[str] = None,
+    length_preset: Optional[str] = None,
+    intensity: Optional[int] = None,
+    model_id: Optional[str] = None,
+    model_role: Optional[str] = None,
+    db: AsyncSession = Depends(get_db)
+) -> List[Dict[str, Any]]:
+    """
+    List debates ordered by creation time (newest first).
+    Keyset-paginated on (created_at, id): pass the X-Next-Cursor header
+    of the previous page as `cursor` to fetch the next one.
+    Config filters (language, preset, intensity, participating model) use
+    the JSONB indexes on config_json.
+    """
+    # Project only the listed columns so JSON blobs are never fetched
+    stmt = select(Debate.id, Debate.title, Debate.status, Debate.created_at)
+    if status_filter:
+        stmt = stmt.where(Debate.status == status_filter)
+    if session_id:
+        stmt = stmt.where(Debate.session_id == session_id)
+    for clause in config_filters(language, debate_preset_id, length_preset, intensity):
+        stmt = stmt.where(clause)
+    if model_id:
+        stmt = stmt.where(participant_filter(model_id, model_role))
+    if cursor:
+        cursor_created_at, cursor_id = _decode_cursor(cursor)
+        stmt = stmt.where(tuple_(Debate.created_at, Debate.id) < tuple_(cursor_created_at, cursor_id))
+
+    # Fetch one extra row to know whether another page exists
+    stmt = stmt.order_by(Debate.created_at.desc(), Debate.id.desc()).limit(limit + 1)
     result = await db.execute(stmt)
-    debates = result.scalars().all()
+    rows = result.all()
+
+    if len(rows) > limit:
+        rows = rows[:limit]
+        last = rows[-1]
+        response.headers["X-Next-Cursor"] = _encode_cursor(last.created_at, last.id)
+
     return [
         {
-            "id": str(d.id),
-            "title": d.title,
-            "status": d.status,
-            "created_at": d.created_at
+            "id": str(row.id),
+            "title": row.title,
+            "status": row.status,
+            "created_at": row.created_at
         }
-        for d in debates
+        for row in rows
     ]
 
 
+@router.get("/search", response_model=List[Dict[str, Any]])
+async def search(
+    q: str = Query(..., min_length=2, max_length=200),
+    language: Optional[str] = None,
+    limit: int = Query(20, ge=1, le=100),
+    db: AsyncSession = Depends(get_db)
+) -> List[Dict[str, Any]]:
+    """
+    Full-text search over what was said (turn text) and debate titles/topics.
+    `language` restricts matching to one text search configuration.
+    """
+    return await search_debates(db, q, language=language, limit=limit)
+
+
+@router.post("/estimate", response_model=Dict[str, Any])
+async def estimate_debate(config: DebateConfig, db: AsyncSession = Depends(get_db)):
+    """
+    Predict tokens, cost and duration of a debate config without starting it.
+    """
+    estimate, _ = await plan_debate(db, config.model_dump())
+    return estimate
+
 @router.post("", response_model=DebateResponse, status_code=status.HTTP_201_CREATED)
 async def create_debate(
     config: DebateConfig,
@@ -37,16 +129,26 @@ async def create_debate(
     """
     Create a new debate and enqueue it for processing.
     """
-    # 1. Create Debate record
+    # 1. Estimate, and fix the budget with today's catalog prices
+    config_json = config.model_dump()
+    estimate, prices = await plan_debate(db, config_json)
+    budget = new_budget(config_json, prices, estimate)
+    unpriced = unpriced_under_cap(budget)
+    if unpriced:
+        raise HTTPException(status_code=503, detail=f"No catalog price for {', '.join(unpriced)}: the cost cap cannot be enforced")
+
+    # 2. Create Debate record
     new_debate = Debate(
         title=f"Debate: {config.topic}",
-        config_json=config.model_dump(),
-        status="queued"
+        config_json=config_json,
+        status="queued",
+        search_config=ts_config_for(config.language),
+        budget_json=budget
     )
     db.add(new_debate)
     await db.flush() # flush to get ID
     
-    # 2. Add Participants (for analytics)
+    # 3. Add Participants (for analytics)
     # Moderator
     mod_config = next((p for p in config.participants if p.role == 'moderator'), None)
     if mod_config:
@@ -75,7 +177,7 @@ async def create_debate(
     
     await db.commit()
     
-    # 3. Enqueue Job
+    # 4. Enqueue Job
     try:
         enqueue_debate_start(str(new_debate.id))
     except Exception as e:
@@ -86,10 +188,16 @@ async def create_debate(
         await db.commit()
         raise HTTPException(status_code=500, detail="Failed to start debate worker")
         
+    message = "Debate created and queued successfully"
+    if budget["max_cost_usd"] and estimate["cost_usd"] > budget["max_cost_usd"]:
+        message += f" (estimated ${estimate['cost_usd']:.4f} exceeds the ${budget['max_cost_usd']:.4f} budget: it will end early)"
+    elif budget["max_tokens"] and estimate["tokens_in"] + estimate["tokens_out"] > budget["max_tokens"]:
+        message += f" (estimated {estimate['tokens_in'] + estimate['tokens_out']} tokens exceed the {budget['max_tokens']} token budget: it will end early)"
     return {
         "debate_id": str(new_debate.id),
         "status": "queued",
-        "message": "Debate created and queued successfully"
+        "message": message,
+        "estimate": estimate
     }
 
 @router.delete("/{debate_id}", status_code=status.HTTP_204_NO_CONTENT)
@@ -106,48 +214,169 @@ async def delete_debate(debate_id: str, db: AsyncSession = Depends(get_db)):
     
     await db.delete(debate)
     await db.commit()
+    await invalidate_debate(debate_id)
+    delete_snapshot(debate_id)
     return None
 
+
+def _debate_etag(debate_status: str, latest_seq: Optional[int]) -> str:
+    """Weak ETag: a debate only changes when a turn is committed or its status moves."""
+    return f'W/"{latest_seq if latest_seq is not None else -1}-{debate_status}"'
+
+
+def _etag_matches(request: Request, etag: str) -> bool:
+    if_none_match = request.headers.get("if-none-match")
+    if not if_none_match:
+        return False
+    candidates = [tag.strip() for tag in if_none_match.split(",")]
+    # Weak comparison: ignore the W/ prefix on both sides
+    return "*" in candidates or etag.removeprefix("W/") in [c.removeprefix("W/") for c in candidates]
+
+
 @router.get("/{debate_id}", response_model=Dict[str, Any])
-async def get_debate(debate_id: str, db: AsyncSession = Depends(get_db)) -> Dict[str, Any]:
+async def get_debate(
+    debate_id: str,
+    request: Request,
+    since_seq: Optional[int] = Query(None, ge=-1, description="Only return turns with seq_index greater than this"),
+    limit: Optional[int] = Query(None, ge=1, le=500, description="Maximum number of turns to return"),
+    db: AsyncSession = Depends(get_db)
+) -> Any:
     """
     Get debate details and status, including turns and participants.
+    Supports incremental polling via `since_seq`, turn ranges via
+    `since_seq` + `limit`, and conditional requests via ETag/If-None-Match.
     """
     try:
         uuid_id = uuid.UUID(debate_id)
     except ValueError:
         raise HTTPException(status_code=400, detail="Invalid UUID")
 
-    stmt = (
-        select(Debate)
-        .options(selectinload(Debate.turns), selectinload(Debate.participants))
-        .where(Debate.id == uuid_id)
+    is_full_fetch = since_seq is None and limit is None
+
+    # Completed debates never change: serve the full transcript straight from cache
+    if is_full_fetch:
+        cached = await get_cached_debate(debate_id)
+        if cached:
+            etag, body = cached
+            headers = {"ETag": etag, "Cache-Control": COMPLETED_CACHE_CONTROL}
+            if _etag_matches(request, etag):
+                return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+            return Response(content=body, media_type="application/json", headers=headers)
+
+    # Cheap head query: latest seq comes from the (debate_id, seq_index) index
+    latest_seq_subq = (
+        select(func.max(Turn.seq_index))
+        .where(Turn.debate_id == uuid_id, Turn.created_at >= Debate.created_at)
+        .scalar_subquery()
     )
-    result = await db.execute(stmt)
-    debate = result.scalar_one_or_none()
+    head_stmt = select(
+        Debate.id, Debate.status, Debate.title, Debate.created_at, latest_seq_subq.label("latest_seq")
+    ).where(Debate.id == uuid_id)
+    head = (await db.execute(head_stmt)).one_or_none()
     
-    if not debate:
+    if not head:
         raise HTTPException(status_code=404, detail="Debate not found")
-        
-    return {
-        "id": str(debate.id),
-        "status": debate.status,
-        "title": debate.title,
-        "created_at": debate.created_at,
+
+    latest_seq = head.latest_seq
+    archive: Optional[TurnArchive] = None
+    if latest_seq is None:
+        # Cold debates: turns live in the archive and are rehydrated on demand
+        archive = await db.get(TurnArchive, uuid_id)
+        if archive:
+            latest_seq = archive.last_seq
+
+    etag = _debate_etag(head.status, latest_seq)
+    is_completed = head.status == "completed"
+    headers = {
+        "ETag": etag,
+        "Cache-Control": COMPLETED_CACHE_CONTROL if is_completed else "no-cache",
+    }
+    if _etag_matches(request, etag):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+
+    participants_stmt = (
+        select(
+            DebateParticipant.persona_name, DebateParticipant.role, DebateParticipant.model_id,
+            DebateParticipant.voice_name, DebateParticipant.avatar_url
+        )
+        .where(DebateParticipant.debate_id == uuid_id)
+        .order_by(DebateParticipant.id)
+    )
+    participants = (await db.execute(participants_stmt)).all()
+
+    turns: List[Dict[str, Any]]
+    if archive:
+        archived = await run_in_threadpool(read_archived_turns, archive)
+        if since_seq is not None:
+            archived = [t for t in archived if t["seq_index"] > since_seq]
+        if limit is not None:
+            archived = archived[:limit]
+        turns = [
+            {"seq_index": t["seq_index"], "speaker_name": t["speaker_name"], "text": t["text"], "created_at": t["created_at"]}
+            for t in archived
+        ]
+    else:
+        turns_stmt = (
+            select(Turn.seq_index, Turn.speaker_name, Turn.text, Turn.created_at)
+            # created_at bound lets Postgres prune monthly partitions
+            .where(Turn.debate_id == uuid_id, Turn.created_at >= head.created_at)
+            .order_by(Turn.seq_index)
+        )
+        if since_seq is not None:
+            turns_stmt = turns_stmt.where(Turn.seq_index > since_seq)
+        if limit is not None:
+            turns_stmt = turns_stmt.limit(limit)
+        turns = [
+            {"seq_index": t.seq_index, "speaker_name": t.speaker_name, "text": t.text, "created_at": t.created_at}
+            for t in (await db.execute(turns_stmt)).all()
+        ]
+
+    payload: Dict[str, Any] = {
+        "id": str(head.id),
+        "status": head.status,
+        "title": head.title,
+        "created_at": head.created_at,
+        "latest_seq": latest_seq,
         "participants": [
             {"name": p.persona_name, "role": p.role, "model": p.model_id, "voice_name": p.voice_name, "avatar": p.avatar_url}
-            for p in debate.participants
+            for p in participants
         ],
-        "turns": sorted(
-            [
-                {
-                    "seq_index": t.seq_index,
-                    "speaker_name": t.speaker_name,
-                    "text": t.text,
-                    "created_at": t.created_at
-                }
-                for t in debate.turns
-            ],
-            key=lambda x: x["seq_index"]
-        )
+        "turns": turns
+    }
+
+    if is_completed and is_full_fetch:
+        body = dumps_str(payload)
+        await set_cached_debate(debate_id, etag, body)
+        return Response(content=body, media_type="application/json", headers=headers)
+
+    return Response(content=dumps(payload), media_type="application/json", headers=headers)
+
+
+@router.get("/{debate_id}/snapshot")
+async def get_debate_snapshot(debate_id: str, request: Request) -> Response:
+    """
+    Serve the precompressed static snapshot of a completed debate.
+    No database access; in production Caddy serves the same files directly.
+    """
+    try:
+        uuid.UUID(debate_id)
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Invalid UUID")
+
+    found = find_snapshot(debate_id, request.headers.get("accept-encoding", ""))
+    if not found:
+        raise HTTPException(status_code=404, detail="Snapshot not found")
+
+    path, encoding = found
+    etag = f'"{snapshot_hash(debate_id)}"'
+    headers = {
+        "ETag": etag,
+        "Cache-Control": SNAPSHOT_CACHE_CONTROL,
+        "Vary": "Accept-Encoding",
     }
+    if _etag_matches(request, etag):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+    if encoding:
+        headers["Content-Encoding"] = encoding
+    return FileResponse(path, media_type="application/json", headers=headers)
+
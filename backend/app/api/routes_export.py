@@ -0,0 +1,42 @@
+from datetime import datetime
+from typing import AsyncGenerator, Optional
+from fastapi import APIRouter, Depends, HTTPException, Path, Query
+from fastapi.responses import StreamingResponse
+
+from app.admin.auth import require_admin
+from app.core.db import AsyncSessionLocal
+from app.services.export import default_until, export_filename, make_encoder, naive_utc, stream_export
+
+router = APIRouter(dependencies=[Depends(require_admin)])
+
+
+@router.get("/{table}")
+async def export_table(
+    table: str = Path(..., pattern="^(debates|participants|turns)$"),
+    format: str = Query("ndjson", pattern="^(ndjson|parquet)$"),
+    since: Optional[datetime] = None,
+    until: Optional[datetime] = None,
+    compress: bool = True
+) -> StreamingResponse:
+    """
+    Stream a whole table for offline evaluation, as (gzipped) NDJSON or Parquet.
+    Rows are read through a server-side cursor, so memory stays flat.
+    For incremental exports pass the previous X-Export-Until as `since`.
+    """
+    since = naive_utc(since)
+    until = naive_utc(until) or default_until()
+    try:
+        encoder = make_encoder(table, format, compress)
+    except RuntimeError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    async def body() -> AsyncGenerator[bytes, None]:
+        async with AsyncSessionLocal() as db:
+            async for chunk in stream_export(db, encoder, table, format, since, until):
+                yield chunk
+
+    filename = export_filename(table, format, encoder.compress, until)
+    return StreamingResponse(body(), media_type=encoder.media_type, headers={
+        "Content-Disposition": f'attachment; filename="{filename}"',
+        "X-Export-Until": until.isoformat(),
+    })
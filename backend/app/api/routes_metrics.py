@@ -0,0 +1,15 @@
+from fastapi import APIRouter, Depends
+from fastapi.responses import Response
+from prometheus_client import CONTENT_TYPE_LATEST
+
+from app.admin.auth import require_admin
+from app.services.metrics import render_metrics
+
+# Scraped by Prometheus with basic_auth (ADMIN_USER / ADMIN_PASSWORD).
+# Worker-side metrics are served by the worker's own exporter (app.worker).
+router = APIRouter(dependencies=[Depends(require_admin)])
+
+
+@router.get("")
+def get_metrics() -> Response:
+    return Response(render_metrics(), media_type=CONTENT_TYPE_LATEST)
@@ -1,12 +1,16 @@
-from fastapi import APIRouter
-from typing import Optional, Dict, Any
+from fastapi import APIRouter, Response
+from typing import Optional, Dict, Any, List, Tuple
 from app.services.openrouter_client import openrouter_client
+from app.core.serialization import dumps
 from app.schemas.schemas import ModelsResponse, ValidateModelsRequest, ValidateModelsResponse, ValidationResult
 import time
 import asyncio
 
 router = APIRouter()
 
+# The encoded catalog, kept for as long as the client keeps the same list
+_models_json: Tuple[Optional[List[Dict[str, Any]]], bytes] = (None, b"[]")
+
 @router.get("/credits", response_model=Dict[str, float])
 async def get_credits(api_key: Optional[str] = None) -> Dict[str, float]:
     """
@@ -16,15 +20,18 @@ async def get_credits(api_key: Optional[str] = None) -> Dict[str, float]:
     return {"credits": credits}
 
 @router.get("", response_model=ModelsResponse)
-async def get_models() -> Dict[str, Any]:
+async def get_models() -> Response:
     """
     Get list of available models from OpenRouter.
     """
+    global _models_json
     models = await openrouter_client.get_models()
-    return {
-        "data": models,
-        "timestamp": time.time()
-    }
+    # The client's dicts already have the ModelInfo shape: encode the
+    # (several hundred entry) list once per refresh, not per request
+    if _models_json[0] is not models:
+        _models_json = (models, dumps(models))
+    body = b'{"data":' + _models_json[1] + b',"timestamp":' + dumps(time.time()) + b"}"
+    return Response(content=body, media_type="application/json")
 
 @router.post("/validate", response_model=ValidateModelsResponse)
 async def validate_models(request: ValidateModelsRequest):
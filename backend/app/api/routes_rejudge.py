@@ -0,0 +1,145 @@
+from datetime import datetime, timezone
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from sqlalchemy import Integer, cast, func
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.future import select
+from typing import List, Dict, Any
+
+from app.admin.auth import require_admin
+from app.core.db import get_db
+from app.models.models import Debate, RejudgeRun, Verdict
+from app.schemas.schemas import RejudgeConfig, RejudgeResponse
+from app.services.export import naive_utc
+from app.services.queue_manager import enqueue_rejudge
+from app.services.rejudge import run_is_stale
+
+# Batch re-judging of stored debates (see app.services.rejudge); the same
+# runs can be driven from scripts/rejudge_debates.py
+router = APIRouter(dependencies=[Depends(require_admin)])
+
+
+def _run_row(run: RejudgeRun) -> Dict[str, Any]:
+    return {
+        "run_id": run.id,
+        "judge_models": run.judge_models,
+        "status": run.status,
+        "since": run.since,
+        "until": run.until,
+        "cursor_created_at": run.cursor_created_at,
+        "debates_done": run.debates_done,
+        "verdicts_done": run.verdicts_done,
+        "failures": run.failures,
+        "cost": run.cost,
+        "error": run.error,
+        "created_at": run.created_at,
+        "updated_at": run.updated_at,
+    }
+
+
+async def _get_run(db: AsyncSession, run_id: str) -> RejudgeRun:
+    run = await db.get(RejudgeRun, run_id)
+    if not run:
+        raise HTTPException(status_code=404, detail="Rejudge run not found")
+    return run
+
+
+async def _enqueue(db: AsyncSession, run: RejudgeRun):
+    try:
+        enqueue_rejudge(run.id)
+    except Exception as e:
+        print(f"Failed to enqueue rejudge run: {e}")
+        run.status = "error"
+        run.error = "Failed to enqueue"
+        await db.commit()
+        raise HTTPException(status_code=500, detail="Failed to start rejudge worker")
+
+
+@router.post("", response_model=RejudgeResponse, status_code=status.HTTP_201_CREATED)
+async def create_rejudge_run(config: RejudgeConfig, db: AsyncSession = Depends(get_db)):
+    """
+    Re-judge completed debates with the given judge models. Verdicts go to
+    the verdicts table; the debates themselves are not modified.
+    """
+    run_id = config.run_id or f"rejudge-{datetime.now(timezone.utc):%Y%m%d-%H%M%S}"
+    if await db.get(RejudgeRun, run_id):
+        raise HTTPException(status_code=409, detail="Rejudge run already exists (resume it instead)")
+    run = RejudgeRun(
+        id=run_id,
+        judge_models=list(dict.fromkeys(config.judge_models)),
+        since=naive_utc(config.since),
+        until=naive_utc(config.until),
+    )
+    db.add(run)
+    await db.commit()
+    await _enqueue(db, run)
+    return {"run_id": run.id, "status": run.status, "message": "Rejudge run queued"}
+
+
+@router.get("", response_model=List[Dict[str, Any]])
+async def list_rejudge_runs(
+    limit: int = Query(50, ge=1, le=200),
+    db: AsyncSession = Depends(get_db)
+) -> List[Dict[str, Any]]:
+    """List rejudge runs, newest first, with their progress."""
+    result = await db.execute(select(RejudgeRun).order_by(RejudgeRun.created_at.desc()).limit(limit))
+    return [_run_row(r) for r in result.scalars().all()]
+
+
+@router.get("/{run_id}", response_model=Dict[str, Any])
+async def get_rejudge_run(run_id: str, db: AsyncSession = Depends(get_db)) -> Dict[str, Any]:
+    """
+    Progress of a run and, per judge model, how often it agrees with the
+    debates' original verdicts.
+    """
+    run = await _get_run(db, run_id)
+    rows = (await db.execute(
+        select(
+            Verdict.judge_model,
+            func.count(),
+            func.sum(cast(Verdict.winner == Debate.winner, Integer)),
+            func.avg(Verdict.confidence),
+            func.sum(Verdict.usage_json["cost"].as_float()),
+        )
+        .join(Debate, Debate.id == Verdict.debate_id)
+        .where(Verdict.run_id == run_id)
+        .group_by(Verdict.judge_model)
+    )).all()
+    return {
+        **_run_row(run),
+        "judges": [
+            {
+                "judge_model": judge_model,
+                "verdicts": count,
+                "agreement": round((agreed or 0) / count, 4) if count else None,
+                "avg_confidence": round(float(confidence), 4) if confidence is not None else None,
+                "cost": float(cost or 0.0),
+            }
+            for judge_model, count, agreed, confidence, cost in rows
+        ],
+    }
+
+
+@router.post("/{run_id}/pause", response_model=RejudgeResponse)
+async def pause_rejudge_run(run_id: str, db: AsyncSession = Depends(get_db)):
+    """Stop a run after its current page; resume continues from there."""
+    run = await _get_run(db, run_id)
+    if run.status not in ("queued", "running"):
+        raise HTTPException(status_code=409, detail=f"Rejudge run is {run.status}")
+    run.status = "paused"
+    await db.commit()
+    return {"run_id": run.id, "status": run.status, "message": "Rejudge run pauses after the current page"}
+
+
+@router.post("/{run_id}/resume", response_model=RejudgeResponse)
+async def resume_rejudge_run(run_id: str, db: AsyncSession = Depends(get_db)):
+    """Continue a paused, failed or crashed run from its last checkpoint."""
+    run = await _get_run(db, run_id)
+    if run.status == "completed":
+        raise HTTPException(status_code=409, detail="Rejudge run is completed")
+    if run.status in ("queued", "running") and not run_is_stale(run):
+        raise HTTPException(status_code=409, detail=f"Rejudge run is {run.status}")
+    run.status = "queued"
+    run.error = None
+    await db.commit()
+    await _enqueue(db, run)
+    return {"run_id": run.id, "status": run.status, "message": "Rejudge run resumed from its checkpoint"}
@@ -1,29 +1,64 @@
-import json
+import uuid
 from typing import AsyncGenerator, Dict, Any
-from fastapi import APIRouter, Request
+from fastapi import APIRouter, HTTPException, Query, Request, WebSocket
 from sse_starlette.sse import EventSourceResponse
 from redis import asyncio as aioredis
 from app.core.config import settings
+from app.services.replay import replay_hub
+from app.services.metrics import SSE_CLIENTS
+from app.services.multiplex import MultiplexedStream
+from app.services.events import END_EVENTS, relay_event
+from app.core.serialization import dumps_str
 
 router = APIRouter()
 
+async def replay_event_generator(debate_id: str, speed: float, request: Request) -> AsyncGenerator[Dict[str, Any], None]:
+    yield {
+        "event": "connected",
+        "data": dumps_str({"message": "Replay connected", "speed": speed})
+    }
+    SSE_CLIENTS.labels("replay").inc()
+    try:
+        async for event in replay_hub.stream(debate_id, speed):
+            if await request.is_disconnected():
+                break
+            yield event
+    finally:
+        SSE_CLIENTS.labels("replay").dec()
+
+
 @router.get("/{debate_id}/stream")
-async def stream_debate(debate_id: str, request: Request) -> EventSourceResponse:
+async def stream_debate(
+    debate_id: str,
+    request: Request,
+    replay: bool = False,
+    speed: float = Query(1.0, gt=0, le=50)
+) -> EventSourceResponse:
     """
     SSE Endpoint for streaming debate events.
-    Subscribes to Redis channel 'debate:{debate_id}'
+    Subscribes to Redis channel 'debate:{debate_id}'.
+    With replay=true, re-emits the stored turns of a finished debate at the
+    given speed instead (no Redis, no OpenRouter).
     """
+    if replay:
+        try:
+            uuid.UUID(debate_id)
+        except ValueError:
+            raise HTTPException(status_code=400, detail="Invalid UUID")
+        return EventSourceResponse(replay_event_generator(debate_id, speed, request))
+
     async def event_generator() -> AsyncGenerator[Dict[str, Any], None]:
         redis = await aioredis.from_url(settings.REDIS_URL, decode_responses=True)
         pubsub = redis.pubsub()
         channel = f"debate:{debate_id}"
         await pubsub.subscribe(channel)
+        SSE_CLIENTS.labels("live").inc()
         
         try:
             # Yield initial connection message
             yield {
                 "event": "connected", 
-                "data": json.dumps({"message": "Monitor connected"})
+                "data": dumps_str({"message": "Monitor connected"})
             }
 
             async for message in pubsub.listen():
@@ -31,28 +66,33 @@ async def stream_debate(debate_id: str, request: Request) -> EventSourceResponse
                     break
                     
                 if isinstance(message, dict) and message.get("type") == "message":
-                    # Parse Redis message (which is JSON stringified in orchestrator)
-                    payload_str: str = str(message.get("data"))
-                    try:
-                        payload: Dict[str, Any] = json.loads(payload_str)
-                        # We expect payload to have 'event' and 'data' keys
-                        event_type = str(payload.get("event", "update"))
-                        event_data = payload.get("data", {})
-                        
-                        yield {
-                            "event": event_type,
-                            "data": json.dumps(event_data)
-                        }
-                        
-                        # Stop stream if debate completed
-                        if event_type == "debate_completed":
-                            break
-                            
-                    except json.JSONDecodeError:
-                        print("Failed to decode Redis message")
+                    event = relay_event(str(message.get("data")))
+                    if event is None:
+                        continue
+                    yield event
+
+                    # Stop stream if debate completed (or failed)
+                    if event["event"] in END_EVENTS:
+                        break
                         
         finally:
+            SSE_CLIENTS.labels("live").dec()
             await pubsub.unsubscribe(channel)
             await redis.close()
 
     return EventSourceResponse(event_generator())
+
+
+@router.websocket("/ws")
+async def stream_debates_ws(websocket: WebSocket):
+    """
+    WebSocket endpoint streaming many debates over one connection, live or
+    replayed, with the events of the SSE endpoint. Protocol and flow control
+    are described in app/services/multiplex.py.
+    """
+    await websocket.accept()
+    SSE_CLIENTS.labels("websocket").inc()
+    try:
+        await MultiplexedStream(websocket).run()
+    finally:
+        SSE_CLIENTS.labels("websocket").dec()
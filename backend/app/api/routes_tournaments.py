@@ -0,0 +1,124 @@
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from sqlalchemy import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.future import select
+from typing import List, Dict, Any
+import uuid
+
+from app.admin.auth import require_admin
+from app.core.db import get_db
+from app.models.models import Debate, DebateParticipant, Tournament, TournamentStanding
+from app.schemas.schemas import TournamentConfig, TournamentResponse
+from app.services.estimator import new_budget, plan_debates, unpriced_under_cap
+from app.services.queue_manager import enqueue_dispatch_scheduled
+from app.services.tournaments import build_tournament_rows, standing_row
+
+router = APIRouter()
+
+# Upper bound on debates generated by one request
+MAX_TOURNAMENT_DEBATES = 5000
+
+
+def _tournament_row(tournament: Tournament) -> Dict[str, Any]:
+    return {
+        "id": str(tournament.id),
+        "name": tournament.name,
+        "format": tournament.format,
+        "status": tournament.status,
+        "debates_total": tournament.debates_total,
+        "debates_completed": tournament.debates_completed,
+        "debates_failed": tournament.debates_failed,
+        "created_at": tournament.created_at,
+        "ended_at": tournament.ended_at,
+    }
+
+
+@router.post("", response_model=TournamentResponse, status_code=status.HTTP_201_CREATED, dependencies=[Depends(require_admin)])
+async def create_tournament(
+    config: TournamentConfig,
+    db: AsyncSession = Depends(get_db)
+):
+    """
+    Generate every pairing of the given models for each topic and schedule
+    the debates, each with its own budget as in create_debate. All rows are
+    bulk-inserted in one transaction; the scheduler then starts them within
+    the per-model and per-key caps.
+    """
+    tournament = Tournament(
+        name=config.name or f"{len(config.models)}-model {config.format.replace('_', ' ')}",
+        format=config.format,
+        config_json=config.model_dump(),
+    )
+    db.add(tournament)
+    await db.flush()
+
+    debates, participants = build_tournament_rows(tournament.id, config)
+    if len(debates) > MAX_TOURNAMENT_DEBATES:
+        raise HTTPException(status_code=400, detail=f"Tournament would create {len(debates)} debates (max {MAX_TOURNAMENT_DEBATES})")
+    tournament.debates_total = len(debates)
+
+    # Same budgets as single debates, priced with one catalog fetch
+    estimates, prices = await plan_debates(db, [d["config_json"] for d in debates])
+    unpriced: List[str] = []
+    for debate, estimate in zip(debates, estimates):
+        debate["budget_json"] = new_budget(debate["config_json"], prices, estimate)
+        unpriced.extend(unpriced_under_cap(debate["budget_json"]))
+    if unpriced:
+        unpriced = list(dict.fromkeys(unpriced))
+        raise HTTPException(status_code=503, detail=f"No catalog price for {', '.join(unpriced)}: the cost cap cannot be enforced")
+
+    await db.execute(insert(Debate), debates)
+    await db.execute(insert(DebateParticipant), participants)
+    await db.commit()
+
+    try:
+        enqueue_dispatch_scheduled()
+    except Exception as e:
+        # Debates stay scheduled and are picked up by the next dispatch
+        print(f"Failed to enqueue tournament dispatch: {e}")
+
+    return {
+        "tournament_id": str(tournament.id),
+        "status": tournament.status,
+        "debates_total": tournament.debates_total,
+        "message": "Tournament created and debates scheduled"
+    }
+
+
+@router.get("", response_model=List[Dict[str, Any]])
+async def list_tournaments(
+    limit: int = Query(50, ge=1, le=200),
+    db: AsyncSession = Depends(get_db)
+) -> List[Dict[str, Any]]:
+    """List tournaments, newest first, with their progress."""
+    result = await db.execute(select(Tournament).order_by(Tournament.created_at.desc()).limit(limit))
+    return [_tournament_row(t) for t in result.scalars().all()]
+
+
+@router.get("/{tournament_id}", response_model=Dict[str, Any])
+async def get_tournament(tournament_id: str, db: AsyncSession = Depends(get_db)) -> Dict[str, Any]:
+    """
+    Tournament progress and standings (points: 1 per win, 0.5 per draw).
+    Both are maintained incrementally as debates finish.
+    """
+    try:
+        uuid_id = uuid.UUID(tournament_id)
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Invalid UUID")
+
+    tournament = await db.get(Tournament, uuid_id)
+    if not tournament:
+        raise HTTPException(status_code=404, detail="Tournament not found")
+
+    standings = (await db.execute(
+        select(TournamentStanding)
+        .where(TournamentStanding.tournament_id == uuid_id)
+        .order_by(TournamentStanding.points.desc(), TournamentStanding.cost)
+    )).scalars().all()
+
+    return {
+        **_tournament_row(tournament),
+        "models": tournament.config_json.get("models", []),
+        "topics": tournament.config_json.get("topics", []),
+        "standings": [standing_row(s) for s in standings],
+    }
@@ -11,8 +11,105 @@ class Settings(BaseSettings):
     # Redis
     REDIS_URL: str = ""
     
+    # Precompressed JSON snapshots of completed debates (shared with Caddy)
+    SNAPSHOT_DIR: str = "/data/snapshots"
+    
+    # Archival of cold debates: turns older than the retention window move to
+    # compressed NDJSON files and are rehydrated on demand
+    ARCHIVE_DIR: str = "/data/archive"
+    ARCHIVE_RETENTION_DAYS: int = 180
+    # Periodic jobs of the cron service (app/cron.py): turn partitions for the
+    # coming months, and archiving (0 = only via scripts/archive_debates.py)
+    PARTITIONS_INTERVAL_SECONDS: int = 3600
+    ARCHIVE_INTERVAL_SECONDS: int = 6 * 3600
+    
+    # Replay of stored debates over SSE (speed=1 approximates live generation)
+    REPLAY_CHARS_PER_SECOND: float = 200.0
+    REPLAY_CHUNK_CHARS: int = 24
+    REPLAY_TURN_GAP_SECONDS: float = 1.0
+
+    # Relevance-based context for panel debates (see app/services/context.py):
+    # from CONTEXT_SELECTION_MIN_PARTICIPANTS participants on (0 = never), turns
+    # see the last CONTEXT_RECENT_TURNS turns plus the most relevant earlier
+    # passages once the transcript exceeds CONTEXT_TOKEN_BUDGET (estimated) tokens
+    CONTEXT_SELECTION_MIN_PARTICIPANTS: int = 6
+    CONTEXT_RECENT_TURNS: int = 3
+    CONTEXT_TOKEN_BUDGET: int = 4000
+    CONTEXT_CHUNK_WORDS: int = 120
+
+    # Rolling summaries of long debates (off while SUMMARY_MODEL is empty; debates
+    # can set their own summary_model). After each round, the "summaries" worker
+    # folds all but the last SUMMARY_RECENT_TURNS turns into a summary of at most
+    # SUMMARY_MAX_WORDS words, which later turn prompts use instead of those turns
+    SUMMARY_MODEL: str = ""
+    SUMMARY_RECENT_TURNS: int = 6
+    SUMMARY_MAX_WORDS: int = 400
+
+    # Debate budgets: default cost cap of a debate in USD (0 = none; configs can
+    # set max_cost_usd / max_total_tokens) and the tiktoken encoding used to
+    # count prompt tokens for estimates and budgets
+    DEBATE_MAX_COST_USD: float = 0.0
+    TOKENIZER_ENCODING: str = "o200k_base"
+
+    # Judge panels (see app/services/judges.py): default judge models, comma-separated
+    # (fewer than two = the moderator judges alone; configs can set judge_models).
+    # All judges get VERDICT_PANEL_DEADLINE_SECONDS; after that the verdict is
+    # decided once VERDICT_PANEL_QUORUM judges answered (0 = a majority), and
+    # judges still running at VERDICT_PANEL_TIMEOUT_SECONDS are cancelled
+    # (verdict jobs get this plus a margin as their RQ job timeout)
+    VERDICT_JUDGES: str = ""
+    VERDICT_PANEL_DEADLINE_SECONDS: float = 60.0
+    VERDICT_PANEL_QUORUM: int = 0
+    VERDICT_PANEL_TIMEOUT_SECONDS: float = 180.0
+
+    # Re-judging of stored debates (see app/services/rejudge.py): debates per
+    # page (checkpoint), concurrent calls and requests per minute per judge
+    # model (0 = unlimited), calls per (debate, judge) before a failing pair is
+    # skipped, and how long a run may go without checkpointing before it
+    # counts as crashed and can be resumed
+    REJUDGE_BATCH_SIZE: int = 50
+    REJUDGE_CONCURRENCY_PER_MODEL: int = 4
+    REJUDGE_REQUESTS_PER_MINUTE: float = 60.0
+    REJUDGE_MAX_ATTEMPTS: int = 3
+    REJUDGE_STALE_SECONDS: int = 1800
+
+    # Multiplexed WebSocket streams (/api/debates/ws): debates per connection,
+    # and frames a client may lag behind before it is disconnected
+    WS_MAX_SUBSCRIPTIONS: int = 50
+    WS_SEND_QUEUE: int = 1000
+    
+    # Tournament scheduler: concurrent debates allowed per model and per API key
+    TOURNAMENT_MAX_CONCURRENT_PER_MODEL: int = 2
+    TOURNAMENT_MAX_CONCURRENT_PER_KEY: int = 8
+    # Slots of debates that never finish (e.g. a crashed job) expire after this
+    TOURNAMENT_SLOT_TTL_SECONDS: int = 3 * 3600
+    # The cron service retries dispatching scheduled debates this often
+    TOURNAMENT_DISPATCH_INTERVAL_SECONDS: int = 60
+    
+    # Completion cache for reruns and benchmarks (off by default): "", "redis" or "disk".
+    # Hits stream at the recorded pace times COMPLETION_CACHE_REPLAY_SPEED (0 = no delay)
+    COMPLETION_CACHE: str = ""
+    COMPLETION_CACHE_DIR: str = "/data/completion_cache"
+    COMPLETION_CACHE_MAX_BYTES: int = 512 * 1024 * 1024
+    COMPLETION_CACHE_REPLAY_SPEED: float = 1.0
+    
+    # Raw OpenRouter response cassettes (see app/services/cassettes.py): "", "record" or "replay".
+    # Replays run at the recorded pace times OPENROUTER_CASSETTE_REPLAY_SPEED (0 = no delay)
+    OPENROUTER_CASSETTES: str = ""
+    OPENROUTER_CASSETTE_DIR: str = "/data/cassettes"
+    OPENROUTER_CASSETTE_REPLAY_SPEED: float = 1.0
+    
+    # Prometheus exporter of the RQ worker (0 = off); the API serves /api/metrics
+    WORKER_METRICS_PORT: int = 9100
+    
+    # OpenTelemetry tracing (off by default): "", "otlp" (to TRACING_OTLP_ENDPOINT) or "file"
+    TRACING_EXPORTER: str = ""
+    TRACING_OTLP_ENDPOINT: str = "http://localhost:4318/v1/traces"
+    TRACING_FILE: str = "/data/traces.jsonl"
+    
     # External APIs
     OPENROUTER_API_KEY: Optional[str] = None
+    OPENROUTER_BASE_URL: str = "https://openrouter.ai/api/v1"
     
     # Production Secrets & Site Config
     SITE_URL: str = "https://ai-debates.net"
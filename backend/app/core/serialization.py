@@ -0,0 +1,23 @@
+from typing import Any
+import orjson
+
+# One JSON encoder for the hot paths: event publishing, SSE relay and the
+# large API responses (debate transcripts, the model catalog). orjson writes
+# compact UTF-8 and handles datetime and UUID natively; naive datetimes come
+# out as before (isoformat without offset).
+
+
+def _default(obj: Any) -> Any:
+    # Decimal (SQL numerics) and anything else str() describes
+    return str(obj)
+
+
+def dumps(obj: Any) -> bytes:
+    return orjson.dumps(obj, default=_default, option=orjson.OPT_NON_STR_KEYS)
+
+
+def dumps_str(obj: Any) -> str:
+    return dumps(obj).decode("utf-8")
+
+
+loads = orjson.loads
@@ -0,0 +1,25 @@
+import os
+import redis
+from rq.cron import CronScheduler
+
+from app.core.config import settings
+from app.services.orchestrator import archive_debates_job, dispatch_scheduled_job, partitions_job
+
+# Periodic jobs, enqueued on the default queue by one cron service
+# (`python -m app.cron`, the `cron` service in docker compose). Each job
+# also runs once when the service starts.
+
+
+def build_scheduler(conn: redis.Redis) -> CronScheduler:
+    scheduler = CronScheduler(connection=conn, name="ai-debates-cron")
+    scheduler.register(partitions_job, "default", interval=settings.PARTITIONS_INTERVAL_SECONDS)
+    scheduler.register(dispatch_scheduled_job, "default", interval=settings.TOURNAMENT_DISPATCH_INTERVAL_SECONDS)
+    if settings.ARCHIVE_INTERVAL_SECONDS:
+        scheduler.register(archive_debates_job, "default", interval=settings.ARCHIVE_INTERVAL_SECONDS, job_timeout=3600)
+    return scheduler
+
+
+if __name__ == '__main__':
+    redis_url = os.getenv('REDIS_URL', 'redis://redis:6379/0')
+    print("Starting cron scheduler...")
+    build_scheduler(redis.from_url(redis_url)).start()
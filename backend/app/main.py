@@ -1,17 +1,24 @@
-from fastapi import FastAPI
+from fastapi import FastAPI, Request
 from fastapi.middleware.cors import CORSMiddleware
 from starlette.middleware.sessions import SessionMiddleware
 from contextlib import asynccontextmanager
 
 from app.core.config import settings
-from app.api import routes_models, routes_presets, routes_debates, routes_stream
+from app.api import routes_models, routes_presets, routes_debates, routes_stream, routes_analytics, routes_export, routes_tournaments, routes_rejudge, routes_metrics
 
 # Admin
 from sqladmin import Admin
 from app.core.db import engine
-from app.admin.views import DebateAdmin, ParticipantAdmin, TurnAdmin, SessionAdmin
+from app.admin.views import DebateAdmin, ParticipantAdmin, TurnAdmin, SessionAdmin, ModelStatsAdmin, TournamentAdmin, RejudgeRunAdmin, VerdictAdmin
 from app.admin.auth import authentication_backend
 
+# Tracing (no-op unless TRACING_EXPORTER is set)
+from opentelemetry import trace
+from opentelemetry.propagate import extract
+from app.services.tracing import instrument_engine, setup_tracing, tracer
+setup_tracing("ai-debates-api")
+instrument_engine(engine.sync_engine)
+
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     yield
@@ -36,6 +43,10 @@ admin.add_view(DebateAdmin)
 admin.add_view(ParticipantAdmin)
 admin.add_view(TurnAdmin)
 admin.add_view(SessionAdmin)
+admin.add_view(ModelStatsAdmin)
+admin.add_view(TournamentAdmin)
+admin.add_view(RejudgeRunAdmin)
+admin.add_view(VerdictAdmin)
 
 # CORS Configuration
 # Pull allowed origins from environment variable, default to local dev
@@ -48,12 +59,33 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["X-Next-Cursor", "ETag", "X-Export-Until"],
 )
 
+if settings.TRACING_EXPORTER:
+    @app.middleware("http")
+    async def trace_requests(request: Request, call_next):
+        # Server span per request; create_debate's span becomes the root of
+        # the debate trace. Recent FastAPI versions open one themselves.
+        if trace.get_current_span().is_recording():
+            return await call_next(request)
+        with tracer.start_as_current_span(f"{request.method} {request.url.path}", context=extract(request.headers)) as span:
+            response = await call_next(request)
+            route = request.scope.get("route")
+            if route is not None:
+                span.update_name(f"{request.method} {route.path}")
+            span.set_attribute("http.status_code", response.status_code)
+            return response
+
 # Include Routers with /api prefix
 app.include_router(routes_models.router, prefix="/api/models", tags=["models"])
 app.include_router(routes_presets.router, prefix="/api/presets", tags=["presets"])
 app.include_router(routes_debates.router, prefix="/api/debates", tags=["debates"])
+app.include_router(routes_analytics.router, prefix="/api/analytics", tags=["analytics"])
+app.include_router(routes_export.router, prefix="/api/export", tags=["export"])
+app.include_router(routes_tournaments.router, prefix="/api/tournaments", tags=["tournaments"])
+app.include_router(routes_rejudge.router, prefix="/api/rejudge", tags=["rejudge"])
+app.include_router(routes_metrics.router, prefix="/api/metrics", tags=["metrics"])
 # Note: Stream router handles its own prefix or we mount it here but often streams are direct paths
 # We'll mount it under /api/debates too for consistency: /api/debates/{id}/stream
 app.include_router(routes_stream.router, prefix="/api/debates", tags=["stream"])
@@ -1,9 +1,9 @@
 import uuid
 from datetime import datetime, timezone
 from typing import Optional, Any
-from sqlalchemy import String, Integer, DateTime, JSON, ForeignKey, Text
+from sqlalchemy import String, Integer, BigInteger, Float, DateTime, JSON, ForeignKey, Text, Index, Computed, UniqueConstraint, text
 from sqlalchemy.orm import Mapped, mapped_column, relationship
-from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy.dialects.postgresql import UUID, JSONB, REGCONFIG, TSVECTOR
 
 from app.models.base import Base
 
@@ -19,16 +19,31 @@ class Session(Base):
 
 class Debate(Base):
     __tablename__ = "debates"
+    __table_args__ = (
+        # Keyset pagination for listings: (created_at, id) with optional filters
+        Index("ix_debates_created_at_id", "created_at", "id"),
+        Index("ix_debates_status_created_at_id", "status", "created_at", "id"),
+        Index("ix_debates_session_created_at_id", "session_id", "created_at", "id"),
+        Index("ix_debates_search_vector", "search_vector", postgresql_using="gin"),
+        # Analytics over config_json (see app.services.analytics for matching queries)
+        Index("ix_debates_config_json", "config_json", postgresql_using="gin", postgresql_ops={"config_json": "jsonb_path_ops"}),
+        Index("ix_debates_config_language", text("(config_json->>'language')")),
+        Index("ix_debates_config_preset_id", text("(config_json->>'debate_preset_id')")),
+        Index("ix_debates_config_length_preset", text("(config_json->>'length_preset')")),
+        Index("ix_debates_config_model_ids", text("jsonb_path_query_array(config_json, '$.participants[*].model_id')"), postgresql_using="gin"),
+        Index("ix_debates_tournament_id", "tournament_id"),
+    )
     
     id: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
     session_id: Mapped[Optional[str]] = mapped_column(String, ForeignKey("sessions.id"), nullable=True, index=True)
+    tournament_id: Mapped[Optional[uuid.UUID]] = mapped_column(UUID(as_uuid=True), ForeignKey("tournaments.id", ondelete="CASCADE"), nullable=True)
     
-    # queued, running, completed, error, stopped
+    # scheduled (tournament debate waiting for a slot), queued, running, completed, error, stopped
     status: Mapped[str] = mapped_column(String, default="queued", index=True)
     title: Mapped[str] = mapped_column(String, nullable=True)
     
     # Full DebateConfig JSON
-    config_json: Mapped[dict[str, Any]] = mapped_column(JSON, default={})
+    config_json: Mapped[dict[str, Any]] = mapped_column(JSONB, default={})
     
     created_at: Mapped[datetime] = mapped_column(DateTime, default=lambda: datetime.now(timezone.utc).replace(tzinfo=None))
     started_at: Mapped[Optional[datetime]] = mapped_column(DateTime, nullable=True)
@@ -37,7 +52,31 @@ class Debate(Base):
     # Aggregated stats: {tokens_in, tokens_out, cost, turns_count}
     totals_json: Mapped[dict[str, Any]] = mapped_column(JSON, default={})
 
+    # Structured verdict, parsed from the verdict turn when it is committed:
+    # winner is the winning debater's display name or "draw"
+    winner: Mapped[Optional[str]] = mapped_column(String, nullable=True)
+    winner_model_id: Mapped[Optional[str]] = mapped_column(String, nullable=True)
+
+    # Rolling summary of older turns for turn prompts (see app.services.summaries)
+    summary_json: Mapped[Optional[dict[str, Any]]] = mapped_column(JSON, nullable=True)
+
+    # Limits, catalog prices at creation, estimate and spend (see app.services.estimator)
+    budget_json: Mapped[Optional[dict[str, Any]]] = mapped_column(JSON, nullable=True)
+
+    # Full-text search: text search config derived from `language`, vector over title + topic
+    search_config: Mapped[str] = mapped_column(REGCONFIG, default="simple", server_default="simple")
+    search_vector: Mapped[Optional[Any]] = mapped_column(
+        TSVECTOR,
+        Computed(
+            "setweight(to_tsvector(search_config, coalesce(title, '')), 'A') || "
+            "setweight(to_tsvector(search_config, coalesce(config_json->>'topic', '')), 'B')",
+            persisted=True
+        ),
+        deferred=True
+    )
+
     session: Mapped[Optional["Session"]] = relationship("Session", back_populates="debates")
+    tournament: Mapped[Optional["Tournament"]] = relationship("Tournament", back_populates="debates")
     turns: Mapped[list["Turn"]] = relationship("Turn", back_populates="debate", cascade="all, delete-orphan")
     participants: Mapped[list["DebateParticipant"]] = relationship("DebateParticipant", back_populates="debate", cascade="all, delete-orphan")
 
@@ -59,10 +98,17 @@ class DebateParticipant(Base):
 
 
 class Turn(Base):
+    """Range-partitioned by month of created_at (see app.services.archive)"""
     __tablename__ = "turns"
+    __table_args__ = (
+        # Incremental fetches (seq_index > since_seq) and latest-seq lookups
+        Index("ix_turns_debate_id_seq_index", "debate_id", "seq_index"),
+        Index("ix_turns_search_vector", "search_vector", postgresql_using="gin"),
+        {"postgresql_partition_by": "RANGE (created_at)"},
+    )
     
     id: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
-    debate_id: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), ForeignKey("debates.id"), index=True)
+    debate_id: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), ForeignKey("debates.id"))
     
     seq_index: Mapped[int] = mapped_column(Integer) # Order 0, 1, 2...
     round_id: Mapped[str] = mapped_column(String) # e.g. "opening_1"
@@ -76,14 +122,133 @@ class Turn(Base):
     
     model_used: Mapped[str] = mapped_column(String)
     # {tokens_in, tokens_out, cost}
-    usage_json: Mapped[dict[str, Any]] = mapped_column(JSON, default={})
+    usage_json: Mapped[dict[str, Any]] = mapped_column(JSONB, default={})
     
     retake_count: Mapped[int] = mapped_column(Integer, default=0)
-    created_at: Mapped[datetime] = mapped_column(DateTime, default=lambda: datetime.now(timezone.utc).replace(tzinfo=None))
+    # Partition key, hence part of the primary key
+    created_at: Mapped[datetime] = mapped_column(DateTime, primary_key=True, default=lambda: datetime.now(timezone.utc).replace(tzinfo=None))
+
+    # Full-text search: config copied from the debate language at commit time
+    search_config: Mapped[str] = mapped_column(REGCONFIG, default="simple", server_default="simple")
+    search_vector: Mapped[Optional[Any]] = mapped_column(
+        TSVECTOR,
+        Computed("to_tsvector(search_config, coalesce(text, ''))", persisted=True),
+        deferred=True
+    )
     
     debate: Mapped["Debate"] = relationship("Debate", back_populates="turns")
 
 
+class TurnArchive(Base):
+    """Where the turns of an archived (cold) debate live: one gzip member in an NDJSON file"""
+    __tablename__ = "turn_archives"
+
+    debate_id: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), ForeignKey("debates.id", ondelete="CASCADE"), primary_key=True)
+    path: Mapped[str] = mapped_column(String)  # relative to ARCHIVE_DIR
+    offset: Mapped[int] = mapped_column(BigInteger)
+    length: Mapped[int] = mapped_column(BigInteger)
+    turns_count: Mapped[int] = mapped_column(Integer, default=0)
+    last_seq: Mapped[Optional[int]] = mapped_column(Integer, nullable=True)
+    archived_at: Mapped[datetime] = mapped_column(DateTime, default=lambda: datetime.now(timezone.utc).replace(tzinfo=None))
+
+
+class Tournament(Base):
+    """A batch of generated debates (e.g. round robin between models) with running standings"""
+    __tablename__ = "tournaments"
+
+    id: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    name: Mapped[str] = mapped_column(String)
+    format: Mapped[str] = mapped_column(String)  # round_robin, double_round_robin
+    # running, completed
+    status: Mapped[str] = mapped_column(String, default="running")
+
+    # Full TournamentConfig JSON (models, topics, debate settings, concurrency caps)
+    config_json: Mapped[dict[str, Any]] = mapped_column(JSONB, default={})
+
+    # Progress counters, maintained incrementally as debates finish
+    debates_total: Mapped[int] = mapped_column(Integer, default=0)
+    debates_completed: Mapped[int] = mapped_column(Integer, default=0)
+    # Debates that ended in an error; they count towards finishing the tournament
+    debates_failed: Mapped[int] = mapped_column(Integer, default=0, server_default="0")
+
+    created_at: Mapped[datetime] = mapped_column(DateTime, default=lambda: datetime.now(timezone.utc).replace(tzinfo=None))
+    ended_at: Mapped[Optional[datetime]] = mapped_column(DateTime, nullable=True)
+
+    debates: Mapped[list["Debate"]] = relationship("Debate", back_populates="tournament")
+    standings: Mapped[list["TournamentStanding"]] = relationship("TournamentStanding", back_populates="tournament", cascade="all, delete-orphan")
+
+
+class TournamentStanding(Base):
+    """Per-model tournament results, updated when each tournament debate finishes"""
+    __tablename__ = "tournament_standings"
+
+    tournament_id: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), ForeignKey("tournaments.id", ondelete="CASCADE"), primary_key=True)
+    model_id: Mapped[str] = mapped_column(String, primary_key=True)
+
+    played: Mapped[int] = mapped_column(Integer, default=0)
+    wins: Mapped[int] = mapped_column(Integer, default=0)
+    losses: Mapped[int] = mapped_column(Integer, default=0)
+    draws: Mapped[int] = mapped_column(Integer, default=0)
+    # 1 per win, 0.5 per draw
+    points: Mapped[float] = mapped_column(Float, default=0.0)
+    cost: Mapped[float] = mapped_column(Float, default=0.0)
+
+    tournament: Mapped["Tournament"] = relationship("Tournament", back_populates="standings")
+
+
+class RejudgeRun(Base):
+    """A batch re-judging of stored debates with new judge models (see app.services.rejudge)"""
+    __tablename__ = "rejudge_runs"
+
+    id: Mapped[str] = mapped_column(String, primary_key=True)  # e.g. "2026-10-new-judge"
+    judge_models: Mapped[list[str]] = mapped_column(JSON)
+    # queued, running, paused, completed, error
+    status: Mapped[str] = mapped_column(String, default="queued")
+    # Completed debates created in [since, until)
+    since: Mapped[Optional[datetime]] = mapped_column(DateTime, nullable=True)
+    until: Mapped[Optional[datetime]] = mapped_column(DateTime, nullable=True)
+
+    # Checkpoint: (created_at, id) of the last debate of the last finished page
+    cursor_created_at: Mapped[Optional[datetime]] = mapped_column(DateTime, nullable=True)
+    cursor_debate_id: Mapped[Optional[uuid.UUID]] = mapped_column(UUID(as_uuid=True), nullable=True)
+
+    debates_done: Mapped[int] = mapped_column(Integer, default=0)
+    verdicts_done: Mapped[int] = mapped_column(Integer, default=0)
+    failures: Mapped[int] = mapped_column(Integer, default=0)
+    # "<debate_id> <judge_model>" -> failed calls, for retries (see app.services.rejudge)
+    failed_attempts: Mapped[dict[str, int]] = mapped_column(JSON, default=dict)
+    cost: Mapped[float] = mapped_column(Float, default=0.0)
+    error: Mapped[Optional[str]] = mapped_column(Text, nullable=True)
+
+    created_at: Mapped[datetime] = mapped_column(DateTime, default=lambda: datetime.now(timezone.utc).replace(tzinfo=None))
+    updated_at: Mapped[datetime] = mapped_column(DateTime, default=lambda: datetime.now(timezone.utc).replace(tzinfo=None))
+
+
+class Verdict(Base):
+    """One judge model's verdict on a stored debate, from a re-judging run; the debate's own turns are untouched"""
+    __tablename__ = "verdicts"
+    __table_args__ = (
+        UniqueConstraint("run_id", "debate_id", "judge_model", name="uq_verdicts_run_debate_judge"),
+        Index("ix_verdicts_debate_id", "debate_id"),
+        Index("ix_verdicts_judge_model", "judge_model"),
+    )
+
+    id: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    run_id: Mapped[str] = mapped_column(String, ForeignKey("rejudge_runs.id", ondelete="CASCADE"))
+    debate_id: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), ForeignKey("debates.id", ondelete="CASCADE"))
+    judge_model: Mapped[str] = mapped_column(String)
+
+    # Debater display name or "draw" (None if undecidable), as for Debate.winner
+    winner: Mapped[Optional[str]] = mapped_column(String, nullable=True)
+    winner_model_id: Mapped[Optional[str]] = mapped_column(String, nullable=True)
+    confidence: Mapped[Optional[float]] = mapped_column(Float, nullable=True)
+    text: Mapped[str] = mapped_column(Text)
+    # {tokens_in, tokens_out, cost, latency_ms}
+    usage_json: Mapped[dict[str, Any]] = mapped_column(JSONB, default={})
+
+    created_at: Mapped[datetime] = mapped_column(DateTime, default=lambda: datetime.now(timezone.utc).replace(tzinfo=None))
+
+
 class Preset(Base):
     __tablename__ = "presets"
     
@@ -91,3 +256,27 @@ class Preset(Base):
     name: Mapped[str] = mapped_column(String)
     description: Mapped[Optional[str]] = mapped_column(String, nullable=True)
     preset_json: Mapped[dict[str, Any]] = mapped_column(JSON)
+
+
+class ModelStats(Base):
+    """Per-model, per-role rollups, updated incrementally when a debate finishes"""
+    __tablename__ = "model_stats"
+    __table_args__ = (
+        Index("ix_model_stats_role_wins", "role", "wins"),
+    )
+
+    model_id: Mapped[str] = mapped_column(String, primary_key=True)
+    role: Mapped[str] = mapped_column(String, primary_key=True)  # moderator, debater
+
+    debates: Mapped[int] = mapped_column(Integer, default=0)
+    wins: Mapped[int] = mapped_column(Integer, default=0)
+    losses: Mapped[int] = mapped_column(Integer, default=0)
+    draws: Mapped[int] = mapped_column(Integer, default=0)
+
+    turns: Mapped[int] = mapped_column(Integer, default=0)
+    total_latency_ms: Mapped[int] = mapped_column(BigInteger, default=0)
+    tokens_in: Mapped[int] = mapped_column(BigInteger, default=0)
+    tokens_out: Mapped[int] = mapped_column(BigInteger, default=0)
+    cost: Mapped[float] = mapped_column(Float, default=0.0)
+
+    updated_at: Mapped[datetime] = mapped_column(DateTime, default=lambda: datetime.now(timezone.utc).replace(tzinfo=None))
@@ -1,5 +1,6 @@
-from typing import List, Optional, Dict, Any
-from pydantic import BaseModel, ConfigDict
+from datetime import datetime
+from typing import List, Optional, Dict, Any, Literal
+from pydantic import BaseModel, ConfigDict, Field
 
 # --- Preset Schemas ---
 class Preset(BaseModel):
@@ -59,8 +60,55 @@ class DebateConfig(BaseModel):
     num_rounds: Optional[int] = 3
     intensity: int = 5
     user_provider_key: Optional[str] = None
+    # Model for the rolling summary of long debates (default: SUMMARY_MODEL)
+    summary_model: Optional[str] = None
+    # Hard budgets: turns are capped to fit and the debate skips to its
+    # verdict when they run out (default cost cap: DEBATE_MAX_COST_USD)
+    max_cost_usd: Optional[float] = Field(None, gt=0)
+    max_total_tokens: Optional[int] = Field(None, gt=0)
+    # Judge panel for the verdict (default: VERDICT_JUDGES); at least two models
+    judge_models: Optional[List[str]] = Field(None, max_length=9)
 
 class DebateResponse(BaseModel):
     debate_id: str
     status: str
     message: str
+    # Pre-flight estimate (see app.services.estimator)
+    estimate: Optional[Dict[str, Any]] = None
+
+# --- Tournament Schemas ---
+class TournamentConfig(BaseModel):
+    name: Optional[str] = None
+    models: List[str] = Field(..., min_length=2, max_length=64)
+    topics: List[str] = Field(..., min_length=1, max_length=50)
+    format: Literal["round_robin", "double_round_robin"] = "round_robin"
+    moderator_model_id: Optional[str] = None
+    language: str = "English"
+    debate_preset_id: Optional[str] = "custom"
+    length_preset: str = "medium"
+    num_rounds: Optional[int] = 3
+    intensity: int = 5
+    user_provider_key: Optional[str] = None
+    # Lower the global caps for this tournament only
+    max_concurrent_per_model: Optional[int] = Field(None, ge=1)
+    max_concurrent_per_key: Optional[int] = Field(None, ge=1)
+
+class TournamentResponse(BaseModel):
+    tournament_id: str
+    status: str
+    debates_total: int
+    message: str
+
+# --- Rejudge Schemas ---
+class RejudgeConfig(BaseModel):
+    # Name of the run (default: generated); also the key to resume it
+    run_id: Optional[str] = Field(None, pattern=r"^[\w.:-]{1,100}$")
+    judge_models: List[str] = Field(..., min_length=1, max_length=10)
+    # Completed debates created in [since, until) (default: all)
+    since: Optional[datetime] = None
+    until: Optional[datetime] = None
+
+class RejudgeResponse(BaseModel):
+    run_id: str
+    status: str
+    message: str
@@ -0,0 +1,53 @@
+from typing import Any, Dict, List, Optional
+from sqlalchemy import func, literal_column, type_coerce
+from sqlalchemy.dialects.postgresql import JSONB
+from sqlalchemy.sql.elements import ColumnElement
+
+from app.models.models import Debate
+
+# These expressions mirror the expression indexes on `debates` character for
+# character (keys are rendered as literals, not bind params), so the planner
+# can match them.
+CONFIG_LANGUAGE = Debate.config_json.op("->>")(literal_column("'language'"))
+CONFIG_PRESET_ID = Debate.config_json.op("->>")(literal_column("'debate_preset_id'"))
+CONFIG_LENGTH_PRESET = Debate.config_json.op("->>")(literal_column("'length_preset'"))
+CONFIG_MODEL_IDS = func.jsonb_path_query_array(Debate.config_json, literal_column("'$.participants[*].model_id'"), type_=JSONB)
+
+
+def config_filters(
+    language: Optional[str] = None,
+    debate_preset_id: Optional[str] = None,
+    length_preset: Optional[str] = None,
+    intensity: Optional[int] = None
+) -> List[ColumnElement[bool]]:
+    """
+    WHERE clauses over DebateConfig fields, each backed by an index:
+    btree expression indexes for the string keys, the jsonb_path_ops GIN
+    index (containment) for everything else.
+    """
+    clauses: List[ColumnElement[bool]] = []
+    if language:
+        clauses.append(CONFIG_LANGUAGE == language)
+    if debate_preset_id:
+        clauses.append(CONFIG_PRESET_ID == debate_preset_id)
+    if length_preset:
+        clauses.append(CONFIG_LENGTH_PRESET == length_preset)
+    if intensity is not None:
+        clauses.append(config_contains({"intensity": intensity}))
+    return clauses
+
+
+def config_contains(fragment: Dict[str, Any]) -> ColumnElement[bool]:
+    """config_json @> fragment, served by ix_debates_config_json."""
+    return Debate.config_json.op("@>")(type_coerce(fragment, JSONB))
+
+
+def participant_filter(model_id: str, role: Optional[str] = None) -> ColumnElement[bool]:
+    """
+    Debates where `model_id` took part (optionally in a given role).
+    Without a role the model_ids expression index is used; with one,
+    containment on the participants array.
+    """
+    if role:
+        return config_contains({"participants": [{"model_id": model_id, "role": role}]})
+    return CONFIG_MODEL_IDS.op("@>")(type_coerce([model_id], JSONB))
@@ -0,0 +1,234 @@
+import os
+import gzip
+import json
+import fcntl
+import uuid
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, List, Optional
+from sqlalchemy import delete, exists, text
+from sqlalchemy.orm import Session as DBSession
+
+from app.core.config import settings
+from app.models.models import Debate, Turn, TurnArchive
+
+# `turns` is range-partitioned by month of created_at: turns_YYYY_MM, plus
+# turns_default as a safety net. Partitions are created ahead of time by
+# partitions_job (app/cron.py) and dropped once every debate in them has
+# been archived.
+PARTITION_MONTHS_AHEAD = 2
+# Debates whose turns can no longer change
+ARCHIVABLE_STATUSES = ["completed", "error"]
+DEFAULT_PARTITION = "turns_default"
+
+# Turn columns written to the archive (search_vector is derived, not stored)
+ARCHIVE_COLUMNS = [
+    "id", "debate_id", "seq_index", "round_id", "turn_type", "speaker_id", "speaker_name",
+    "text", "word_count", "model_used", "usage_json", "retake_count", "created_at", "search_config"
+]
+
+
+def _month_start(dt: datetime) -> datetime:
+    return datetime(dt.year, dt.month, 1)
+
+
+def _add_months(dt: datetime, months: int) -> datetime:
+    month_index = dt.year * 12 + dt.month - 1 + months
+    return datetime(month_index // 12, month_index % 12 + 1, 1)
+
+
+def partition_name(month: datetime) -> str:
+    return f"turns_{month:%Y_%m}"
+
+
+def _attach_month_from_default(db: DBSession, name: str, start: datetime, end: datetime):
+    """
+    Turns of a month without a partition went to turns_default, and
+    Postgres refuses to create a partition for a range the default holds
+    rows of: create the month as a plain table, move those rows into it,
+    then attach it.
+    """
+    bounds = {"start": start, "end": end}
+    # Turns arriving meanwhile wait instead of landing in the default again
+    db.execute(text(f"LOCK TABLE {DEFAULT_PARTITION} IN ACCESS EXCLUSIVE MODE"))
+    db.execute(text(f"CREATE TABLE {name} (LIKE turns INCLUDING DEFAULTS INCLUDING GENERATED INCLUDING CONSTRAINTS)"))
+    columns = ", ".join(ARCHIVE_COLUMNS)
+    db.execute(text(
+        f"WITH moved AS (DELETE FROM {DEFAULT_PARTITION} WHERE created_at >= :start AND created_at < :end "
+        f"RETURNING {columns}) INSERT INTO {name} ({columns}) SELECT {columns} FROM moved"
+    ), bounds)
+    db.execute(text(
+        f"ALTER TABLE turns ATTACH PARTITION {name} "
+        f"FOR VALUES FROM ('{start:%Y-%m-%d}') TO ('{end:%Y-%m-%d}')"
+    ))
+
+
+def ensure_turn_partitions(db: DBSession, months_ahead: int = PARTITION_MONTHS_AHEAD) -> List[str]:
+    """
+    Create monthly partitions from the current month up to `months_ahead`,
+    plus one for every month that has turns in turns_default (whose rows
+    are moved into it). Idempotent; returns the partitions created. Caller
+    commits.
+    """
+    # Concurrent callers would race for the same partition names
+    db.execute(text("SELECT pg_advisory_xact_lock(hashtext('turns_partitions'))"))
+    month = _month_start(datetime.now(timezone.utc).replace(tzinfo=None))
+    months = {_add_months(month, i) for i in range(months_ahead + 1)}
+    stray = db.execute(text(
+        f"SELECT DISTINCT date_trunc('month', created_at) FROM {DEFAULT_PARTITION}"
+    )).scalars().all()
+    months.update(stray)
+
+    created: List[str] = []
+    for start in sorted(months):
+        name = partition_name(start)
+        if db.execute(text("SELECT to_regclass(:name)"), {"name": name}).scalar() is not None:
+            continue
+        end = _add_months(start, 1)
+        if start in stray:
+            _attach_month_from_default(db, name, start, end)
+        else:
+            db.execute(text(
+                f"CREATE TABLE {name} PARTITION OF turns "
+                f"FOR VALUES FROM ('{start:%Y-%m-%d}') TO ('{end:%Y-%m-%d}')"
+            ))
+        created.append(name)
+    return created
+
+
+def drop_empty_partitions(db: DBSession, before: datetime) -> List[str]:
+    """
+    Detach and drop monthly partitions that end before `before` and hold no
+    rows (i.e. all their debates were archived). Caller commits.
+    """
+    rows = db.execute(text(
+        "SELECT c.relname FROM pg_inherits i "
+        "JOIN pg_class c ON c.oid = i.inhrelid "
+        "JOIN pg_class p ON p.oid = i.inhparent "
+        "WHERE p.relname = 'turns' AND c.relname ~ '^turns_[0-9]{4}_[0-9]{2}$'"
+    )).scalars().all()
+
+    dropped: List[str] = []
+    for name in sorted(rows):
+        month = datetime.strptime(name, "turns_%Y_%m")
+        if _add_months(month, 1) > before:
+            continue
+        if db.execute(text(f"SELECT 1 FROM {name} LIMIT 1")).first():
+            continue
+        db.execute(text(f"ALTER TABLE turns DETACH PARTITION {name}"))
+        db.execute(text(f"DROP TABLE {name}"))
+        dropped.append(name)
+    return dropped
+
+
+def _turn_record(turn: Turn) -> Dict[str, Any]:
+    record = {col: getattr(turn, col) for col in ARCHIVE_COLUMNS}
+    record["id"] = str(turn.id)
+    record["debate_id"] = str(turn.debate_id)
+    record["created_at"] = turn.created_at.isoformat()
+    return record
+
+
+def _append_member(rel_path: str, member: bytes) -> int:
+    """
+    Append one gzip member to an archive file and return its offset.
+    Concatenated members form a valid .gz file, and each can be read alone.
+    """
+    path = os.path.join(settings.ARCHIVE_DIR, rel_path)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, "ab") as f:
+        fcntl.flock(f, fcntl.LOCK_EX)
+        try:
+            offset = f.seek(0, os.SEEK_END)
+            f.write(member)
+            f.flush()
+            os.fsync(f.fileno())
+        finally:
+            fcntl.flock(f, fcntl.LOCK_UN)
+    return offset
+
+
+def archive_debate(db: DBSession, debate_id: uuid.UUID, debate_created_at: datetime) -> TurnArchive:
+    """
+    Move one debate's turns out of the hot table into the archive.
+    The file is fsynced before the index row and the delete are committed,
+    so a crash can leave unreferenced bytes but never lose turns.
+    """
+    turns = (
+        db.query(Turn)
+        .filter(Turn.debate_id == debate_id, Turn.created_at >= debate_created_at)
+        .order_by(Turn.seq_index)
+        .all()
+    )
+    body = "".join(json.dumps(_turn_record(t), ensure_ascii=False) + "\n" for t in turns).encode("utf-8")
+    rel_path = f"{debate_created_at:%Y/%m}.ndjson.gz"
+
+    offset, length = 0, 0
+    if turns:
+        member = gzip.compress(body, mtime=0)
+        offset = _append_member(rel_path, member)
+        length = len(member)
+
+    entry = TurnArchive(
+        debate_id=debate_id,
+        path=rel_path,
+        offset=offset,
+        length=length,
+        turns_count=len(turns),
+        last_seq=turns[-1].seq_index if turns else None
+    )
+    db.add(entry)
+    db.execute(delete(Turn).where(Turn.debate_id == debate_id, Turn.created_at >= debate_created_at))
+    return entry
+
+
+def archive_cold_debates(db: DBSession, retention_days: Optional[int] = None, batch_size: int = 100) -> int:
+    """
+    Archive up to `batch_size` finished debates created before the retention
+    window, then drop partitions that became empty. Returns the number
+    archived. Debates still scheduled, queued or running are left alone:
+    their turns are still being written.
+    """
+    days = retention_days if retention_days is not None else settings.ARCHIVE_RETENTION_DAYS
+    cutoff = datetime.now(timezone.utc).replace(tzinfo=None) - timedelta(days=days)
+
+    ensure_turn_partitions(db)
+    db.commit()
+
+    cold = (
+        db.query(Debate.id, Debate.created_at)
+        .filter(
+            Debate.created_at < cutoff,
+            Debate.status.in_(ARCHIVABLE_STATUSES),
+            ~exists().where(TurnArchive.debate_id == Debate.id)
+        )
+        .order_by(Debate.created_at)
+        .limit(batch_size)
+        .all()
+    )
+    for debate_id, created_at in cold:
+        archive_debate(db, debate_id, created_at)
+        db.commit()
+
+    dropped = drop_empty_partitions(db, _month_start(cutoff))
+    db.commit()
+    if dropped:
+        print(f"Dropped archived turn partitions: {', '.join(dropped)}")
+    return len(cold)
+
+
+def read_archived_turns(entry: TurnArchive) -> List[Dict[str, Any]]:
+    """
+    Rehydrate a debate's turns from its archive member, ordered by seq_index.
+    """
+    if not entry.length:
+        return []
+    with open(os.path.join(settings.ARCHIVE_DIR, entry.path), "rb") as f:
+        f.seek(entry.offset)
+        member = f.read(entry.length)
+
+    turns: List[Dict[str, Any]] = []
+    for line in gzip.decompress(member).splitlines():
+        record = json.loads(line)
+        record["created_at"] = datetime.fromisoformat(record["created_at"])
+        turns.append(record)
+    return turns
@@ -0,0 +1,173 @@
+import os
+import json
+import gzip
+import time
+import base64
+import asyncio
+import hashlib
+from typing import Any, AsyncIterator, Callable, Dict, List, Optional
+import httpx
+from app.core.config import settings
+
+# Record-and-replay of raw OpenRouter HTTP exchanges ("cassettes"), for
+# debugging stream handling and benchmarking the parser offline.
+#
+#   OPENROUTER_CASSETTES=record   pass requests through, save every response
+#   OPENROUTER_CASSETTES=replay   never touch the network, serve saved responses
+#
+# A cassette is one gzipped JSON file per request under
+# OPENROUTER_CASSETTE_DIR. It keeps the response status, headers and every
+# body chunk exactly as received (keep-alive comments, error chunks and
+# all), each with its offset from the start of the request. Requests are
+# matched on method, path and body, never on headers, so API keys are
+# neither stored nor needed to replay.
+CASSETTE_VERSION = 1
+
+
+def request_key(request: httpx.Request) -> str:
+    body = request.content
+    try:
+        # Canonical JSON, so key order in the payload does not matter
+        body = json.dumps(json.loads(body), sort_keys=True, separators=(",", ":")).encode()
+    except ValueError:
+        pass
+    digest = hashlib.sha256(f"{request.method} {request.url.path}\n".encode())
+    digest.update(body)
+    return digest.hexdigest()
+
+
+def cassette_path(root: str, key: str) -> str:
+    return os.path.join(root, f"{key}.json.gz")
+
+
+def save_cassette(path: str, cassette: Dict[str, Any]):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    with gzip.open(tmp_path, "wt", encoding="utf-8") as f:
+        json.dump(cassette, f)
+    os.replace(tmp_path, path)
+
+
+def load_cassette(path: str) -> Dict[str, Any]:
+    with gzip.open(path, "rt", encoding="utf-8") as f:
+        return json.load(f)
+
+
+class _RecordingStream(httpx.AsyncByteStream):
+    """Passes the body through while keeping every chunk and its arrival time."""
+
+    def __init__(self, inner: httpx.AsyncByteStream, started: float, on_close: Callable[[List[List[Any]]], Any]):
+        self.inner = inner
+        self.started = started
+        self.on_close = on_close
+        self.chunks: List[List[Any]] = []
+
+    async def __aiter__(self) -> AsyncIterator[bytes]:
+        async for chunk in self.inner:
+            self.chunks.append([round(time.perf_counter() - self.started, 4), base64.b64encode(chunk).decode()])
+            yield chunk
+
+    async def aclose(self):
+        await self.inner.aclose()
+        await self.on_close(self.chunks)
+
+
+class RecordingTransport(httpx.AsyncBaseTransport):
+    def __init__(self, root: str, inner: Optional[httpx.AsyncBaseTransport] = None):
+        self.root = root
+        self.inner = inner or httpx.AsyncHTTPTransport()
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        started = time.perf_counter()
+        response = await self.inner.handle_async_request(request)
+        headers_at = round(time.perf_counter() - started, 4)
+        key = request_key(request)
+
+        async def save(chunks: List[List[Any]]):
+            # Only what the caller read: validate_model stops after the
+            # first chunk, and so does its replay
+            cassette = {
+                "version": CASSETTE_VERSION,
+                "recorded_at": time.time(),
+                "request": {
+                    "method": request.method,
+                    "path": request.url.path,
+                    "body": json.loads(request.content) if request.content else None,
+                },
+                "status": response.status_code,
+                # Chunks are the body as sent (still compressed, if it was):
+                # content-encoding stays so replays decode it the same way
+                "headers": [[k, v] for k, v in response.headers.multi_items() if k.lower() not in ("content-length", "set-cookie")],
+                "headers_at": headers_at,
+                "chunks": chunks,
+            }
+            try:
+                await asyncio.to_thread(save_cassette, cassette_path(self.root, key), cassette)
+            except Exception as e:
+                print(f"Cassette write failed: {e}")
+
+        return httpx.Response(
+            status_code=response.status_code,
+            headers=response.headers,
+            stream=_RecordingStream(response.stream, started, save),  # type: ignore
+            extensions=response.extensions,
+        )
+
+    async def aclose(self):
+        await self.inner.aclose()
+
+
+class _ReplayStream(httpx.AsyncByteStream):
+    def __init__(self, chunks: List[List[Any]], elapsed: float, speed: float):
+        self.chunks = chunks
+        self.elapsed = elapsed
+        self.speed = speed
+
+    async def __aiter__(self) -> AsyncIterator[bytes]:
+        elapsed = self.elapsed
+        for offset, data in self.chunks:
+            if self.speed > 0 and offset > elapsed:
+                await asyncio.sleep((offset - elapsed) / self.speed)
+            elapsed = offset
+            yield base64.b64decode(data)
+
+
+class ReplayTransport(httpx.AsyncBaseTransport):
+    """
+    Serves recorded responses. speed=1 reproduces the recorded timing, larger
+    is faster, 0 replays as fast as possible. With `cassette` given, that one
+    recording answers every request (for benchmarks). Unknown requests get a
+    404 in OpenRouter's error format, so callers fail the usual way.
+    """
+
+    def __init__(self, root: str, speed: float = 1.0, cassette: Optional[Dict[str, Any]] = None):
+        self.root = root
+        self.speed = speed
+        self.cassette = cassette
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        cassette = self.cassette
+        if cassette is None:
+            key = request_key(request)
+            try:
+                cassette = await asyncio.to_thread(load_cassette, cassette_path(self.root, key))
+            except FileNotFoundError:
+                return httpx.Response(404, json={"error": {"code": 404, "message": f"No cassette for {request.method} {request.url.path} ({key[:12]})"}})
+
+        headers_at = cassette.get("headers_at", 0.0)
+        if self.speed > 0 and headers_at > 0:
+            await asyncio.sleep(headers_at / self.speed)
+        return httpx.Response(
+            status_code=cassette["status"],
+            headers=cassette["headers"],
+            stream=_ReplayStream(cassette["chunks"], headers_at, self.speed),
+        )
+
+
+def cassette_transport() -> Optional[httpx.AsyncBaseTransport]:
+    """The transport for OPENROUTER_CASSETTES, or None for plain network access."""
+    if settings.OPENROUTER_CASSETTES == "record":
+        return RecordingTransport(settings.OPENROUTER_CASSETTE_DIR)
+    if settings.OPENROUTER_CASSETTES == "replay":
+        return ReplayTransport(settings.OPENROUTER_CASSETTE_DIR, settings.OPENROUTER_CASSETTE_REPLAY_SPEED)
+    return None
@@ -0,0 +1,224 @@
+import os
+import json
+import zlib
+import time
+import asyncio
+import hashlib
+from typing import Any, AsyncGenerator, Dict, List, Optional
+import redis
+from redis import Redis
+from app.core.config import settings
+
+# Opt-in cache of whole streamed completions, for reruns of tournaments and
+# benchmark suites. Entries keep every chunk with its offset from the start
+# of the request, so hits can be streamed at the recorded pace (or faster).
+# Stats live in Redis for both backends, since each RQ job runs in its own
+# process.
+KEY_PREFIX = "completion_cache"
+STATS_KEY = f"{KEY_PREFIX}:stats"
+LRU_KEY = f"{KEY_PREFIX}:lru"
+SIZES_KEY = f"{KEY_PREFIX}:sizes"
+BYTES_KEY = f"{KEY_PREFIX}:bytes"
+# Approximate size of the disk store, so it is only scanned when over the limit
+DISK_BYTES_KEY = f"{KEY_PREFIX}:disk_bytes"
+
+redis_store: Redis = redis.from_url(settings.REDIS_URL)
+
+
+def cache_key(model: str, messages: List[Dict[str, Any]], params: Optional[Dict[str, Any]] = None) -> str:
+    """Hash of everything that determines the reply (never the API key)."""
+    canonical = json.dumps(
+        {"model": model, "messages": messages, "params": params or {}},
+        sort_keys=True, ensure_ascii=False, separators=(",", ":")
+    )
+    return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+
+def _encode(entry: Dict[str, Any]) -> bytes:
+    return zlib.compress(json.dumps(entry, ensure_ascii=False).encode("utf-8"))
+
+
+def _decode(data: bytes) -> Dict[str, Any]:
+    return json.loads(zlib.decompress(data))
+
+
+class RedisCompletionStore:
+    """
+    Entries in Redis with LRU eviction by total size: a sorted set of last
+    access times plus a hash of entry sizes.
+    """
+
+    def __init__(self, conn: Redis, max_bytes: int):
+        self.conn = conn
+        self.max_bytes = max_bytes
+
+    def _key(self, key: str) -> str:
+        return f"{KEY_PREFIX}:entry:{key}"
+
+    def get(self, key: str) -> Optional[bytes]:
+        data = self.conn.get(self._key(key))
+        if data is not None:
+            self.conn.zadd(LRU_KEY, {key: time.time()})
+        return data  # type: ignore
+
+    def set(self, key: str, data: bytes):
+        previous = int(self.conn.hget(SIZES_KEY, key) or 0)  # type: ignore
+        pipe = self.conn.pipeline()
+        pipe.set(self._key(key), data)
+        pipe.zadd(LRU_KEY, {key: time.time()})
+        pipe.hset(SIZES_KEY, key, len(data))
+        pipe.incrby(BYTES_KEY, len(data) - previous)
+        pipe.execute()
+        self._evict()
+
+    def _evict(self):
+        while int(self.conn.get(BYTES_KEY) or 0) > self.max_bytes:  # type: ignore
+            oldest = self.conn.zpopmin(LRU_KEY)
+            if not oldest:
+                break
+            key = oldest[0][0].decode()  # type: ignore
+            size = int(self.conn.hget(SIZES_KEY, key) or 0)  # type: ignore
+            pipe = self.conn.pipeline()
+            pipe.delete(self._key(key))
+            pipe.hdel(SIZES_KEY, key)
+            pipe.decrby(BYTES_KEY, size)
+            pipe.execute()
+
+    def usage(self) -> Dict[str, int]:
+        return {"entries": int(self.conn.hlen(SIZES_KEY)), "bytes": int(self.conn.get(BYTES_KEY) or 0)}  # type: ignore
+
+
+class DiskCompletionStore:
+    """
+    One file per entry under COMPLETION_CACHE_DIR; mtime is the LRU clock.
+    A running total in Redis tracks the size; the directory is only scanned
+    (and the total corrected) once that total passes the limit.
+    """
+
+    def __init__(self, root: str, max_bytes: int, conn: Redis):
+        self.root = root
+        self.max_bytes = max_bytes
+        self.conn = conn
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.root, key[:2], f"{key}.bin")
+
+    def get(self, key: str) -> Optional[bytes]:
+        path = self._path(key)
+        try:
+            with open(path, "rb") as f:
+                data = f.read()
+        except FileNotFoundError:
+            return None
+        os.utime(path)
+        return data
+
+    def set(self, key: str, data: bytes):
+        path = self._path(key)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        try:
+            previous = os.path.getsize(path)
+        except FileNotFoundError:
+            previous = 0
+        with open(tmp_path, "wb") as f:
+            f.write(data)
+        os.replace(tmp_path, path)
+        if int(self.conn.incrby(DISK_BYTES_KEY, len(data) - previous)) > self.max_bytes:  # type: ignore
+            self._evict()
+
+    def _entries(self) -> List[os.DirEntry]:
+        entries: List[os.DirEntry] = []
+        if not os.path.isdir(self.root):
+            return entries
+        for shard in os.scandir(self.root):
+            if shard.is_dir():
+                entries.extend(e for e in os.scandir(shard.path) if e.name.endswith(".bin"))
+        return entries
+
+    def _evict(self):
+        entries = []
+        for e in self._entries():
+            st = e.stat()
+            entries.append((st.st_mtime, st.st_size, e.path))
+        total = sum(size for _, size, _ in entries)
+        for _, size, path in sorted(entries):
+            if total <= self.max_bytes:
+                break
+            try:
+                os.unlink(path)
+            except FileNotFoundError:
+                pass
+            total -= size
+        self.conn.set(DISK_BYTES_KEY, total)
+
+    def usage(self) -> Dict[str, int]:
+        entries = self._entries()
+        return {"entries": len(entries), "bytes": sum(e.stat().st_size for e in entries)}
+
+
+def get_store():
+    """The configured store, or None when caching is off."""
+    if settings.COMPLETION_CACHE == "redis":
+        return RedisCompletionStore(redis_store, settings.COMPLETION_CACHE_MAX_BYTES)
+    if settings.COMPLETION_CACHE == "disk":
+        return DiskCompletionStore(settings.COMPLETION_CACHE_DIR, settings.COMPLETION_CACHE_MAX_BYTES, redis_store)
+    return None
+
+
+def _count(field: str, amount: float = 1):
+    try:
+        redis_store.hincrbyfloat(STATS_KEY, field, amount)
+    except Exception as e:
+        print(f"Completion cache stats update failed: {e}")
+
+
+def lookup(store, key: str) -> Optional[Dict[str, Any]]:
+    try:
+        data = store.get(key)
+    except Exception as e:
+        print(f"Completion cache read failed: {e}")
+        return None
+    if data is None:
+        _count("misses")
+        return None
+    entry = _decode(data)
+    _count("hits")
+    _count("cost_saved", float((entry.get("usage") or {}).get("cost") or 0.0))
+    return entry
+
+
+def store_entry(store, key: str, model: str, chunks: List[List[Any]], usage: Dict[str, Any]):
+    try:
+        store.set(key, _encode({"model": model, "chunks": chunks, "usage": usage, "created_at": time.time()}))
+    except Exception as e:
+        print(f"Completion cache write failed: {e}")
+
+
+async def replay_entry(entry: Dict[str, Any], speed: float) -> AsyncGenerator[str, None]:
+    """
+    Stream cached chunks. speed=1 reproduces the recorded timing (TTFT and
+    token rate), larger is faster, 0 streams as fast as possible.
+    """
+    elapsed = 0.0
+    for offset, text in entry["chunks"]:
+        if speed > 0 and offset > elapsed:
+            await asyncio.sleep((offset - elapsed) / speed)
+        elapsed = offset
+        yield text
+
+
+def cache_stats() -> Dict[str, Any]:
+    raw = {k.decode(): float(v) for k, v in redis_store.hgetall(STATS_KEY).items()}  # type: ignore
+    hits, misses = int(raw.get("hits", 0)), int(raw.get("misses", 0))
+    stats: Dict[str, Any] = {
+        "backend": settings.COMPLETION_CACHE or None,
+        "hits": hits,
+        "misses": misses,
+        "hit_rate": hits / (hits + misses) if hits + misses else None,
+        "cost_saved": raw.get("cost_saved", 0.0),
+    }
+    store = get_store()
+    if store:
+        stats.update(store.usage())
+    return stats
@@ -0,0 +1,158 @@
+import re
+import math
+from collections import Counter, defaultdict
+from typing import Dict, List, NamedTuple, Sequence, Tuple
+from app.core.config import settings
+
+# Relevance-based debate history for large panels. Instead of the full
+# transcript, a speaker gets the last few turns verbatim plus the earlier
+# passages most relevant to the current exchange, within a token budget, so
+# prompts stay flat as the debate grows.
+#
+# Passages are chunks of about CONTEXT_CHUNK_WORDS words (whole paragraphs
+# where possible), ranked with BM25 against the topic, the recent turns and
+# the speaker's own last turn. The index is filled turn by turn
+# (ContextIndex.add_turn); RQ runs every job in a fresh work horse, so
+# process_turn_job builds it from the turns it already loads.
+
+# Words of two characters or more
+_WORD = re.compile(r"\w\w+")
+
+# BM25 parameters (the usual defaults)
+_K1 = 1.2
+_B = 0.75
+
+
+def estimate_tokens(text: str) -> int:
+    """Rough token count (~4 characters per token); no tokenizer download needed."""
+    return len(text) // 4 + 1
+
+
+def terms(text: str) -> List[str]:
+    return _WORD.findall(text.lower())
+
+
+class Passage(NamedTuple):
+    seq_index: int
+    position: int  # chunk number within the turn
+    speaker_name: str
+    text: str
+
+
+def format_history(turns: Sequence) -> str:
+    """
+    Transcript of previous turns as sent to the model ("Speaker: text" blocks).
+    """
+    return "".join(f"{t.speaker_name}: {t.text}\n\n" for t in turns)
+
+
+def split_passages(text: str, chunk_words: int) -> List[str]:
+    """Pack paragraphs into chunks of about chunk_words words; long paragraphs are cut."""
+    chunks: List[str] = []
+    current: List[str] = []
+    current_words = 0
+    for paragraph in text.split("\n\n"):
+        words = paragraph.split()
+        if not words:
+            continue
+        if len(words) > chunk_words:
+            if current:
+                chunks.append("\n\n".join(current))
+                current, current_words = [], 0
+            for i in range(0, len(words), chunk_words):
+                chunks.append(" ".join(words[i:i + chunk_words]))
+            continue
+        if current and current_words + len(words) > chunk_words:
+            chunks.append("\n\n".join(current))
+            current, current_words = [], 0
+        current.append(paragraph.strip())
+        current_words += len(words)
+    if current:
+        chunks.append("\n\n".join(current))
+    return chunks
+
+
+class ContextIndex:
+    """In-memory BM25 index over the passages of a debate's turns."""
+
+    def __init__(self, chunk_words: int = 120):
+        self.chunk_words = chunk_words
+        self.passages: List[Passage] = []
+        self.lengths: List[int] = []
+        self.total_length = 0
+        # term -> [(passage number, term frequency)]
+        self.postings: Dict[str, List[Tuple[int, int]]] = defaultdict(list)
+
+    def add_turn(self, seq_index: int, speaker_name: str, text: str):
+        for position, chunk in enumerate(split_passages(text, self.chunk_words)):
+            number = len(self.passages)
+            counts = Counter(terms(chunk))
+            self.passages.append(Passage(seq_index, position, speaker_name, chunk))
+            length = sum(counts.values())
+            self.lengths.append(length)
+            self.total_length += length
+            for term, tf in counts.items():
+                self.postings[term].append((number, tf))
+
+    def search(self, query: str, before_seq: int) -> List[Tuple[float, Passage]]:
+        """Passages of turns before `before_seq` matching the query, best first."""
+        n = len(self.passages)
+        if not n:
+            return []
+        average_length = self.total_length / n or 1.0
+        norms = [_K1 * (1 - _B + _B * length / average_length) for length in self.lengths]
+        passages = self.passages
+        scores: Dict[int, float] = defaultdict(float)
+        for term in set(terms(query)):
+            postings = self.postings.get(term)
+            if not postings:
+                continue
+            idf = math.log(1 + (n - len(postings) + 0.5) / (len(postings) + 0.5))
+            for number, tf in postings:
+                if passages[number].seq_index < before_seq:
+                    scores[number] += idf * tf * (_K1 + 1) / (tf + norms[number])
+        ranked = sorted(scores.items(), key=lambda item: item[1], reverse=True)
+        return [(score, self.passages[number]) for number, score in ranked]
+
+
+def select_history(turns: Sequence, speaker_name: str, topic: str) -> str:
+    """
+    Debate history for `speaker_name` from Turn rows in seq order: the full
+    transcript while it fits CONTEXT_TOKEN_BUDGET, else the last
+    CONTEXT_RECENT_TURNS turns plus the most relevant earlier passages.
+    """
+    full = format_history(turns)
+    if estimate_tokens(full) <= settings.CONTEXT_TOKEN_BUDGET:
+        return full
+
+    recent_count = max(settings.CONTEXT_RECENT_TURNS, 1)
+    earlier, recent = list(turns[:-recent_count]), list(turns[-recent_count:])
+    recent_str = format_history(recent)
+    budget = settings.CONTEXT_TOKEN_BUDGET - estimate_tokens(recent_str)
+
+    index = ContextIndex(settings.CONTEXT_CHUNK_WORDS)
+    for turn in earlier:
+        index.add_turn(turn.seq_index, turn.speaker_name, turn.text)
+    own_last = next((t.text for t in reversed(turns) if t.speaker_name == speaker_name), "")
+    query = " ".join([topic, own_last, *(t.text for t in recent)])
+
+    selected: List[Passage] = []
+    for _, passage in index.search(query, before_seq=recent[0].seq_index):
+        cost = estimate_tokens(passage.text) + 8
+        if cost > budget:
+            continue
+        selected.append(passage)
+        budget -= cost
+        if budget < 50:
+            break
+    if not selected:
+        return recent_str
+
+    excerpts = "".join(
+        f"[Turn {p.seq_index}] {p.speaker_name}: {p.text}\n\n"
+        for p in sorted(selected, key=lambda p: (p.seq_index, p.position))
+    )
+    return (
+        f"(Excerpts of the earlier debate, selected for relevance)\n\n{excerpts}"
+        f"(Most recent turns, in full)\n\n{recent_str}"
+    )
@@ -0,0 +1,45 @@
+from typing import Optional, Tuple
+from redis import asyncio as aioredis
+from app.core.config import settings
+
+# Shared async connection for API-side caching
+redis_cache: aioredis.Redis = aioredis.from_url(settings.REDIS_URL, decode_responses=True)
+
+CACHE_TTL = 24 * 3600  # Completed debates never change; TTL only bounds memory
+
+
+def _key(debate_id: str) -> str:
+    return f"debate_cache:{debate_id}"
+
+
+async def get_cached_debate(debate_id: str) -> Optional[Tuple[str, str]]:
+    """
+    Return (etag, json_body) for a cached completed debate, or None.
+    """
+    try:
+        cached = await redis_cache.hgetall(_key(debate_id))  # type: ignore
+    except Exception as e:
+        print(f"Debate cache read failed: {e}")
+        return None
+    if not cached:
+        return None
+    return cached["etag"], cached["body"]
+
+
+async def set_cached_debate(debate_id: str, etag: str, body: str):
+    """
+    Cache the full serialized response of a completed debate.
+    """
+    try:
+        key = _key(debate_id)
+        await redis_cache.hset(key, mapping={"etag": etag, "body": body})  # type: ignore
+        await redis_cache.expire(key, CACHE_TTL)
+    except Exception as e:
+        print(f"Debate cache write failed: {e}")
+
+
+async def invalidate_debate(debate_id: str):
+    try:
+        await redis_cache.delete(_key(debate_id))
+    except Exception as e:
+        print(f"Debate cache invalidation failed: {e}")
@@ -0,0 +1,301 @@
+from functools import lru_cache
+from typing import Any, Dict, List, Optional, Tuple
+import tiktoken
+from sqlalchemy import func
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.future import select
+from app.core.config import settings
+from app.models.models import ModelStats
+from app.services.openrouter_client import openrouter_client
+from app.services.context import estimate_tokens
+from app.services.judges import panel_judges
+from app.services.prompt_builder import prompt_builder
+from app.services.turn_plan import DEFAULT_MODEL_ID, round_order, total_turns
+
+# Pre-flight estimates and run-time budgets of debates.
+#
+# The estimate replays the turn plan of a config: prompt tokens are counted
+# with tiktoken on the real prompts plus the modeled history (capped like the
+# orchestrator caps it: panel selection, rolling summaries), completions are
+# the length preset's target, prices come from the OpenRouter catalog and
+# speeds from model_stats (observed tokens per second, latency included).
+#
+# debates.budget_json keeps the limits (max_cost_usd, max_tokens), the
+# catalog prices of the debate's models at creation, the estimate and the
+# spend so far. Before each generation the orchestrator asks
+# completion_allowance() how many completion tokens it may still use (always
+# keeping enough for the verdict) and passes that as max_tokens; when a turn
+# cannot get MIN_TURN_TOKENS the debate goes straight to its verdict.
+
+# Target words of each length_preset, as the prompt asks for
+LENGTH_WORDS = {'very_short': 50, 'short': 100, 'medium': 250, 'long': 500}
+TOKENS_PER_WORD = 1.4
+# max_tokens of a turn: room for overshooting the target and Markdown
+MAX_TOKENS_FACTOR = 3.0
+VERDICT_MAX_TOKENS = 2000
+VERDICT_EXPECTED_TOKENS = 800
+# Models without observed throughput yet
+DEFAULT_TOKENS_PER_SECOND = 40.0
+DEFAULT_TTFT_SECONDS = 1.5
+# Job pickup, database and publish time of a turn
+TURN_OVERHEAD_SECONDS = 0.3
+# Counted prompt tokens are inflated by this: providers tokenize differently
+PROMPT_MARGIN = 1.1
+# A generation that cannot get this many completion tokens is not started
+MIN_TURN_TOKENS = 64
+
+# model_id -> (USD per prompt token, USD per completion token)
+Prices = Dict[str, Tuple[float, float]]
+
+
+def _target_words(length_preset: Optional[str]) -> int:
+    return LENGTH_WORDS.get(length_preset or 'medium', LENGTH_WORDS['medium'])
+
+
+def max_tokens_for(length_preset: Optional[str]) -> int:
+    """Per-turn max_tokens for a length_preset."""
+    return int(_target_words(length_preset) * TOKENS_PER_WORD * MAX_TOKENS_FACTOR)
+
+
+def summary_max_tokens() -> int:
+    return int(settings.SUMMARY_MAX_WORDS * TOKENS_PER_WORD * 1.5)
+
+
+@lru_cache(maxsize=1)
+def _encoding() -> Any:
+    try:
+        return tiktoken.get_encoding(settings.TOKENIZER_ENCODING)
+    except Exception as e:
+        # The encoding is downloaded on first use (the image preloads it)
+        print(f"tiktoken unavailable, estimating tokens from length: {e}")
+        return None
+
+
+def count_tokens(text: str) -> int:
+    encoding = _encoding()
+    if encoding is None:
+        return estimate_tokens(text)
+    return len(encoding.encode(text, disallowed_special=()))
+
+
+def count_message_tokens(messages: List[Dict[str, Any]]) -> int:
+    # Chat formatting adds a few tokens per message
+    return sum(count_tokens(str(m.get("content") or "")) + 4 for m in messages) + 3
+
+
+def catalog_prices(models: List[Dict[str, Any]]) -> Prices:
+    """Per-token prices from get_models() entries."""
+    prices: Prices = {}
+    for model in models:
+        try:
+            prices[model["id"]] = (float(model["pricing"]["prompt"]), float(model["pricing"]["completion"]))
+        except (KeyError, TypeError, ValueError):
+            continue
+    return prices
+
+
+def debate_models(conf: Dict[str, Any]) -> List[str]:
+    """Every model a debate may call: participants, judges and the summarizer."""
+    models = [p.get('model_id') or DEFAULT_MODEL_ID for p in conf.get('participants', [])]
+    if not any(p.get('role') == 'moderator' for p in conf.get('participants', [])):
+        models.append(DEFAULT_MODEL_ID)
+    models.extend(panel_judges(conf))
+    summary_model = conf.get('summary_model') or settings.SUMMARY_MODEL
+    if summary_model:
+        models.append(summary_model)
+    return list(dict.fromkeys(models))
+
+
+async def model_throughput(db: AsyncSession, model_ids: List[str]) -> Dict[str, float]:
+    """Observed completion tokens per second (latency included) from model_stats."""
+    stmt = (
+        select(ModelStats.model_id, func.sum(ModelStats.tokens_out), func.sum(ModelStats.total_latency_ms))
+        .where(ModelStats.model_id.in_(model_ids))
+        .group_by(ModelStats.model_id)
+    )
+    rates: Dict[str, float] = {}
+    for model_id, tokens_out, latency_ms in (await db.execute(stmt)).all():
+        if tokens_out and latency_ms:
+            rates[model_id] = float(tokens_out) / (float(latency_ms) / 1000)
+    return rates
+
+
+def estimate_debate(conf: Dict[str, Any], prices: Prices, rates: Dict[str, float]) -> Dict[str, Any]:
+    """Expected tokens, cost and duration of a debate config, with worst-case cost at max_tokens."""
+    order = round_order(conf)
+    turns = total_turns(conf)
+    participants = conf.get('participants', [])
+    expected_out = int(_target_words(conf.get('length_preset')) * TOKENS_PER_WORD)
+    cap = max_tokens_for(conf.get('length_preset'))
+    # One "Speaker: text" block of the history
+    per_turn_history = expected_out + 8
+    selection = bool(settings.CONTEXT_SELECTION_MIN_PARTICIPANTS) and len(participants) >= settings.CONTEXT_SELECTION_MIN_PARTICIPANTS
+    summary_model = conf.get('summary_model') or settings.SUMMARY_MODEL
+    summary_tokens = int(settings.SUMMARY_MAX_WORDS * TOKENS_PER_WORD)
+
+    models: Dict[str, Dict[str, Any]] = {}
+    totals = {"tokens_in": 0, "tokens_out": 0, "cost_usd": 0.0, "max_cost_usd": 0.0, "duration_seconds": 0.0}
+
+    def add(model_id: str, tokens_in: int, tokens_out: int, max_out: int, on_critical_path: bool = True):
+        price_in, price_out = prices.get(model_id, (0.0, 0.0))
+        entry = models.setdefault(model_id, {"calls": 0, "tokens_in": 0, "tokens_out": 0, "cost_usd": 0.0})
+        cost = tokens_in * price_in + tokens_out * price_out
+        entry["calls"] += 1
+        entry["tokens_in"] += tokens_in
+        entry["tokens_out"] += tokens_out
+        entry["cost_usd"] += cost
+        totals["tokens_in"] += tokens_in
+        totals["tokens_out"] += tokens_out
+        totals["cost_usd"] += cost
+        totals["max_cost_usd"] += int(tokens_in * PROMPT_MARGIN) * price_in + max_out * price_out
+        if on_critical_path:
+            rate = rates.get(model_id)
+            seconds = tokens_out / rate if rate else DEFAULT_TTFT_SECONDS + tokens_out / DEFAULT_TOKENS_PER_SECOND
+            totals["duration_seconds"] += seconds + TURN_OVERHEAD_SECONDS
+
+    fixed_prompt = {
+        id(speaker): count_message_tokens(prompt_builder.build_turn_messages(conf, speaker, ""))
+        for speaker, _ in order
+    }
+    transcript = 0
+    summarized_through = -1
+    for seq_index in range(turns):
+        speaker, _ = order[seq_index % len(order)]
+        history = transcript
+        if summarized_through >= 0:
+            history = summary_tokens + (seq_index - summarized_through - 1) * per_turn_history
+        if selection:
+            history = min(history, max(settings.CONTEXT_TOKEN_BUDGET, settings.CONTEXT_RECENT_TURNS * per_turn_history))
+        add(speaker.get('model_id') or DEFAULT_MODEL_ID, fixed_prompt[id(speaker)] + history, expected_out, cap)
+        transcript += per_turn_history
+
+        # Rolling summary at the end of each round (off the critical path);
+        # the next turn still sees the previous one
+        through_seq = seq_index - settings.SUMMARY_RECENT_TURNS
+        if summary_model and (seq_index + 1) % len(order) == 0 and through_seq > summarized_through:
+            new_turns = (through_seq - summarized_through) * per_turn_history
+            add(summary_model, 300 + (summary_tokens if summarized_through >= 0 else 0) + new_turns, summary_tokens, summary_max_tokens(), False)
+            summarized_through = through_seq
+
+    moderator = next((p for p in participants if p.get('role') == 'moderator'), None)
+    judges = panel_judges(conf) or [(moderator or {}).get('model_id') or DEFAULT_MODEL_ID]
+    verdict_prompt = count_message_tokens(prompt_builder.build_verdict_messages(conf, "", vote=len(judges) > 1))
+    for i, judge in enumerate(judges):
+        # A panel's judges run concurrently
+        add(judge, verdict_prompt + transcript, VERDICT_EXPECTED_TOKENS, VERDICT_MAX_TOKENS, on_critical_path=i == 0)
+
+    return {
+        "calls": sum(m["calls"] for m in models.values()),
+        "turns": turns,
+        "max_tokens_per_turn": cap,
+        "tokens_in": totals["tokens_in"],
+        "tokens_out": totals["tokens_out"],
+        "cost_usd": round(totals["cost_usd"], 6),
+        "max_cost_usd": round(totals["max_cost_usd"], 6),
+        "duration_seconds": round(totals["duration_seconds"], 1),
+        "models": {
+            model_id: {**entry, "cost_usd": round(entry["cost_usd"], 6), "tokens_per_second": rates.get(model_id)}
+            for model_id, entry in models.items()
+        },
+        # Counted at zero cost above: not in the catalog
+        "unpriced_models": [m for m in models if m not in prices],
+        "tokenizer": settings.TOKENIZER_ENCODING if _encoding() is not None else "estimate",
+    }
+
+
+async def plan_debates(db: AsyncSession, confs: List[Dict[str, Any]]) -> Tuple[List[Dict[str, Any]], Prices]:
+    """Estimates of debate configs from one catalog fetch and model_stats query, with the prices used."""
+    prices = catalog_prices(await openrouter_client.get_models())
+    rates = await model_throughput(db, list(dict.fromkeys(m for conf in confs for m in debate_models(conf))))
+    return [estimate_debate(conf, prices, rates) for conf in confs], prices
+
+
+async def plan_debate(db: AsyncSession, conf: Dict[str, Any]) -> Tuple[Dict[str, Any], Prices]:
+    """Estimate of a debate config from the catalog and model_stats, with the prices used."""
+    estimates, prices = await plan_debates(db, [conf])
+    return estimates[0], prices
+
+
+def new_budget(conf: Dict[str, Any], prices: Prices, estimate: Dict[str, Any]) -> Dict[str, Any]:
+    """Initial budget_json of a debate."""
+    return {
+        "max_cost_usd": conf.get('max_cost_usd') or settings.DEBATE_MAX_COST_USD or None,
+        "max_tokens": conf.get('max_total_tokens') or None,
+        "pricing": {m: list(prices[m]) for m in debate_models(conf) if m in prices},
+        "estimate": estimate,
+        "spent_cost": 0.0,
+        "spent_tokens": 0,
+        # Completion tokens of all turns: the verdict prompt grows by these
+        "transcript_tokens": 0,
+    }
+
+
+def unpriced_under_cap(budget: Dict[str, Any]) -> List[str]:
+    """
+    Models of a cost-capped budget without a catalog price (unknown ids, or
+    the catalog could not be fetched): their calls would not be capped.
+    """
+    if not budget.get("max_cost_usd"):
+        return []
+    return list(budget["estimate"].get("unpriced_models", []))
+
+
+def is_limited(budget: Optional[Dict[str, Any]]) -> bool:
+    return bool(budget) and bool(budget.get("max_cost_usd") or budget.get("max_tokens"))  # type: ignore
+
+
+def verdict_reserve(budget: Dict[str, Any], conf: Dict[str, Any], next_turn_tokens: int) -> Tuple[float, int]:
+    """(cost, tokens) to keep for the verdict (every judge of a panel) after a turn of up to next_turn_tokens."""
+    moderator = next((p for p in conf.get('participants', []) if p.get('role') == 'moderator'), None)
+    judges = panel_judges(conf) or [(moderator or {}).get('model_id') or DEFAULT_MODEL_ID]
+    prompt = int((1000 + int(budget.get("transcript_tokens") or 0) + next_turn_tokens) * PROMPT_MARGIN)
+    cost = 0.0
+    for judge in judges:
+        price_in, price_out = budget.get("pricing", {}).get(judge, (0.0, 0.0))
+        # The verdict itself then gets whatever is left, up to VERDICT_MAX_TOKENS
+        cost += prompt * price_in + VERDICT_EXPECTED_TOKENS * price_out
+    return cost, (prompt + VERDICT_EXPECTED_TOKENS) * len(judges)
+
+
+def completion_allowance(budget: Dict[str, Any], model_id: str, prompt_tokens: int, reserve: Tuple[float, int] = (0.0, 0)) -> int:
+    """Completion tokens a call may use without breaking the budget, after the reserve."""
+    prompt_tokens = int(prompt_tokens * PROMPT_MARGIN)
+    allowance = float("inf")
+    if budget.get("max_tokens"):
+        allowance = min(allowance, budget["max_tokens"] - int(budget.get("spent_tokens") or 0) - reserve[1] - prompt_tokens)
+    if budget.get("max_cost_usd"):
+        price_in, price_out = budget.get("pricing", {}).get(model_id, (0.0, 0.0))
+        left = budget["max_cost_usd"] - float(budget.get("spent_cost") or 0.0) - reserve[0] - prompt_tokens * price_in
+        if price_out > 0:
+            allowance = min(allowance, left / price_out)
+        elif left < 0:
+            allowance = 0
+    return max(int(allowance), 0) if allowance != float("inf") else 2 ** 31
+
+
+def panel_allowance(budget: Dict[str, Any], model_ids: List[str], prompt_tokens: int) -> int:
+    """Completion tokens each of a judge panel may use when all judges answer in full."""
+    prompt_tokens = int(prompt_tokens * PROMPT_MARGIN)
+    allowance = float("inf")
+    if budget.get("max_tokens"):
+        left = budget["max_tokens"] - int(budget.get("spent_tokens") or 0) - prompt_tokens * len(model_ids)
+        allowance = min(allowance, left / len(model_ids))
+    if budget.get("max_cost_usd"):
+        pricing = [budget.get("pricing", {}).get(m, (0.0, 0.0)) for m in model_ids]
+        left = budget["max_cost_usd"] - float(budget.get("spent_cost") or 0.0) - sum(prompt_tokens * p[0] for p in pricing)
+        price_out = sum(p[1] for p in pricing)
+        if price_out > 0:
+            allowance = min(allowance, left / price_out)
+        elif left < 0:
+            allowance = 0
+    return max(int(allowance), 0) if allowance != float("inf") else 2 ** 31
+
+
+def record_spend(budget: Dict[str, Any], usage: Dict[str, Any], transcript: bool = True) -> Dict[str, Any]:
+    """budget_json after a call with the given usage_record (turns also grow the transcript)."""
+    spent = dict(budget)
+    spent["spent_cost"] = float(budget.get("spent_cost") or 0.0) + float(usage.get("cost") or 0.0)
+    spent["spent_tokens"] = int(budget.get("spent_tokens") or 0) + int(usage.get("tokens_in") or 0) + int(usage.get("tokens_out") or 0)
+    if transcript:
+        spent["transcript_tokens"] = int(budget.get("transcript_tokens") or 0) + int(usage.get("tokens_out") or 0)
+    return spent
@@ -1,10 +1,16 @@
-import json
+import time
 import redis
-from typing import Dict, Any
+from typing import Dict, Any, Optional
 from app.core.config import settings
+from app.core.serialization import dumps, dumps_str, loads
+from app.services.metrics import PUBLISH
+from app.services.tracing import UNTRACED_EVENTS, publish_span, record_delivery
 
 from redis import Redis
 
+# Events after which a debate's live stream ends
+END_EVENTS = ("debate_completed", "debate_error")
+
 # Dedicated PubSub connection
 redis_pub: Redis = redis.from_url(settings.REDIS_URL)
 
@@ -12,11 +18,45 @@ def publish_event(debate_id: str, event_type: str, payload: Dict[str, Any]):
     """
     Publish a structured event to the debate channel.
     Channel: debate:{debate_id}
-    Format: JSON {event: 'name', data: {...}}
+    Format: b"{event}\n{data as JSON}", so the SSE endpoint can relay the
+    data bytes as they are, without decoding them.
+    data.ts is the publish time (epoch seconds), for measuring delivery lag.
+    When tracing, data.traceparent links SSE delivery to the publish span.
     """
     channel = f"debate:{debate_id}"
-    message = json.dumps({
-        "event": event_type,
-        "data": payload
-    })
+    if event_type in UNTRACED_EVENTS:
+        # Hot path: one delta per streamed chunk
+        _publish(channel, event_type, {**payload, "ts": time.time()})
+        return
+    with publish_span(event_type, debate_id) as trace_context:
+        _publish(channel, event_type, {**payload, **trace_context, "ts": time.time()})
+
+def _publish(channel: str, event_type: str, data: Dict[str, Any]):
+    message = event_type.encode() + b"\n" + dumps(data)
+    started = time.perf_counter()
     redis_pub.publish(channel, message)
+    PUBLISH.labels(event_type).observe(time.perf_counter() - started)
+
+def relay_event(message: str) -> Optional[Dict[str, str]]:
+    """
+    Turn a Redis pub/sub message ("{event}\n{data JSON}" from publish_event)
+    into an {event, data} event for SSE or WebSocket clients, or None if it
+    cannot be decoded. The data is relayed as published: no JSON decoding on
+    the per-delta path.
+    """
+    if message.startswith("{"):
+        # JSON {event, data} from workers predating the line format
+        try:
+            payload: Dict[str, Any] = loads(message)
+        except ValueError:
+            print("Failed to decode Redis message")
+            return None
+        event_type, data = str(payload.get("event", "update")), dumps_str(payload.get("data", {}))
+    else:
+        event_type, sep, data = message.partition("\n")
+        if not sep:
+            print("Failed to decode Redis message")
+            return None
+    if event_type not in UNTRACED_EVENTS and "traceparent" in data:
+        record_delivery(event_type, loads(data))
+    return {"event": event_type, "data": data}
@@ -0,0 +1,289 @@
+import json
+import zlib
+from datetime import datetime, timedelta, timezone
+from typing import Any, AsyncGenerator, Dict, Iterator, List, Optional, Sequence
+from sqlalchemy import DateTime, Float, Integer, String, Text, cast, func, literal_column
+from sqlalchemy.dialects.postgresql import JSONB
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.future import select
+from sqlalchemy.orm import Session as DBSession
+from starlette.concurrency import run_in_threadpool
+
+from app.models.models import Debate, DebateParticipant, Turn, TurnArchive
+from app.services.archive import ARCHIVE_COLUMNS, read_archived_turns
+
+try:
+    import pyarrow as pa  # type: ignore
+    import pyarrow.parquet as pq  # type: ignore
+except ImportError:  # Optional: only NDJSON exports are available
+    pa = None
+    pq = None
+
+EXPORT_TABLES = ["debates", "participants", "turns"]
+EXPORT_FORMATS = ["ndjson", "parquet"]
+
+# Rows fetched per server-side cursor round trip; also the Parquet row group size
+EXPORT_BATCH_SIZE = 10000
+
+# Turns get created_at when built, slightly before they commit: keep the
+# default upper bound behind "now" so incremental windows never skip rows
+EXPORT_SAFETY_LAG = timedelta(minutes=1)
+
+# Config keys that never leave the database: users' own OpenRouter keys
+SECRET_CONFIG_KEYS = ["user_provider_key"]
+
+
+def _export_config() -> Any:
+    """config_json without SECRET_CONFIG_KEYS, stripped in SQL."""
+    config = Debate.config_json
+    for key in SECRET_CONFIG_KEYS:
+        config = config.op("-", return_type=JSONB)(literal_column(f"'{key}'"))
+    return config.label("config_json")
+
+
+EXPORT_COLUMNS: Dict[str, List[Any]] = {
+    "debates": [
+        Debate.id, Debate.session_id, Debate.status, Debate.title, _export_config(),
+        Debate.created_at, Debate.started_at, Debate.ended_at, Debate.totals_json,
+        Debate.winner, Debate.winner_model_id
+    ],
+    "participants": [
+        DebateParticipant.id, DebateParticipant.debate_id, DebateParticipant.role, DebateParticipant.model_id,
+        DebateParticipant.persona_name, DebateParticipant.voice_name, DebateParticipant.avatar_url
+    ],
+    # Same columns as the turn archive, so archived turns export identically
+    "turns": [getattr(Turn, col) for col in ARCHIVE_COLUMNS],
+}
+
+
+def default_until() -> datetime:
+    return datetime.now(timezone.utc).replace(tzinfo=None) - EXPORT_SAFETY_LAG
+
+
+def naive_utc(dt: Optional[datetime]) -> Optional[datetime]:
+    """Timestamps are stored as naive UTC."""
+    if dt is None or dt.tzinfo is None:
+        return dt
+    return dt.astimezone(timezone.utc).replace(tzinfo=None)
+
+
+def _window(column: Any, since: Optional[datetime], until: Optional[datetime]) -> List[Any]:
+    clauses = []
+    if since is not None:
+        clauses.append(column >= since)
+    if until is not None:
+        clauses.append(column < until)
+    return clauses
+
+
+def _flat_column(column: Any) -> Any:
+    """Parquet columns are flat: UUIDs, JSON and regconfig go out as text."""
+    if isinstance(column.type, (String, Integer, Float, DateTime)):
+        return column
+    return cast(column, Text).label(column.key)
+
+
+def export_query(table: str, fmt: str, since: Optional[datetime] = None, until: Optional[datetime] = None):
+    """
+    Unordered scan of one table within the [since, until) window.
+    Debates change until they end, so they are windowed by
+    coalesce(ended_at, created_at): a debate still running at export time
+    is exported again, final, by the window in which it ends (rows are
+    keyed by id; consumers keep the latest). Participants never change and
+    follow their debate's creation time; turns use their own created_at
+    (which also prunes turn partitions).
+    NDJSON rows are rendered by Postgres (row_to_json), so Python only
+    joins strings.
+    """
+    columns = EXPORT_COLUMNS[table]
+    if fmt == "parquet":
+        columns = [_flat_column(c) for c in columns]
+
+    stmt = select(*columns)
+    if table == "turns":
+        stmt = stmt.where(*_window(Turn.created_at, since, until))
+    elif table == "participants":
+        stmt = stmt.join(Debate, Debate.id == DebateParticipant.debate_id)
+        stmt = stmt.where(*_window(Debate.created_at, since, until))
+    else:
+        stmt = stmt.where(*_window(func.coalesce(Debate.ended_at, Debate.created_at), since, until))
+
+    if fmt == "ndjson":
+        row = stmt.subquery("t")
+        return select(cast(func.row_to_json(row.table_valued()), Text))
+    return stmt
+
+
+def archived_entries_query(since: Optional[datetime] = None, until: Optional[datetime] = None):
+    """Archived debates that may hold turns inside the window."""
+    stmt = select(TurnArchive).join(Debate, Debate.id == TurnArchive.debate_id).where(TurnArchive.length > 0)
+    if since is not None:
+        stmt = stmt.where(func.coalesce(Debate.ended_at, Debate.created_at) >= since)
+    if until is not None:
+        stmt = stmt.where(Debate.created_at < until)
+    return stmt
+
+
+def _archived_records(entry: TurnArchive, since: Optional[datetime], until: Optional[datetime]) -> List[Dict[str, Any]]:
+    return [
+        r for r in read_archived_turns(entry)
+        if (since is None or r["created_at"] >= since) and (until is None or r["created_at"] < until)
+    ]
+
+
+def _json_default(value: Any) -> Any:
+    if isinstance(value, datetime):
+        return value.isoformat()
+    return str(value)
+
+
+class NdjsonEncoder:
+    """NDJSON, optionally gzipped on the fly (one gzip stream, any chunking)."""
+    media_type = "application/x-ndjson"
+
+    def __init__(self, table: str, compress: bool = True):
+        self.compress = compress
+        self._z = zlib.compressobj(6, zlib.DEFLATED, 31) if compress else None
+
+    def _emit(self, lines: List[str]) -> bytes:
+        data = ("\n".join(lines) + "\n").encode("utf-8")
+        return self._z.compress(data) if self._z else data
+
+    def feed_rows(self, rows: Sequence[Any]) -> bytes:
+        return self._emit([r[0] for r in rows])
+
+    def feed_records(self, records: List[Dict[str, Any]]) -> bytes:
+        return self._emit([json.dumps(r, ensure_ascii=False, separators=(",", ":"), default=_json_default) for r in records])
+
+    def finish(self) -> bytes:
+        return self._z.flush() if self._z else b""
+
+
+class _ChunkSink:
+    """Write-only file that hands written bytes back, tracking its own position."""
+
+    def __init__(self):
+        self._chunks: List[bytes] = []
+        self._pos = 0
+        self.closed = False
+
+    def write(self, data) -> int:
+        self._chunks.append(bytes(data))
+        self._pos += len(data)
+        return len(data)
+
+    def tell(self) -> int:
+        return self._pos
+
+    def flush(self):
+        pass
+
+    def close(self):
+        self.closed = True
+
+    def drain(self) -> bytes:
+        data = b"".join(self._chunks)
+        self._chunks.clear()
+        return data
+
+
+def _arrow_type(column: Any):
+    if isinstance(column.type, DateTime):
+        return pa.timestamp("us")
+    if isinstance(column.type, Integer):
+        return pa.int64()
+    if isinstance(column.type, Float):
+        return pa.float64()
+    return pa.string()
+
+
+class ParquetEncoder:
+    """Parquet with one zstd-compressed row group per batch."""
+    media_type = "application/vnd.apache.parquet"
+    compress = False
+
+    def __init__(self, table: str, compress: bool = True):
+        if pa is None:
+            raise RuntimeError("Parquet export requires pyarrow")
+        columns = [_flat_column(c) for c in EXPORT_COLUMNS[table]]
+        self._names = [c.key for c in columns]
+        self._schema = pa.schema([(c.key, _arrow_type(c)) for c in columns])
+        self._sink = _ChunkSink()
+        self._writer = pq.ParquetWriter(pa.PythonFile(self._sink, mode="w"), self._schema, compression="zstd")
+
+    def _emit(self, columns: List[List[Any]]) -> bytes:
+        self._writer.write_table(pa.Table.from_arrays(
+            [pa.array(col, type=field.type) for col, field in zip(columns, self._schema)],
+            schema=self._schema
+        ))
+        return self._sink.drain()
+
+    def feed_rows(self, rows: Sequence[Any]) -> bytes:
+        return self._emit([list(col) for col in zip(*rows)])
+
+    def feed_records(self, records: List[Dict[str, Any]]) -> bytes:
+        columns = []
+        for name, field in zip(self._names, self._schema):
+            values = [r.get(name) for r in records]
+            if pa.types.is_string(field.type):
+                values = [v if v is None or isinstance(v, str) else json.dumps(v, ensure_ascii=False, separators=(",", ":")) for v in values]
+            columns.append(values)
+        return self._emit(columns)
+
+    def finish(self) -> bytes:
+        self._writer.close()
+        return self._sink.drain()
+
+
+def make_encoder(table: str, fmt: str, compress: bool = True):
+    return ParquetEncoder(table) if fmt == "parquet" else NdjsonEncoder(table, compress)
+
+
+def export_filename(table: str, fmt: str, compress: bool, until: datetime) -> str:
+    suffix = ".parquet" if fmt == "parquet" else (".ndjson.gz" if compress else ".ndjson")
+    return f"{table}-{until:%Y%m%dT%H%M%S}{suffix}"
+
+
+async def stream_export(
+    db: AsyncSession, encoder, table: str, fmt: str,
+    since: Optional[datetime] = None, until: Optional[datetime] = None
+) -> AsyncGenerator[bytes, None]:
+    """
+    Stream one table through a server-side cursor, batch by batch, so memory
+    stays constant regardless of export size.
+    """
+    stmt = export_query(table, fmt, since, until).execution_options(yield_per=EXPORT_BATCH_SIZE)
+    result = await db.stream(stmt)
+    async for rows in result.partitions():
+        chunk = encoder.feed_rows(rows)
+        if chunk:
+            yield chunk
+
+    if table == "turns":
+        entries = (await db.execute(archived_entries_query(since, until))).scalars().all()
+        for entry in entries:
+            records = await run_in_threadpool(_archived_records, entry, since, until)
+            if records:
+                chunk = encoder.feed_records(records)
+                if chunk:
+                    yield chunk
+
+    yield encoder.finish()
+
+
+def iter_export(
+    db: DBSession, encoder, table: str, fmt: str,
+    since: Optional[datetime] = None, until: Optional[datetime] = None
+) -> Iterator[bytes]:
+    """Sync counterpart of stream_export, for scripts."""
+    stmt = export_query(table, fmt, since, until).execution_options(stream_results=True, yield_per=EXPORT_BATCH_SIZE)
+    for rows in db.execute(stmt).partitions():
+        yield encoder.feed_rows(rows)
+
+    if table == "turns":
+        for entry in db.execute(archived_entries_query(since, until)).scalars().all():
+            records = _archived_records(entry, since, until)
+            if records:
+                yield encoder.feed_records(records)
+
+    yield encoder.finish()
@@ -0,0 +1,197 @@
+import re
+import time
+import asyncio
+from typing import Any, Callable, Dict, List, Optional, Tuple
+from app.core.config import settings
+from app.services.leaderboard import DRAW, parse_verdict_winner
+
+# Judge panels: instead of one moderator verdict, K judge models (config
+# judge_models, default VERDICT_JUDGES) read the same verdict prompt
+# concurrently. The first judge to produce text is streamed to viewers;
+# if it fails, the next one to produce text takes over the stream.
+#
+# Each judge ends with "VOTE: <name or Draw> | <confidence 0-100>". Votes
+# are weighted by confidence; equal top scores make a draw. The panel
+# waits for every judge up to VERDICT_PANEL_DEADLINE_SECONDS, then for
+# no longer than it takes to reach the quorum (VERDICT_PANEL_QUORUM, or a
+# majority), and never past VERDICT_PANEL_TIMEOUT_SECONDS: judges still
+# running then are cancelled and recorded as timed out.
+
+_VOTE_RE = re.compile(r"^\W*VOTE\W*:\s*(.+?)\s*\|\s*(\d{1,3})", re.IGNORECASE | re.MULTILINE)
+
+# Confidence of a judge whose vote line is missing or unreadable
+DEFAULT_CONFIDENCE = 0.5
+
+# conduct_verdict_job runs this much longer than the panel may: loading the
+# transcript before it and saving the verdict after it
+VERDICT_JOB_MARGIN_SECONDS = 120
+
+
+def panel_judges(conf: Dict[str, Any]) -> List[str]:
+    """Judge models of a debate; a panel needs at least two."""
+    judges = conf.get('judge_models') or [m.strip() for m in settings.VERDICT_JUDGES.split(",") if m.strip()]
+    return judges if len(judges) >= 2 else []
+
+
+def verdict_job_timeout() -> int:
+    """
+    RQ job_timeout of a verdict job. Above the panel timeout, so the panel
+    cancels stuck judges and saves the others' votes before RQ kills the job.
+    """
+    return int(settings.VERDICT_PANEL_TIMEOUT_SECONDS) + VERDICT_JOB_MARGIN_SECONDS
+
+
+def panel_quorum(size: int) -> int:
+    return min(settings.VERDICT_PANEL_QUORUM or size // 2 + 1, size)
+
+
+def parse_vote(text: str, debater_names: List[str]) -> Tuple[Optional[str], float]:
+    """(winner, confidence 0-1) of one judge's verdict; winner is a debater name, DRAW or None."""
+    matches = _VOTE_RE.findall(text or "")
+    if matches:
+        name, confidence = matches[-1]
+        winner = parse_verdict_winner(f"Winner: {name}", debater_names)
+        if winner:
+            return winner, min(int(confidence), 100) / 100
+    # No usable vote line: fall back to the Winner section
+    return parse_verdict_winner(text, debater_names), DEFAULT_CONFIDENCE
+
+
+def aggregate_votes(votes: List[Dict[str, Any]], quorum: int) -> Dict[str, Any]:
+    """Confidence-weighted result of the judges' votes ({"winner", "scores", "votes", "quorum"})."""
+    scores: Dict[str, float] = {}
+    counted = [v for v in votes if v.get("winner")]
+    for vote in counted:
+        scores[vote["winner"]] = scores.get(vote["winner"], 0.0) + float(vote["confidence"])
+    winner: Optional[str] = None
+    if scores and len(counted) >= quorum:
+        top = max(scores.values())
+        leaders = [name for name, score in scores.items() if score == top]
+        winner = leaders[0] if len(leaders) == 1 else DRAW
+    return {
+        "winner": winner,
+        "scores": {name: round(score, 3) for name, score in scores.items()},
+        "votes": len(counted),
+        "quorum": quorum,
+    }
+
+
+async def run_panel(
+    client: Any,
+    models: List[str],
+    messages: List[Dict[str, Any]],
+    on_delta: Callable[[str], None],
+    api_key: Optional[str] = None,
+    params: Optional[Dict[str, Any]] = None,
+) -> List[Dict[str, Any]]:
+    """
+    Run the judges concurrently; one result per judge, in panel order:
+    {"model_id", "status" ("ok", "failed" or "timed_out"), "text", "usage", "timing", "error"}.
+    """
+    results: List[Dict[str, Any]] = [
+        {"model_id": m, "status": "running", "text": "", "usage": {}, "timing": {}, "error": None} for m in models
+    ]
+    leader: Optional[int] = None
+    streamed = False
+
+    async def judge(i: int):
+        nonlocal leader, streamed
+        result = results[i]
+        timing = result["timing"]
+        timing['started'] = time.perf_counter()
+        try:
+            async for chunk in client.create_chat_completion(
+                result["model_id"], messages, api_key=api_key, usage=result["usage"], params=params
+            ):
+                timing.setdefault('first_chunk', time.perf_counter())
+                result["text"] += chunk
+                if leader is None:
+                    # Take over the stream, with what this judge wrote so far
+                    leader = i
+                    on_delta(("\n\n---\n\n" if streamed else "") + result["text"])
+                    streamed = True
+                elif leader == i:
+                    on_delta(chunk)
+            result["status"] = "ok"
+        except Exception as ex:
+            print(f"Judge {result['model_id']} failed: {ex}")
+            result["status"] = "failed"
+            result["error"] = str(ex)
+            if leader == i:
+                leader = None
+        finally:
+            timing['finished'] = time.perf_counter()
+
+    quorum = panel_quorum(len(models))
+    started = time.monotonic()
+    pending = {asyncio.create_task(judge(i)) for i in range(len(models))}
+    while pending:
+        elapsed = time.monotonic() - started
+        answered = sum(r["status"] == "ok" for r in results)
+        if elapsed >= settings.VERDICT_PANEL_TIMEOUT_SECONDS:
+            break
+        if elapsed >= settings.VERDICT_PANEL_DEADLINE_SECONDS and answered >= quorum:
+            break
+        limit = settings.VERDICT_PANEL_DEADLINE_SECONDS if elapsed < settings.VERDICT_PANEL_DEADLINE_SECONDS else settings.VERDICT_PANEL_TIMEOUT_SECONDS
+        _, pending = await asyncio.wait(pending, timeout=limit - elapsed, return_when=asyncio.FIRST_COMPLETED)
+
+    for task in pending:
+        task.cancel()
+    await asyncio.gather(*pending, return_exceptions=True)
+    for result in results:
+        if result["status"] == "running":
+            result["status"] = "timed_out"
+    return results
+
+
+def panel_verdict(conf: Dict[str, Any], results: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """
+    Verdict turn of a panel from run_panel results, each with its usage_record
+    as "record": text (the best judge's verdict plus the panel's votes),
+    usage_json, winner, winner_model_id and the judge model shown.
+    """
+    debaters = [p for p in conf.get('participants', []) if p.get('role') == 'debater']
+    names = [p["display_name"] for p in debaters]
+    judges: List[Dict[str, Any]] = []
+    for result in results:
+        winner, confidence = parse_vote(result["text"], names) if result["status"] == "ok" else (None, 0.0)
+        judges.append({
+            "model_id": result["model_id"],
+            "status": result["status"],
+            "winner": winner,
+            "confidence": confidence,
+            **result["record"],
+        })
+    panel = aggregate_votes([j for j in judges if j["status"] == "ok"], panel_quorum(len(results)))
+
+    # Shown verdict: the most confident judge agreeing with the panel
+    answered = [i for i, j in enumerate(judges) if j["status"] == "ok"]
+    agreeing = [i for i in answered if judges[i]["winner"] == panel["winner"]] or answered
+    shown = max(agreeing, key=lambda i: judges[i]["confidence"]) if agreeing else None
+    text = results[shown]["text"] if shown is not None else "[Error: no judge of the panel answered]"
+
+    lines = [f"**Judge panel**: {panel['votes']} of {len(judges)} judges voted, winner: {panel['winner'] or 'undecided'}"]
+    for j in judges:
+        if j["status"] == "ok":
+            lines.append(f"- {j['model_id']}: {j['winner'] or 'no vote'} ({int(j['confidence'] * 100)}%)")
+        else:
+            lines.append(f"- {j['model_id']}: {j['status'].replace('_', ' ')}")
+    text = f"{text.rstrip()}\n\n---\n\n" + "\n".join(lines)
+
+    started = min((r["timing"].get('started', 0.0) for r in results), default=0.0)
+    finished = max((r["timing"].get('finished', started) for r in results), default=started)
+    usage_json: Dict[str, Any] = {
+        "tokens_in": sum(j["tokens_in"] for j in judges),
+        "tokens_out": sum(j["tokens_out"] for j in judges),
+        "cost": sum(j["cost"] for j in judges),
+        "latency_ms": int((finished - started) * 1000),
+        "judges": judges,
+        "panel": panel,
+    }
+    return {
+        "text": text,
+        "usage_json": usage_json,
+        "winner": panel["winner"],
+        "winner_model_id": next((p.get("model_id") for p in debaters if p["display_name"] == panel["winner"]), None),
+        "model_id": results[shown]["model_id"] if shown is not None else None,
+    }
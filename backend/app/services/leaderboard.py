@@ -0,0 +1,159 @@
+import re
+from datetime import datetime, timezone
+from typing import Any, Dict, List, Optional, Tuple
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.orm import Session as DBSession
+
+from app.models.models import Debate, ModelStats, Turn
+
+DRAW = "draw"
+# Words that mark a draw in the verdict, across the supported output languages
+DRAW_WORDS = ["draw", "tie", "ничья", "empate", "égalité", "egalite", "unentschieden", "平局"]
+
+_WINNER_LINE_RE = re.compile(r"winner|победител|ganador|vainqueur|gagnant|gewinner|sieger|获胜|胜者", re.IGNORECASE)
+
+
+def _mentioned_winner(text: str, debater_names: List[str]) -> Optional[str]:
+    """
+    DRAW if a draw word appears in `text`, else the debater named in it,
+    else None. Debater names are blanked out before looking for draw
+    words, so a debater called "Tie Fighter" is not taken for a draw.
+    """
+    lowered = text.lower()
+    # Longer names first so "Debater 10" is blanked before "Debater 1"
+    names = sorted(debater_names, key=len, reverse=True)
+    unnamed = lowered
+    for name in names:
+        unnamed = unnamed.replace(name.lower(), " ")
+    for word in DRAW_WORDS:
+        # CJK text has no word boundaries
+        pattern = re.escape(word) if word[0] >= "\u3000" else rf"\b{re.escape(word)}\b"
+        if re.search(pattern, unnamed):
+            return DRAW
+
+    # Earliest mentioned name wins
+    best: Optional[Tuple[int, str]] = None
+    for name in names:
+        pos = lowered.find(name.lower())
+        if pos >= 0 and (best is None or pos < best[0]):
+            best = (pos, name)
+    return best[1] if best else None
+
+
+def parse_verdict_winner(text: str, debater_names: List[str]) -> Optional[str]:
+    """
+    Extract the winner from verdict Markdown.
+    Returns the winning debater's name, DRAW, or None if undecidable.
+    """
+    if not text or not debater_names:
+        return None
+
+    lines = text.splitlines()
+    for i, line in enumerate(lines):
+        if _WINNER_LINE_RE.search(line):
+            winner = _mentioned_winner(line, debater_names)
+            if winner:
+                return winner
+            # A bare heading ("## Winner"): the winner is on the next non-empty line
+            following = next((l for l in lines[i + 1:i + 3] if l.strip()), "")
+            return _mentioned_winner(following, debater_names)
+
+    return _mentioned_winner(text[:300], debater_names)
+
+
+def resolve_winner(config: Dict[str, Any], verdict_text: str) -> Tuple[Optional[str], Optional[str]]:
+    """
+    (winner, winner_model_id) for a debate config and its verdict text.
+    """
+    debaters = [p for p in config.get("participants", []) if p.get("role") == "debater"]
+    winner = parse_verdict_winner(verdict_text, [p["display_name"] for p in debaters])
+    winner_model_id = next((p.get("model_id") for p in debaters if p["display_name"] == winner), None)
+    return winner, winner_model_id
+
+
+def _turn_role(turn: Turn) -> str:
+    return "debater" if turn.turn_type == "argument" else "moderator"
+
+
+def debate_rollup(debate: Debate, turns: List[Turn]) -> Dict[Tuple[str, str], Dict[str, Any]]:
+    """
+    Increments contributed by one finished debate, keyed by (model_id, role).
+    """
+    participants = (debate.config_json or {}).get("participants", [])
+    rollup: Dict[Tuple[str, str], Dict[str, Any]] = {}
+
+    def bucket(model_id: str, role: str) -> Dict[str, Any]:
+        return rollup.setdefault((model_id, role), {
+            "debates": 1, "wins": 0, "losses": 0, "draws": 0,
+            "turns": 0, "total_latency_ms": 0, "tokens_in": 0, "tokens_out": 0, "cost": 0.0
+        })
+
+    for p in participants:
+        if not p.get("model_id"):
+            continue
+        b = bucket(p["model_id"], p["role"])
+        if p["role"] != "debater" or not debate.winner:
+            continue
+        if debate.winner == DRAW:
+            b["draws"] += 1
+        elif debate.winner == p.get("display_name"):
+            b["wins"] += 1
+        else:
+            b["losses"] += 1
+
+    for t in turns:
+        if not t.model_used or t.model_used == "unknown":
+            continue
+        usage = t.usage_json or {}
+        # A judge panel's verdict: each judge that answered is credited its own call
+        if usage.get("judges"):
+            calls = [(j["model_id"], j) for j in usage["judges"] if j.get("status") == "ok"]
+        else:
+            calls = [(t.model_used, usage)]
+        for model_id, call in calls:
+            b = bucket(model_id, _turn_role(t))
+            b["turns"] += 1
+            b["total_latency_ms"] += int(call.get("latency_ms") or 0)
+            b["tokens_in"] += int(call.get("tokens_in") or 0)
+            b["tokens_out"] += int(call.get("tokens_out") or 0)
+            b["cost"] += float(call.get("cost") or 0.0)
+
+    return rollup
+
+
+def apply_debate_rollup(db: DBSession, debate: Debate, turns: List[Turn]):
+    """
+    Add one debate's contribution to model_stats with atomic upserts.
+    Caller commits, in the same transaction that marks the debate completed,
+    so each debate is counted exactly once.
+    """
+    now = datetime.now(timezone.utc).replace(tzinfo=None)
+    for (model_id, role), inc in debate_rollup(debate, turns).items():
+        stmt = insert(ModelStats).values(model_id=model_id, role=role, updated_at=now, **inc)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[ModelStats.model_id, ModelStats.role],
+            set_={
+                **{col: getattr(ModelStats, col) + stmt.excluded[col] for col in inc},
+                "updated_at": now,
+            }
+        )
+        db.execute(stmt)
+
+
+def leaderboard_row(stats: ModelStats) -> Dict[str, Any]:
+    decided = stats.wins + stats.losses + stats.draws
+    return {
+        "model_id": stats.model_id,
+        "role": stats.role,
+        "debates": stats.debates,
+        "wins": stats.wins,
+        "losses": stats.losses,
+        "draws": stats.draws,
+        "win_rate": stats.wins / decided if decided else None,
+        "turns": stats.turns,
+        "avg_latency_ms": stats.total_latency_ms / stats.turns if stats.turns else None,
+        "avg_tokens_in": stats.tokens_in / stats.turns if stats.turns else None,
+        "avg_tokens_out": stats.tokens_out / stats.turns if stats.turns else None,
+        "avg_cost_per_debate": stats.cost / stats.debates if stats.debates else None,
+        "total_cost": stats.cost,
+    }
@@ -0,0 +1,111 @@
+import os
+import time
+import functools
+from contextlib import contextmanager
+from datetime import datetime, timezone
+from typing import Any, Callable, Dict, Iterator, Optional
+from prometheus_client import CollectorRegistry, Counter, Gauge, Histogram, REGISTRY, generate_latest
+from prometheus_client import multiprocess
+from rq import get_current_job
+
+# Prometheus metrics, shared by the API (/api/metrics) and the RQ worker
+# (exporter started by app.worker). RQ runs each job in a forked process,
+# so the worker records into PROMETHEUS_MULTIPROC_DIR files and its
+# exporter merges them. Turn metrics carry model and turn_type labels.
+_FAST_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0)
+_SLOW_BUCKETS = (0.1, 0.25, 0.5, 1.0, 2.0, 4.0, 8.0, 16.0, 32.0, 64.0, 128.0)
+
+JOB_QUEUE_WAIT = Histogram(
+    "debates_job_queue_wait_seconds", "Time between enqueue and start of an RQ job",
+    ["job"], buckets=_SLOW_BUCKETS
+)
+JOB_DURATION = Histogram(
+    "debates_job_duration_seconds", "Run time of an RQ job",
+    ["job"], buckets=_SLOW_BUCKETS
+)
+TURN_DB = Histogram(
+    "debates_turn_db_seconds", "Database time of a turn (context load, turn insert)",
+    ["turn_type", "op"], buckets=_FAST_BUCKETS
+)
+TURN_PROMPT = Histogram(
+    "debates_turn_prompt_seconds", "Prompt assembly time of a turn",
+    ["turn_type"], buckets=_FAST_BUCKETS
+)
+TURN_TTFT = Histogram(
+    "debates_turn_ttft_seconds", "Time from request to first streamed chunk",
+    ["model", "turn_type"], buckets=_SLOW_BUCKETS
+)
+TURN_TOKENS_PER_SECOND = Histogram(
+    "debates_turn_tokens_per_second", "Completion tokens per second after the first chunk",
+    ["model", "turn_type"], buckets=(5, 10, 20, 30, 45, 60, 80, 100, 150, 200, 400)
+)
+TURN_DURATION = Histogram(
+    "debates_turn_duration_seconds", "Total turn time, job start to turn_completed",
+    ["model", "turn_type"], buckets=_SLOW_BUCKETS
+)
+TURNS = Counter(
+    "debates_turns_total", "Turns finished, by outcome (ok, error, cached)",
+    ["model", "turn_type", "outcome"]
+)
+PUBLISH = Histogram(
+    "debates_publish_seconds", "Redis publish latency of debate events",
+    ["event"], buckets=_FAST_BUCKETS
+)
+OPENROUTER_RESPONSES = Counter(
+    "debates_openrouter_responses_total", "OpenRouter responses by status code ('error' = no response)",
+    ["model", "endpoint", "status"]
+)
+SSE_CLIENTS = Gauge(
+    "debates_sse_clients", "Connected streaming clients (SSE live/replay, WebSocket)", ["mode"], multiprocess_mode="livesum"
+)
+
+
+@contextmanager
+def timed(histogram: Histogram, **labels: str) -> Iterator[None]:
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        histogram.labels(**labels).observe(time.perf_counter() - started)
+
+
+def observe_generation(model: str, turn_type: str, usage: Dict[str, Any], timing: Dict[str, float], failed: bool):
+    """TTFT, decode rate and outcome of one streamed completion (timing as in usage_record)."""
+    cached = bool(usage.get("cached"))
+    if not failed and not cached and "first_chunk" in timing:
+        TURN_TTFT.labels(model, turn_type).observe(timing["first_chunk"] - timing["started"])
+        decode = timing.get("finished", timing["first_chunk"]) - timing["first_chunk"]
+        tokens = int(usage.get("completion_tokens") or 0)
+        if decode > 0 and tokens > 1:
+            TURN_TOKENS_PER_SECOND.labels(model, turn_type).observe(tokens / decode)
+    TURNS.labels(model, turn_type, "error" if failed else "cached" if cached else "ok").inc()
+
+
+def _as_utc(value: datetime) -> datetime:
+    return value if value.tzinfo else value.replace(tzinfo=timezone.utc)
+
+
+def instrumented_job(fn: Callable) -> Callable:
+    """Records queue wait and run time of an RQ job function."""
+    @functools.wraps(fn)
+    def wrapper(*args, **kwargs):
+        job = get_current_job()
+        if job is not None and job.enqueued_at is not None:
+            wait = datetime.now(timezone.utc) - _as_utc(job.enqueued_at)
+            JOB_QUEUE_WAIT.labels(fn.__name__).observe(max(wait.total_seconds(), 0.0))
+        with timed(JOB_DURATION, job=fn.__name__):
+            return fn(*args, **kwargs)
+    return wrapper
+
+
+def metrics_registry() -> CollectorRegistry:
+    """Merged multi-process registry when PROMETHEUS_MULTIPROC_DIR is set, else the default one."""
+    if os.environ.get("PROMETHEUS_MULTIPROC_DIR"):
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+        return registry
+    return REGISTRY
+
+
+def render_metrics(registry: Optional[CollectorRegistry] = None) -> bytes:
+    return generate_latest(registry or metrics_registry())
@@ -0,0 +1,199 @@
+import uuid
+import asyncio
+from collections import deque
+from typing import Any, Deque, Dict, Optional, Set, Tuple
+from fastapi import WebSocket, WebSocketDisconnect
+from redis import asyncio as aioredis
+from app.core.config import settings
+from app.core.serialization import dumps_str, loads
+from app.services.events import END_EVENTS, relay_event
+from app.services.replay import replay_hub
+
+# Many debate streams over one WebSocket (/api/debates/ws). Clients send
+#
+#   {"type": "subscribe", "debate_id": "...", "replay": false, "speed": 1.0}
+#   {"type": "unsubscribe", "debate_id": "..."}
+#
+# and receive every event of their debates as one text frame each,
+#
+#   {"debate_id": "...", "event": "turn_delta", "data": {...}}
+#
+# with event and data exactly as on the SSE endpoint (connection-level
+# errors have a null debate_id). Live debates share one Redis pub/sub
+# connection per socket; a live subscription ends after debate_completed or
+# debate_error, a replay after its last event. Frames are compressed with
+# permessage-deflate when the client offers it (negotiated by uvicorn).
+#
+# Flow control: frames wait in a per-connection queue. While the client
+# lags behind, consecutive deltas of the same turn are merged into one
+# frame; a client that is still WS_SEND_QUEUE frames behind is closed with
+# 1013 rather than buffered without bound, and catches up through
+# GET /api/debates/{id}?since_seq= after reconnecting.
+
+# (debate_id, event, data JSON)
+Frame = Tuple[Optional[str], str, str]
+
+
+def render_frame(debate_id: Optional[str], event: str, data: str) -> str:
+    # data is relayed as published, never decoded
+    return f'{{"debate_id":{dumps_str(debate_id)},"event":{dumps_str(event)},"data":{data}}}'
+
+
+def merge_deltas(first: str, second: str) -> Optional[str]:
+    """One turn_delta for two consecutive ones of the same turn, or None."""
+    try:
+        a: Dict[str, Any] = loads(first)
+        b: Dict[str, Any] = loads(second)
+    except ValueError:
+        return None
+    if a.get("seq_index") != b.get("seq_index"):
+        return None
+    # Keeps the first publish timestamp: the oldest text in the frame
+    a["delta"] = str(a.get("delta", "")) + str(b.get("delta", ""))
+    return dumps_str(a)
+
+
+class MultiplexedStream:
+    def __init__(self, websocket: WebSocket):
+        self.websocket = websocket
+        self.queue: Deque[Frame] = deque()
+        self.ready = asyncio.Event()
+        self.overflowed = False
+        self.redis = aioredis.from_url(settings.REDIS_URL, decode_responses=True)
+        self.pubsub = self.redis.pubsub()
+        # The pub/sub connection exists from the first live subscription on
+        self.listening = asyncio.Event()
+        self.live: Set[str] = set()
+        self.replays: Dict[str, "asyncio.Task[None]"] = {}
+
+    def push(self, debate_id: Optional[str], event: str, data: str):
+        queue = self.queue
+        if queue and event == "turn_delta":
+            last_id, last_event, last_data = queue[-1]
+            if last_id == debate_id and last_event == "turn_delta":
+                merged = merge_deltas(last_data, data)
+                if merged is not None:
+                    queue[-1] = (debate_id, event, merged)
+                    return
+        if len(queue) >= settings.WS_SEND_QUEUE:
+            self.overflowed = True
+        else:
+            queue.append((debate_id, event, data))
+        self.ready.set()
+
+    def error(self, debate_id: Optional[str], message: str):
+        self.push(debate_id, "error", dumps_str({"message": message}))
+
+    async def run(self):
+        """Serve the socket until the client leaves or falls too far behind."""
+        tasks = [
+            asyncio.create_task(self._receive()),
+            asyncio.create_task(self._relay()),
+            asyncio.create_task(self._send()),
+        ]
+        try:
+            done, _ = await asyncio.wait(tasks, return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                try:
+                    task.result()
+                except WebSocketDisconnect:
+                    pass
+        finally:
+            for task in [*tasks, *self.replays.values()]:
+                task.cancel()
+            await asyncio.gather(*tasks, *self.replays.values(), return_exceptions=True)
+            try:
+                await self.pubsub.aclose()
+            finally:
+                await self.redis.aclose()
+
+    async def _receive(self):
+        while True:
+            try:
+                message = loads(await self.websocket.receive_text())
+            except KeyError:
+                # receive_text() on a binary frame
+                self.error(None, "Expected text frames")
+                continue
+            except ValueError:
+                self.error(None, "Invalid JSON")
+                continue
+            if not isinstance(message, dict):
+                self.error(None, "Expected a JSON object")
+                continue
+            action = message.get("type")
+            debate_id = str(message.get("debate_id", ""))
+            try:
+                uuid.UUID(debate_id)
+            except ValueError:
+                self.error(debate_id or None, "Invalid UUID")
+                continue
+
+            if action == "subscribe":
+                await self.subscribe(debate_id, bool(message.get("replay")), message.get("speed", 1.0))
+            elif action == "unsubscribe":
+                await self.unsubscribe(debate_id)
+            else:
+                self.error(debate_id, f"Unknown message type: {action}")
+
+    async def subscribe(self, debate_id: str, replay: bool, speed: Any):
+        if debate_id in self.live or debate_id in self.replays:
+            return
+        if len(self.live) + len(self.replays) >= settings.WS_MAX_SUBSCRIPTIONS:
+            self.error(debate_id, f"At most {settings.WS_MAX_SUBSCRIPTIONS} debates per connection")
+            return
+        if replay:
+            # Same bounds as the SSE endpoint's speed parameter
+            if not isinstance(speed, (int, float)) or isinstance(speed, bool) or not 0 < speed <= 50:
+                self.error(debate_id, "speed must be a number in (0, 50]")
+                return
+            self.push(debate_id, "connected", dumps_str({"message": "Replay connected", "speed": speed}))
+            self.replays[debate_id] = asyncio.create_task(self._replay(debate_id, float(speed)))
+            return
+        await self.pubsub.subscribe(f"debate:{debate_id}")
+        self.live.add(debate_id)
+        self.listening.set()
+        self.push(debate_id, "connected", dumps_str({"message": "Monitor connected"}))
+
+    async def unsubscribe(self, debate_id: str):
+        if debate_id in self.live:
+            self.live.discard(debate_id)
+            await self.pubsub.unsubscribe(f"debate:{debate_id}")
+        task = self.replays.pop(debate_id, None)
+        if task is not None:
+            task.cancel()
+
+    async def _replay(self, debate_id: str, speed: float):
+        try:
+            async for event in replay_hub.stream(debate_id, speed):
+                self.push(debate_id, event["event"], event["data"])
+        finally:
+            if self.replays.get(debate_id) is asyncio.current_task():
+                del self.replays[debate_id]
+
+    async def _relay(self):
+        await self.listening.wait()
+        while True:
+            message = await self.pubsub.get_message(ignore_subscribe_messages=True, timeout=None)
+            if not isinstance(message, dict) or message.get("type") != "message":
+                continue
+            debate_id = str(message.get("channel", "")).removeprefix("debate:")
+            if debate_id not in self.live:
+                # Published before our unsubscribe took effect
+                continue
+            event = relay_event(str(message.get("data")))
+            if event is None:
+                continue
+            self.push(debate_id, event["event"], event["data"])
+            if event["event"] in END_EVENTS:
+                await self.unsubscribe(debate_id)
+
+    async def _send(self):
+        while True:
+            await self.ready.wait()
+            self.ready.clear()
+            while self.queue and not self.overflowed:
+                await self.websocket.send_text(render_frame(*self.queue.popleft()))
+            if self.overflowed:
+                await self.websocket.close(code=1013, reason="Client too slow")
+                return
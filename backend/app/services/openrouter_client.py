@@ -1,22 +1,102 @@
 import time
 import httpx
 import json
+import asyncio
+from opentelemetry import trace
 from typing import List, Dict, Any, AsyncGenerator, Tuple, Optional
 from app.core.config import settings
+from app.services.cassettes import cassette_transport
+from app.services.sse import CONTENT, DONE, ERROR, FINISH, USAGE, completion_deltas, parse_chunk, sse_events
+from app.services.metrics import OPENROUTER_RESPONSES
+from app.services.tracing import tracer
+from app.services.completion_cache import cache_key, get_store, lookup, replay_entry, store_entry
+
+# Finish reasons of replies worth caching
+COMPLETE_FINISH_REASONS = ("stop", "length")
 
 class OpenRouterClient:
-    BASE_URL = "https://openrouter.ai/api/v1"
+    # Overridable to point at a stand-in server (see scripts/fake_openrouter.py)
+    BASE_URL = settings.OPENROUTER_BASE_URL
     
     def __init__(self):
         self._models_cache: List[Dict[str, Any]] = []
         self._cache_time = 0
         self._cache_ttl = 3600  # 1 hour
+
+    def _http_client(self, timeout: float) -> httpx.AsyncClient:
+        # Records or replays raw responses when OPENROUTER_CASSETTES is set
+        return httpx.AsyncClient(timeout=timeout, transport=cassette_transport())
     
-    async def create_chat_completion(self, model: str, messages: List[Dict[str, Any]], api_key: Optional[str] = None) -> AsyncGenerator[str, None]:
+    async def create_chat_completion(
+        self, model: str, messages: List[Dict[str, Any]], api_key: Optional[str] = None,
+        usage: Optional[Dict[str, Any]] = None, params: Optional[Dict[str, Any]] = None
+    ) -> AsyncGenerator[str, None]:
         """
         Stream chat completion from OpenRouter.
         Yields content text chunks.
+        If `usage` is given, it is filled with the final usage record
+        (prompt_tokens, completion_tokens, cost) once the stream ends.
+        `params` are extra sampling parameters (temperature, seed...) sent as-is.
+        With COMPLETION_CACHE on, identical requests are served from the
+        cache and `usage` gets "cached": True.
         """
+        # Not the current span: it stays open across yields to the caller
+        span = tracer.start_span("llm chat", attributes={"llm.model": model})
+        usage = usage if usage is not None else {}
+        chunks = 0
+        try:
+            async for delta in self._cached_chat_completion(model, messages, api_key, usage, params):
+                if not chunks:
+                    span.add_event("first_chunk")
+                chunks += 1
+                yield delta
+        except Exception as e:
+            span.record_exception(e)
+            span.set_status(trace.Status(trace.StatusCode.ERROR))
+            raise
+        finally:
+            span.set_attributes({
+                "llm.chunks": chunks,
+                "llm.cached": bool(usage.get("cached")),
+                "llm.tokens_in": int(usage.get("prompt_tokens") or 0),
+                "llm.tokens_out": int(usage.get("completion_tokens") or 0),
+                "llm.cost": float(usage.get("cost") or 0.0),
+            })
+            span.end()
+
+    async def _cached_chat_completion(
+        self, model: str, messages: List[Dict[str, Any]], api_key: Optional[str],
+        usage: Dict[str, Any], params: Optional[Dict[str, Any]]
+    ) -> AsyncGenerator[str, None]:
+        store = get_store()
+        if store is None:
+            async for delta in self._stream_chat_completion(model, messages, api_key, usage, params):
+                yield delta
+            return
+
+        key = cache_key(model, messages, params)
+        entry = await asyncio.to_thread(lookup, store, key)
+        if entry is not None:
+            usage.update(entry.get("usage") or {})
+            usage["cached"] = True
+            async for delta in replay_entry(entry, settings.COMPLETION_CACHE_REPLAY_SPEED):
+                yield delta
+            return
+
+        chunks: List[List[Any]] = []
+        started = time.perf_counter()
+        async for delta in self._stream_chat_completion(model, messages, api_key, usage, params):
+            chunks.append([round(time.perf_counter() - started, 4), delta])
+            yield delta
+        # Failed streams raise before this point; cache only replies the
+        # provider finished (not e.g. "error" or a stream cut short)
+        if chunks and usage.get("finish_reason") in COMPLETE_FINISH_REASONS:
+            await asyncio.to_thread(store_entry, store, key, model, chunks, dict(usage))
+
+    async def _stream_chat_completion(
+        self, model: str, messages: List[Dict[str, Any]], api_key: Optional[str],
+        usage: Optional[Dict[str, Any]], params: Optional[Dict[str, Any]]
+    ) -> AsyncGenerator[str, None]:
         key = api_key or settings.OPENROUTER_API_KEY
         headers = {
             "Authorization": f"Bearer {key}",
@@ -59,13 +139,16 @@ class OpenRouterClient:
             payload: Dict[str, Any] = {
                 "model": model,
                 "messages": current_messages,
-                "stream": True 
+                **(params or {}),
+                "stream": True,
+                "usage": {"include": True}
             }
 
             try:
                 # print(f"[OpenRouter] Requesting {model} with attempt {attempt}...")
-                async with httpx.AsyncClient(timeout=60.0) as client:
+                async with self._http_client(60.0) as client:
                     async with client.stream("POST", f"{self.BASE_URL}/chat/completions", json=payload, headers=headers) as response:
+                        OPENROUTER_RESPONSES.labels(model, "chat", str(response.status_code)).inc()
                         if response.status_code != 200:
                             err_text = await response.aread()
                             err_decoded = err_text.decode('utf-8', errors='replace')
@@ -83,25 +166,28 @@ class OpenRouterClient:
                             
                             raise Exception(f"OpenRouter Error {response.status_code}: {err_text.decode('utf-8', errors='replace')}")
 
-                        async for line in response.aiter_lines():
-                            if line.strip().startswith("data: "):
-                                data_str = line.strip()[6:]
-                                if data_str == "[DONE]":
-                                    break
-                                try:
-                                    chunk = json.loads(data_str)
-                                    delta = chunk["choices"][0].get("delta", {}).get("content", "")
-                                    if delta:
-                                        yield delta
-                                except json.JSONDecodeError:
-                                    continue
-                            # else:
-                                # if line.strip():
-                                    # print(f"[OpenRouter] Non-SSE line from {model}: {line}")
+                        async for kind, value in completion_deltas(response.aiter_bytes()):
+                            if kind == CONTENT:
+                                yield value
+                            elif kind == USAGE:
+                                # Usage arrives on the last chunk, usually with empty choices
+                                if usage is not None:
+                                    usage.update(value)
+                            elif kind == FINISH:
+                                if usage is not None:
+                                    usage["finish_reason"] = value
+                            elif kind == ERROR:
+                                # The provider gave up mid-stream: what was sent so far is not a reply
+                                message = value.get("message", value) if isinstance(value, dict) else value
+                                raise Exception(f"OpenRouter stream error from {model}: {message}")
+                            # Reasoning deltas are not part of the turn text
 
                 # If we successfully streamed, return (break loop)
                 return 
             except Exception as e:
+                if isinstance(e, httpx.TransportError):
+                    # Connect errors, timeouts and streams dropped midway
+                    OPENROUTER_RESPONSES.labels(model, "chat", "error").inc()
                 print(f"[OpenRouter] Attempt '{attempt}' failed for model {model}: {e}")
                 # last_error = e # suppressed
                 # Only suppress and retry if we have retries left and it was potentially a format issue
@@ -133,8 +219,9 @@ class OpenRouterClient:
 
         try:
             # Increased timeout to 30s for slow/cold models
-            async with httpx.AsyncClient(timeout=30.0) as client:
+            async with self._http_client(30.0) as client:
                 async with client.stream("POST", f"{self.BASE_URL}/chat/completions", json=payload, headers=headers) as response:
+                    OPENROUTER_RESPONSES.labels(model, "validate", str(response.status_code)).inc()
                     if response.status_code != 200:
                         # Ensure we consume the error to avoid hanging
                         err_text = await response.aread()
@@ -158,32 +245,26 @@ class OpenRouterClient:
                         return False, err_str
 
                     # Check if we can get at least one chunk of data
-                    async for line in response.aiter_lines():
-                        if line.strip().startswith("data: "):
-                            data_str = line.strip()[6:]
-                            if data_str == "[DONE]":
-                                break # If we got here, it's valid
-                            
-                            # Check for Error response in data stream (OpenRouter sometimes sends json error instead of SSE)
-                            # But usually strictly SSE format "data: {...}"
-                            
-                            try:
-                                chunk = json.loads(data_str)
-                                # Just need one valid chunk to confirm auth and connection
-                                if "choices" in chunk:
-                                    return True, None
-                                # Some error chunks might look different
-                                if "error" in chunk:
-                                    msg = chunk.get('error', {}).get('message', "Unknown SSE Error")
-                                    return False, msg
-                            except:
-                                continue
+                    async for _, data, _ in sse_events(response.aiter_bytes()):
+                        if data == DONE:
+                            break # If we got here, it's valid
+                        chunk = parse_chunk(data)
+                        if chunk is None:
+                            continue
+                        # Just need one valid chunk to confirm auth and connection
+                        if "choices" in chunk:
+                            return True, None
+                        # Some error chunks might look different
+                        if "error" in chunk:
+                            msg = chunk.get('error', {}).get('message', "Unknown SSE Error")
+                            return False, msg
                 
                     # The loop might finish without returning True if only keep-alives or empty?
                     # But usually we hit [DONE] or a chunk.
                     return True, None
 
         except httpx.TimeoutException:
+            OPENROUTER_RESPONSES.labels(model, "validate", "error").inc()
             print(f"[OpenRouter] Timeout validating {model}")
             return False, "Connection timed out (30s limit)"
         except Exception as e:
@@ -263,4 +344,24 @@ class OpenRouterClient:
                 # Fallback to empty list or cached
                 return self._models_cache
 
+def usage_record(usage: Dict[str, Any], timing: Dict[str, float]) -> Dict[str, Any]:
+    """
+    Turn.usage_json from the provider usage record and generation timings.
+    """
+    started = timing.get('started', 0.0)
+    record: Dict[str, Any] = {
+        "tokens_in": int(usage.get('prompt_tokens') or 0),
+        "tokens_out": int(usage.get('completion_tokens') or 0),
+        "cost": float(usage.get('cost') or 0.0),
+        "latency_ms": int((timing.get('finished', started) - started) * 1000),
+    }
+    if 'first_chunk' in timing:
+        record["ttft_ms"] = int((timing['first_chunk'] - started) * 1000)
+    if usage.get('cached'):
+        # Served from the completion cache: nothing was paid for this turn
+        record["cached"] = True
+        record["cost_saved"] = record["cost"]
+        record["cost"] = 0.0
+    return record
+
 openrouter_client = OpenRouterClient()
@@ -1,28 +1,75 @@
 import uuid
+import time
 import asyncio
 from datetime import datetime, timezone
+from typing import Any, Dict
 from sqlalchemy import create_engine
 from sqlalchemy.orm import sessionmaker
 from rq import Queue
 import redis
 
 from app.core.config import settings
-from app.models.models import Debate, Turn
+from app.models.models import Debate, DebateParticipant, RejudgeRun, Turn
 from app.services.events import publish_event
+from app.services.snapshots import render_snapshot, write_snapshot
+from app.services.search import ts_config_for
+from app.services.leaderboard import resolve_winner, apply_debate_rollup
+from app.services.archive import archive_cold_debates, ensure_turn_partitions
+from app.services.tournaments import apply_tournament_failure, apply_tournament_result
+from app.services.scheduler import dispatch_scheduled_debates, release_slots
 from app.services.prompt_builder import prompt_builder
-from app.services.openrouter_client import OpenRouterClient
+from app.services.context import format_history, select_history
+from app.services.summaries import build_summary_messages, history_with_summary, summary_through
+from app.services.turn_plan import DEFAULT_MODEL_ID, round_order, total_turns
+from app.services.estimator import (
+    MIN_TURN_TOKENS, VERDICT_MAX_TOKENS, completion_allowance, count_message_tokens, is_limited,
+    max_tokens_for, panel_allowance, record_spend, summary_max_tokens, verdict_reserve,
+)
+from app.services.judges import panel_judges, panel_verdict, run_panel, verdict_job_timeout
+from app.services.rejudge import REJUDGE_JOB_TIMEOUT, REJUDGE_QUEUE, rejudge_page
+from app.services.openrouter_client import OpenRouterClient, usage_record
+from app.services.metrics import TURN_DB, TURN_DURATION, TURN_PROMPT, instrumented_job, observe_generation, timed
+from app.services.tracing import current_context, debate_trace_context, instrument_engine, traced_job
 
 # Sync DB setup for Worker
 SYNC_DB_URL = settings.DATABASE_URL.replace("postgresql+asyncpg", "postgresql")
 engine = create_engine(SYNC_DB_URL)
 SessionLocal = sessionmaker(bind=engine)
+instrument_engine(engine)
 
 # Redis Queue for chaining
 redis_conn = redis.from_url(settings.REDIS_URL)
 q = Queue(connection=redis_conn)
+# Rolling summaries, served by their own worker (python -m app.worker summaries)
+summary_q = Queue("summaries", connection=redis_conn)
+# Re-judging of stored debates (python -m app.worker rejudge)
+rejudge_q = Queue(REJUDGE_QUEUE, connection=redis_conn)
+
+def fail_debate(db, debate_id: str, error: str):
+    """
+    Mark a debate whose job chain broke as errored. A tournament debate
+    also frees its scheduler slots, so the next scheduled debates start.
+    """
+    db.rollback()
+    debate = db.query(Debate).filter(Debate.id == uuid.UUID(debate_id)).with_for_update().first()
+    if not debate or debate.status not in ("queued", "running"):
+        db.rollback()
+        return
+    debate.status = "error"
+    debate.ended_at = datetime.now(timezone.utc).replace(tzinfo=None)
+    if debate.tournament_id:
+        apply_tournament_failure(db, debate)
+    db.commit()
+    publish_event(debate_id, "debate_error", {"debate_id": debate_id, "message": error})
+    if debate.tournament_id:
+        release_slots(redis_conn, debate_id, debate.config_json or {})
+        q.enqueue("app.services.orchestrator.dispatch_scheduled_job", trace_context=current_context())
+
 
 # --- Jobs ---
 
+@traced_job
+@instrumented_job
 def start_debate_job(debate_id: str):
     """
     Job 1: Initialize debate
@@ -48,17 +95,25 @@ def start_debate_job(debate_id: str):
         q.enqueue(
             "app.services.orchestrator.process_turn_job",
             debate_id=debate_id,
-            seq_index=0
+            seq_index=0,
+            trace_context=debate_trace_context()
         )
+    except Exception as e:
+        print(f"Error starting debate {debate_id}: {e}")
+        fail_debate(db, debate_id, str(e))
     finally:
         db.close()
 
 
+@traced_job
+@instrumented_job
 def process_turn_job(debate_id: str, seq_index: int):
     """
     Job 2: Process a single turn
     """
+    job_started = time.perf_counter()
     db = SessionLocal()
+    chained = False
     try:
         debate = db.query(Debate).filter(Debate.id == uuid.UUID(debate_id)).first()
         if not debate or debate.status != "running":
@@ -66,104 +121,90 @@ def process_turn_job(debate_id: str, seq_index: int):
             return
 
         conf = debate.config_json
-        # 1. Determine Speaker & Round (Simplified Logic for MVP)
-        # Using a fixed mapped logic based on presets would go here.
-        # For MVP, let's just rotate debaters.
-        
         participants = conf.get('participants', [])
-        debaters = [p for p in participants if p['role'] == 'debater']
-        moderator = next((p for p in participants if p['role'] == 'moderator'), None)
-        
-        # Determine Max Turns
-        # If num_rounds is specified: (num_rounds * 2 debaters) + maybe moderator intros?
-        # Let's simplify: 1 Round = Mod + Debater1 + Debater2
-        num_rounds = conf.get('num_rounds', 3)
-        turns_per_round = len(debaters) + 1 if moderator else len(debaters)
-        max_turns_total = num_rounds * turns_per_round
-        
-        if seq_index >= max_turns_total:
+
+        # 1. Determine Speaker: Mod -> D1 -> D2 -> Mod... for num_rounds rounds
+        if seq_index >= total_turns(conf):
              # Add Verdict Job here before finishing
-            q.enqueue("app.services.orchestrator.conduct_verdict_job", debate_id=debate_id, seq_index=seq_index)
+            q.enqueue("app.services.orchestrator.conduct_verdict_job", debate_id=debate_id, seq_index=seq_index, trace_context=debate_trace_context(), job_timeout=verdict_job_timeout())
+            chained = True
             return
 
-        # Simple Round Robin: Mod -> D1 -> D2 -> Mod...
-        cycle_len = len(debaters) + (1 if moderator else 0)
-        pos_in_cycle = seq_index % cycle_len
-        
-        if moderator and pos_in_cycle == 0:
-            speaker = moderator
-            turn_type = "moderator_comment"
-        else:
-            # debater index
-            # if mod exists, debaters start at index 1. so pos_in_cycle 1 -> debater 0
-            d_idx = (pos_in_cycle - 1) if moderator else pos_in_cycle
-            speaker = debaters[d_idx]
-            turn_type = "argument"
-
-        # 2. Publish Start Turn
+        order = round_order(conf)
+        cycle_len = len(order)
+        speaker, turn_type = order[seq_index % cycle_len]
+
+        # 2. Build Context (History): turns the rolling summary does not cover yet
+        summary = debate.summary_json or {}
+        summarized_through = summary_through(summary)
+        with timed(TURN_DB, turn_type=turn_type, op="load"):
+            prev_turns = db.query(Turn).filter(
+                Turn.debate_id == debate.id, Turn.created_at >= debate.created_at, Turn.seq_index > summarized_through
+            ).order_by(Turn.seq_index).all()
+
+        # 3. Build Prompt
+        with timed(TURN_PROMPT, turn_type=turn_type):
+            if settings.CONTEXT_SELECTION_MIN_PARTICIPANTS and len(participants) >= settings.CONTEXT_SELECTION_MIN_PARTICIPANTS:
+                # Large panels: relevant excerpts instead of the ever-growing transcript
+                history_str = select_history(prev_turns, speaker['display_name'], conf.get('topic') or "")
+            else:
+                history_str = format_history(prev_turns)
+            if summarized_through >= 0:
+                history_str = history_with_summary(summary, history_str)
+
+            messages = prompt_builder.build_turn_messages(conf, speaker, history_str)
+
+        # Use model from speaker config, fallback to free model
+        model_id = speaker.get('model_id') or DEFAULT_MODEL_ID
+
+        # 4. Budget: cap the completion, keeping enough for the verdict
+        budget = debate.budget_json or {}
+        max_tokens = max_tokens_for(conf.get('length_preset'))
+        if is_limited(budget):
+            reserve = verdict_reserve(budget, conf, max_tokens)
+            allowance = completion_allowance(budget, model_id, count_message_tokens(messages), reserve)
+            if allowance < MIN_TURN_TOKENS:
+                # Out of budget: skip the remaining turns and judge what was said
+                publish_event(debate_id, "budget_exhausted", {
+                    "seq_index": seq_index,
+                    "spent_cost": budget.get('spent_cost'),
+                    "max_cost_usd": budget.get('max_cost_usd'),
+                    "spent_tokens": budget.get('spent_tokens'),
+                    "max_tokens": budget.get('max_tokens')
+                })
+                debate.budget_json = {**budget, "exhausted_at_seq": seq_index}
+                db.commit()
+                q.enqueue("app.services.orchestrator.conduct_verdict_job", debate_id=debate_id, seq_index=seq_index, trace_context=debate_trace_context(), job_timeout=verdict_job_timeout())
+                chained = True
+                return
+            max_tokens = min(max_tokens, allowance)
+
+        # 5. Publish Start Turn
         publish_event(debate_id, "turn_started", {
             "seq_index": seq_index,
             "speaker_name": speaker['display_name']
         })
 
-        # 3. Build Prompt (Mocking context fetch)
-        # last_turns = db.query(Turn)... limit(5)
-        # For now empty context
-        system_prompt = prompt_builder.build_system_prompt(
-            speaker['role'], 
-            speaker.get('persona_custom', 'Standard'), 
-            conf.get('intensity', 5),
-            conf.get('language', 'English')
-        )
-
-        # Handling length_preset
-        length_preset = conf.get('length_preset', 'medium')
-        length_map = {
-            'very_short': 'Keep your response very short and concise, around 50 words.',
-            'short': 'Keep your response short, around 100 words.',
-            'medium': 'Keep your response medium length, around 250 words.',
-            'long': 'You can provide a detailed response, around 500 words or more.'
-        }
-        length_instruction = length_map.get(length_preset, length_map['medium'])
-        system_prompt += f"\n\n{length_instruction}"
-        
-        # 4. Generate - Real OpenRouter Call
+        # 6. Generate - Real OpenRouter Call
         full_text = ""
-        
-        # Build Context (History)
-        prev_turns = db.query(Turn).filter(Turn.debate_id == uuid.UUID(debate_id)).order_by(Turn.seq_index).all()
-        history_str = ""
-        for t in prev_turns:
-            history_str += f"{t.speaker_name}: {t.text}\n\n"
-            
-        user_content = f"The debate topic is: {conf.get('topic')}. \n"
-        if conf.get('description'):
-            user_content += f"Context: {conf.get('description')}\n"
-            
-        # Add Participants Info
-        user_content += "\nParticipants:\n"
-        for p in participants:
-             user_content += f"- {p.get('display_name')} ({p.get('role')})\n"
-        
-        user_content += f"\nDebate History:\n{history_str}\n"
-        user_content += f"Now it is your turn, {speaker['display_name']}. Please provide your argument."
-        
-        messages = [
-            {"role": "system", "content": system_prompt},
-            {"role": "user", "content": user_content}
-        ]
-        
         client = OpenRouterClient()
+        usage: Dict[str, Any] = {}
+        timing: Dict[str, float] = {}
+        failed = False
         
         async def run_generation():
+            nonlocal failed
             text_accumulator = ""
+            timing['started'] = time.perf_counter()
             try:
-                # Use model from speaker config, fallback to free model
-                model_id = speaker.get('model_id') or "google/gemini-2.0-flash-exp:free"
                 # Check for BYOK API Key potentially in debate config
                 user_api_key = conf.get('user_provider_key') 
                 
-                async for chunk in client.create_chat_completion(model_id, messages, api_key=str(user_api_key) if user_api_key else None):
+                async for chunk in client.create_chat_completion(
+                    model_id, messages, api_key=str(user_api_key) if user_api_key else None, usage=usage,
+                    params={"max_tokens": max_tokens}
+                ):
+                    timing.setdefault('first_chunk', time.perf_counter())
                     text_accumulator += chunk
                     # Publish delta
                     publish_event(debate_id, "turn_delta", {
@@ -173,13 +214,17 @@ def process_turn_job(debate_id: str, seq_index: int):
                     })
             except Exception as ex:
                 print(f"LLM Generation Error: {ex}")
+                failed = True
                 text_accumulator += f" [Error generating response: {ex}]"
                 publish_event(debate_id, "turn_delta", {"seq_index": seq_index, "delta": f" [Error: {ex}]"})
+            timing['finished'] = time.perf_counter()
             return text_accumulator
 
         full_text = asyncio.run(run_generation())
+        observe_generation(model_id, turn_type, usage, timing, failed)
 
-        # 5. Save Turn
+        # 7. Save Turn
+        record = usage_record(usage, timing)
         new_turn = Turn(
             debate_id=uuid.UUID(debate_id),
             seq_index=seq_index,
@@ -189,35 +234,150 @@ def process_turn_job(debate_id: str, seq_index: int):
             speaker_name=speaker['display_name'],
             text=full_text,
             word_count=len(full_text.split()),
-            model_used=speaker.get('model_id', 'unknown')
+            model_used=speaker.get('model_id', 'unknown'),
+            usage_json=record,
+            search_config=ts_config_for(conf.get('language'))
         )
-        db.add(new_turn)
-        db.commit()
+        with timed(TURN_DB, turn_type=turn_type, op="save"):
+            db.add(new_turn)
+            if budget:
+                # Row lock: summary jobs record their spend concurrently
+                debate = db.query(Debate).filter(Debate.id == debate.id).with_for_update().populate_existing().one()
+                debate.budget_json = record_spend(debate.budget_json or budget, record)
+            db.commit()
 
         publish_event(debate_id, "turn_completed", {
             "seq_index": seq_index,
             "text": full_text,
             "speaker_name": speaker['display_name']
         })
+        TURN_DURATION.labels(model_id, turn_type).observe(time.perf_counter() - job_started)
 
-        # 6. Next Job
+        # 8. Next Job
         q.enqueue(
             "app.services.orchestrator.process_turn_job",
             debate_id=debate_id,
-            seq_index=seq_index + 1
+            seq_index=seq_index + 1,
+            trace_context=debate_trace_context()
         )
+        chained = True
+
+        # End of a round: refresh the rolling summary while the next turns generate
+        summary_model = conf.get('summary_model') or settings.SUMMARY_MODEL
+        through_seq = seq_index - settings.SUMMARY_RECENT_TURNS
+        if summary_model and (seq_index + 1) % cycle_len == 0 and through_seq > summarized_through:
+            summary_q.enqueue(
+                "app.services.orchestrator.summarize_debate_job",
+                debate_id=debate_id,
+                through_seq=through_seq,
+                trace_context=debate_trace_context()
+            )
         
     except Exception as e:
         print(f"Error in turn {seq_index}: {e}")
-        # Optionally fail debate
+        if not chained:
+            # Nothing comes after this turn: end the debate instead of leaving it running
+            fail_debate(db, debate_id, str(e))
+    finally:
+        db.close()
+
+
+@traced_job
+@instrumented_job
+def summarize_debate_job(debate_id: str, through_seq: int):
+    """
+    Job 2.2: Fold the turns up to through_seq into the debate's rolling summary.
+    Runs on the "summaries" queue, concurrently with the following turns;
+    turns keep using the previous summary until this one is committed.
+    """
+    db = SessionLocal()
+    try:
+        debate = db.query(Debate).filter(Debate.id == uuid.UUID(debate_id)).first()
+        if not debate or debate.status != "running":
+            return
+        previous = debate.summary_json or {}
+        since = summary_through(previous)
+        if through_seq <= since:
+            return
+
+        conf = debate.config_json
+        turns = db.query(Turn).filter(
+            Turn.debate_id == debate.id, Turn.created_at >= debate.created_at,
+            Turn.seq_index > since, Turn.seq_index <= through_seq
+        ).order_by(Turn.seq_index).all()
+        if not turns:
+            return
+        messages = build_summary_messages(
+            conf.get('topic') or "", previous.get('text'), turns, conf.get('language', 'English'), settings.SUMMARY_MAX_WORDS
+        )
+        # End the read transaction: the call below takes seconds
+        db.commit()
+
+        client = OpenRouterClient()
+        usage: Dict[str, Any] = {}
+        timing: Dict[str, float] = {}
+        model_id = conf.get('summary_model') or settings.SUMMARY_MODEL
+        max_tokens = summary_max_tokens()
+        budget = debate.budget_json or {}
+        if is_limited(budget):
+            # Never at the expense of the verdict; turns go on with the previous summary
+            reserve = verdict_reserve(budget, conf, max_tokens_for(conf.get('length_preset')))
+            if completion_allowance(budget, model_id, count_message_tokens(messages), reserve) < max_tokens:
+                return
+
+        async def run_generation():
+            text_accumulator = ""
+            timing['started'] = time.perf_counter()
+            user_api_key = conf.get('user_provider_key')
+            async for chunk in client.create_chat_completion(
+                model_id, messages, api_key=str(user_api_key) if user_api_key else None, usage=usage,
+                params={"max_tokens": max_tokens}
+            ):
+                text_accumulator += chunk
+            timing['finished'] = time.perf_counter()
+            return text_accumulator
+
+        text = asyncio.run(run_generation()).strip()
+        if not text:
+            return
+
+        # Row lock: a slower job for an earlier round must not overwrite a newer summary
+        debate = db.query(Debate).filter(Debate.id == uuid.UUID(debate_id)).with_for_update().populate_existing().first()
+        if not debate:
+            return
+        record = usage_record(usage, timing)
+        if debate.budget_json:
+            # Paid for even when a newer summary won
+            debate.budget_json = record_spend(debate.budget_json, record, transcript=False)
+        current = debate.summary_json or {}
+        if summary_through(current) >= through_seq:
+            db.commit()
+            return
+        debate.summary_json = {
+            "text": text,
+            "through_seq": through_seq,
+            "model": model_id,
+            # Spend on summaries over the whole debate
+            "tokens_in": int(current.get('tokens_in') or 0) + record["tokens_in"],
+            "tokens_out": int(current.get('tokens_out') or 0) + record["tokens_out"],
+            "cost": float(current.get('cost') or 0.0) + record["cost"],
+            "updated_at": datetime.now(timezone.utc).isoformat(),
+        }
+        db.commit()
+    except Exception as e:
+        # Turns carry on with the previous summary
+        print(f"Summary Job Error: {e}")
     finally:
         db.close()
 
 
+@traced_job
+@instrumented_job
 def conduct_verdict_job(debate_id: str, seq_index: int):
     """
-    Job 2.5: Generate Final Verdict (Judge/Moderator)
+    Job 2.5: Generate Final Verdict (Judge/Moderator, or a panel of judges)
     """
+    job_started = time.perf_counter()
     db = SessionLocal()
     try:
         debate = db.query(Debate).filter(Debate.id == uuid.UUID(debate_id)).first()
@@ -231,70 +391,108 @@ def conduct_verdict_job(debate_id: str, seq_index: int):
             moderator = {
                 "role": "moderator",
                 "display_name": "AI Judge",
-                "model_id": "google/gemini-2.0-flash-exp:free" 
+                "model_id": DEFAULT_MODEL_ID
             }
+        model_id = moderator.get('model_id') or DEFAULT_MODEL_ID
+        judges = panel_judges(conf)
+
+        # Build Context (History)
+        with timed(TURN_DB, turn_type="verdict", op="load"):
+            prev_turns = db.query(Turn).filter(Turn.debate_id == debate.id, Turn.created_at >= debate.created_at).order_by(Turn.seq_index).all()
+
+        # Build Prompt for Verdict
+        prompt_started = time.perf_counter()
+        
+        history_str = format_history(prev_turns)
+        messages = prompt_builder.build_verdict_messages(conf, history_str, vote=bool(judges))
+        TURN_PROMPT.labels("verdict").observe(time.perf_counter() - prompt_started)
+
+        max_tokens = VERDICT_MAX_TOKENS
+        budget = debate.budget_json or {}
+        if is_limited(budget):
+            prompt_tokens = count_message_tokens(messages)
+            if judges:
+                # Fewer judges rather than truncated verdicts
+                while len(judges) > 1 and panel_allowance(budget, judges, prompt_tokens) < MIN_TURN_TOKENS * 4:
+                    judges = judges[:-1]
+                allowance = panel_allowance(budget, judges, prompt_tokens)
+            else:
+                allowance = completion_allowance(budget, model_id, prompt_tokens)
+            if allowance < MIN_TURN_TOKENS:
+                # Not even the verdict fits: finish without one
+                publish_event(debate_id, "budget_exhausted", {
+                    "seq_index": seq_index,
+                    "spent_cost": budget.get('spent_cost'),
+                    "max_cost_usd": budget.get('max_cost_usd'),
+                    "spent_tokens": budget.get('spent_tokens'),
+                    "max_tokens": budget.get('max_tokens')
+                })
+                debate.budget_json = {**budget, "exhausted_at_seq": budget.get('exhausted_at_seq', seq_index)}
+                db.commit()
+                q.enqueue("app.services.orchestrator.finish_debate_job", debate_id=debate_id, trace_context=debate_trace_context())
+                return
+            max_tokens = min(max_tokens, allowance)
         
         publish_event(debate_id, "turn_started", {
             "seq_index": seq_index,
             "speaker_name": "⚖️ Moderator (Verdict)"
         })
-
-        # Build Prompt for Verdict
-        language = conf.get('language', 'English')
-        
-        system_prompt = f"""You are an expert Debate Judge. 
-        Your task is to analyze the debate history provided by the user.
-        
-        Strictly follow this structure in your response (use Markdown):
-        1. **Winner**: Declare the winner (or a draw) based on argument strength, logic, and persuasion.
-        2. **Analysis**: Briefly analyze the performance of each participant.
-        3. **Key Arguments**: Highlight the strongest points made.
-        4. **Logical Fallacies**: Point out any logical errors or weak arguments.
-        
-        Output Language: {language}
-        Style: Objective, Professional, and Analytical.
-        FORMATTING: You MUST use bolding, lists, and headers.
-        """
-
-        # Build Context (History)
-        prev_turns = db.query(Turn).filter(Turn.debate_id == uuid.UUID(debate_id)).order_by(Turn.seq_index).all()
-        history_str = ""
-        for t in prev_turns:
-            history_str += f"{t.speaker_name}: {t.text}\n\n"
-            
-        user_content = f"The debate topic was: {conf.get('topic')}. \n"
-        if conf.get('description'):
-            user_content += f"Context: {conf.get('description')}\n"
-        
-        user_content += f"\nFull Debate Transcript:\n{history_str}\n"
-        user_content += f"Please provide your final verdict now."
-
-        messages = [
-            {"role": "system", "content": system_prompt},
-            {"role": "user", "content": user_content}
-        ]
         
         client = OpenRouterClient()
         full_text = ""
-        
+        usage: Dict[str, Any] = {}
+        timing: Dict[str, float] = {}
+        failed = False
+        user_api_key = conf.get('user_provider_key')
+
+        def publish_delta(chunk: str):
+            publish_event(debate_id, "turn_delta", {
+                "seq_index": seq_index,
+                "delta": chunk,
+                "speaker_name": "⚖️ Moderator (Verdict)"
+            })
+
         async def run_generation():
+            nonlocal failed
             text_accumulator = ""
+            timing['started'] = time.perf_counter()
             try:
-                model_id = moderator.get('model_id') or "google/gemini-2.0-flash-exp:free"
-                user_api_key = conf.get('user_provider_key')
-                async for chunk in client.create_chat_completion(model_id, messages, api_key=str(user_api_key) if user_api_key else None):
+                async for chunk in client.create_chat_completion(
+                    model_id, messages, api_key=str(user_api_key) if user_api_key else None, usage=usage,
+                    params={"max_tokens": max_tokens}
+                ):
+                    timing.setdefault('first_chunk', time.perf_counter())
                     text_accumulator += chunk
-                    publish_event(debate_id, "turn_delta", {
-                        "seq_index": seq_index,
-                        "delta": chunk,
-                        "speaker_name": "⚖️ Moderator (Verdict)"
-                    })
+                    publish_delta(chunk)
             except Exception as ex:
                 print(f"Verdict Generation Error: {ex}")
+                failed = True
                 text_accumulator += f" [Error: {ex}]"
+            timing['finished'] = time.perf_counter()
             return text_accumulator
 
-        full_text = asyncio.run(run_generation())
+        if judges:
+            # Judges in parallel; the leading one is streamed
+            results = asyncio.run(run_panel(
+                client, judges, messages, publish_delta,
+                api_key=str(user_api_key) if user_api_key else None, params={"max_tokens": max_tokens}
+            ))
+            for result in results:
+                observe_generation(result["model_id"], "verdict", result["usage"], result["timing"], result["status"] != "ok")
+                result["record"] = usage_record(result["usage"], result["timing"])
+            verdict = panel_verdict(conf, results)
+            full_text = verdict["text"]
+            record = verdict["usage_json"]
+            model_id = verdict["model_id"] or judges[0]
+            winner = (verdict["winner"], verdict["winner_model_id"])
+            publish_event(debate_id, "verdict_panel", {"seq_index": seq_index, **record["panel"], "judges": [
+                {k: j[k] for k in ("model_id", "status", "winner", "confidence")} for j in record["judges"]
+            ]})
+        else:
+            full_text = asyncio.run(run_generation())
+            observe_generation(model_id, "verdict", usage, timing, failed)
+            record = usage_record(usage, timing)
+            winner = resolve_winner(conf, full_text)
 
         # Save Verdict Turn
         new_turn = Turn(
@@ -302,47 +500,175 @@ def conduct_verdict_job(debate_id: str, seq_index: int):
             seq_index=seq_index,
             round_id="verdict",
             turn_type="verdict",
-            speaker_id=moderator.get('model_id'),
+            speaker_id=model_id if judges else moderator.get('model_id'),
             speaker_name="⚖️ Moderator (Verdict)",
             text=full_text,
             word_count=len(full_text.split()),
-            model_used=moderator.get('model_id', 'unknown')
+            model_used=model_id if judges else moderator.get('model_id', 'unknown'),
+            usage_json=record,
+            search_config=ts_config_for(conf.get('language'))
         )
-        db.add(new_turn)
-        db.commit()
+        with timed(TURN_DB, turn_type="verdict", op="save"):
+            db.add(new_turn)
+            if budget:
+                # Row lock: a last summary job may still record its spend
+                debate = db.query(Debate).filter(Debate.id == debate.id).with_for_update().populate_existing().one()
+                debate.budget_json = record_spend(debate.budget_json or budget, record, transcript=False)
+            # Structured verdict for analytics
+            debate.winner, debate.winner_model_id = winner
+            db.commit()
 
         publish_event(debate_id, "turn_completed", {
             "seq_index": seq_index,
             "text": full_text,
             "speaker_name": "⚖️ Moderator (Verdict)"
         })
+        TURN_DURATION.labels(model_id, "verdict").observe(time.perf_counter() - job_started)
 
         # Finally, finish debate
-        q.enqueue("app.services.orchestrator.finish_debate_job", debate_id=debate_id)
+        q.enqueue("app.services.orchestrator.finish_debate_job", debate_id=debate_id, trace_context=debate_trace_context())
 
     except Exception as e:
         print(f"Verdict Job Error: {e}")
         # Ensure we still close the debate if judge fails
-        q.enqueue("app.services.orchestrator.finish_debate_job", debate_id=debate_id)
+        q.enqueue("app.services.orchestrator.finish_debate_job", debate_id=debate_id, trace_context=debate_trace_context())
     finally:
         db.close()
 
+@traced_job
+@instrumented_job
 def finish_debate_job(debate_id: str):
     """
     Job 3: Cleanup
     """
     db = SessionLocal()
     try:
-        debate = db.query(Debate).filter(Debate.id == uuid.UUID(debate_id)).first()
+        # Row lock: a retried job must not apply the rollups twice
+        debate = db.query(Debate).filter(Debate.id == uuid.UUID(debate_id)).with_for_update().first()
         if debate:
+            turns = db.query(Turn).filter(Turn.debate_id == debate.id, Turn.created_at >= debate.created_at).order_by(Turn.seq_index).all()
+            participants = db.query(DebateParticipant).filter(DebateParticipant.debate_id == debate.id).order_by(DebateParticipant.id).all()
+
+            if debate.status != "completed":
+                apply_debate_rollup(db, debate, turns)
+                if debate.tournament_id:
+                    apply_tournament_result(db, debate, turns)
+
             debate.status = "completed"
             debate.ended_at = datetime.now(timezone.utc).replace(tzinfo=None)
+            totals = dict(debate.totals_json or {})
+            totals["turns_count"] = len(turns)
+            totals["word_count"] = sum(t.word_count or 0 for t in turns)
+            totals["tokens_in"] = sum(int((t.usage_json or {}).get('tokens_in') or 0) for t in turns)
+            totals["tokens_out"] = sum(int((t.usage_json or {}).get('tokens_out') or 0) for t in turns)
+            totals["cost"] = sum(float((t.usage_json or {}).get('cost') or 0.0) for t in turns)
+            if debate.summary_json:
+                totals["summary_cost"] = float(debate.summary_json.get('cost') or 0.0)
+                totals["cost"] += totals["summary_cost"]
+            debate.totals_json = totals
             db.commit()
+
+            # Completed debates never change: render the static snapshot once
+            try:
+                write_snapshot(debate_id, render_snapshot(debate, participants, turns))
+            except Exception as e:
+                print(f"Snapshot write failed for {debate_id}: {e}")
             
             publish_event(debate_id, "debate_completed", {
                 "debate_id": debate_id
             })
+
+            # Free this debate's scheduler slots and start whatever now fits
+            if debate.tournament_id:
+                release_slots(redis_conn, debate_id, debate.config_json or {})
+                q.enqueue("app.services.orchestrator.dispatch_scheduled_job", trace_context=current_context())
+    finally:
+        db.close()
+
+@traced_job
+@instrumented_job
+def dispatch_scheduled_job():
+    """
+    Job 0: Start scheduled tournament debates within the concurrency caps.
+    Enqueued when a tournament is created, whenever one of its debates
+    finishes or fails, and periodically by the cron service (app/cron.py),
+    which picks up slots that expired.
+    """
+    db = SessionLocal()
+    try:
+        started = dispatch_scheduled_debates(db, q)
+        if started:
+            print(f"Dispatched {started} scheduled debates")
+    finally:
+        db.close()
+
+
+@traced_job
+@instrumented_job
+def archive_debates_job():
+    """
+    Job 4: Move turns of debates past the retention window to the archive.
+    Enqueued periodically by the cron service (app/cron.py); safe to run
+    concurrently with live debates since it only touches old rows.
+    """
+    db = SessionLocal()
+    try:
+        archived = archive_cold_debates(db)
+        if archived:
+            print(f"Archived turns of {archived} debates")
     finally:
         db.close()
 
-from datetime import datetime # Late import fix
+
+@traced_job
+@instrumented_job
+def partitions_job():
+    """
+    Job 4.1: Create the coming months' turn partitions before turns need
+    them, and move turns that landed in turns_default into their month.
+    Enqueued periodically by the cron service (app/cron.py).
+    """
+    db = SessionLocal()
+    try:
+        created = ensure_turn_partitions(db)
+        db.commit()
+        if created:
+            print(f"Created turn partitions: {', '.join(created)}")
+    finally:
+        db.close()
+
+
+@traced_job
+@instrumented_job
+def rejudge_job(run_id: str):
+    """
+    Job 5: Re-judge the next page of stored debates for a rejudge run and
+    enqueue the page after it. Pausing the run stops the chain after the
+    current page; resuming enqueues this job again from the checkpoint.
+    """
+    db = SessionLocal()
+    try:
+        run = db.get(RejudgeRun, run_id)
+        if not run or run.status not in ("queued", "running"):
+            return
+        run.status = "running"
+        if rejudge_page(db, run):
+            db.refresh(run)
+            if run.status == "running":
+                rejudge_q.enqueue(
+                    "app.services.orchestrator.rejudge_job",
+                    run_id=run_id,
+                    trace_context=current_context(),
+                    job_timeout=REJUDGE_JOB_TIMEOUT
+                )
+    except Exception as e:
+        print(f"Rejudge Job Error: {e}")
+        db.rollback()
+        run = db.get(RejudgeRun, run_id)
+        if run:
+            # Resumable from the last checkpoint
+            run.status = "error"
+            run.error = str(e)
+            db.commit()
+    finally:
+        db.close()
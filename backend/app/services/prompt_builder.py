@@ -1,5 +1,12 @@
 from typing import List, Dict, Any
 
+LENGTH_INSTRUCTIONS = {
+    'very_short': 'Keep your response very short and concise, around 50 words.',
+    'short': 'Keep your response short, around 100 words.',
+    'medium': 'Keep your response medium length, around 250 words.',
+    'long': 'You can provide a detailed response, around 500 words or more.'
+}
+
 class PromptBuilder:
     @staticmethod
     def build_system_prompt(role: str, persona: str, style: int, language: str = "English") -> str:
@@ -43,4 +50,84 @@ class PromptBuilder:
         prompt += "\nRespond to the arguments or state your opening position."
         return prompt
 
+    @staticmethod
+    def build_turn_messages(conf: Dict[str, Any], speaker: Dict[str, Any], history_str: str) -> List[Dict[str, str]]:
+        """
+        Messages for one debate turn of `speaker` (a participant of the
+        DebateConfig dict `conf`), given the formatted history.
+        """
+        system_prompt = PromptBuilder.build_system_prompt(
+            speaker['role'], 
+            speaker.get('persona_custom', 'Standard'), 
+            conf.get('intensity', 5),
+            conf.get('language', 'English')
+        )
+
+        # Handling length_preset
+        length_preset = conf.get('length_preset', 'medium')
+        length_instruction = LENGTH_INSTRUCTIONS.get(length_preset, LENGTH_INSTRUCTIONS['medium'])
+        system_prompt += f"\n\n{length_instruction}"
+
+        user_content = f"The debate topic is: {conf.get('topic')}. \n"
+        if conf.get('description'):
+            user_content += f"Context: {conf.get('description')}\n"
+            
+        # Add Participants Info
+        user_content += "\nParticipants:\n"
+        for p in conf.get('participants', []):
+             user_content += f"- {p.get('display_name')} ({p.get('role')})\n"
+        
+        user_content += f"\nDebate History:\n{history_str}\n"
+        user_content += f"Now it is your turn, {speaker['display_name']}. Please provide your argument."
+        
+        return [
+            {"role": "system", "content": system_prompt},
+            {"role": "user", "content": user_content}
+        ]
+
+    @staticmethod
+    def build_verdict_messages(conf: Dict[str, Any], history_str: str, vote: bool = False) -> List[Dict[str, str]]:
+        """
+        Messages for the judge's verdict over the full transcript. With
+        `vote`, judges of a panel also end with a machine-readable vote line.
+        """
+        language = conf.get('language', 'English')
+        
+        system_prompt = f"""You are an expert Debate Judge. 
+        Your task is to analyze the debate history provided by the user.
+        
+        Strictly follow this structure in your response (use Markdown):
+        1. **Winner**: Declare the winner using their exact name as listed in the participants (or "Draw") based on argument strength, logic, and persuasion.
+        2. **Analysis**: Briefly analyze the performance of each participant.
+        3. **Key Arguments**: Highlight the strongest points made.
+        4. **Logical Fallacies**: Point out any logical errors or weak arguments.
+        
+        Output Language: {language}
+        Style: Objective, Professional, and Analytical.
+        FORMATTING: You MUST use bolding, lists, and headers.
+        """
+        if vote:
+            system_prompt += (
+                "\nAfter the verdict, end with one last line exactly like "
+                "`VOTE: <winner's exact name or Draw> | <your confidence from 0 to 100>`, "
+                "for example `VOTE: Draw | 60`. Write this line in English."
+            )
+            
+        user_content = f"The debate topic was: {conf.get('topic')}. \n"
+        if conf.get('description'):
+            user_content += f"Context: {conf.get('description')}\n"
+        
+        user_content += "\nParticipants:\n"
+        for p in conf.get('participants', []):
+            if p.get('role') == 'debater':
+                user_content += f"- {p.get('display_name')}\n"
+
+        user_content += f"\nFull Debate Transcript:\n{history_str}\n"
+        user_content += f"Please provide your final verdict now."
+
+        return [
+            {"role": "system", "content": system_prompt},
+            {"role": "user", "content": user_content}
+        ]
+
 prompt_builder = PromptBuilder()
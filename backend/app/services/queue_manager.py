@@ -1,12 +1,16 @@
 import redis
 from rq import Queue
 from app.core.config import settings
+from app.services.tracing import current_context
+from app.services.rejudge import REJUDGE_JOB_TIMEOUT, REJUDGE_QUEUE
 
 # Setup Redis connection
 redis_conn = redis.from_url(settings.REDIS_URL) # type: ignore
 
 # Setup Queue
 q = Queue(connection=redis_conn)
+# Re-judging of stored debates, served by its own worker (python -m app.worker rejudge)
+rejudge_q = Queue(REJUDGE_QUEUE, connection=redis_conn)
 
 def enqueue_debate_start(debate_id: str):
     """
@@ -16,5 +20,29 @@ def enqueue_debate_start(debate_id: str):
     q.enqueue( # type: ignore
         "app.services.orchestrator.start_debate_job",
         debate_id=debate_id,
+        trace_context=current_context(),
         job_timeout='5m' # Long timeout just in case
     )
+
+def enqueue_dispatch_scheduled():
+    """
+    Enqueue a scheduler pass that starts scheduled (tournament) debates
+    within the concurrency caps.
+    Target function: app.services.orchestrator.dispatch_scheduled_job
+    """
+    q.enqueue( # type: ignore
+        "app.services.orchestrator.dispatch_scheduled_job",
+        trace_context=current_context()
+    )
+
+def enqueue_rejudge(run_id: str):
+    """
+    Enqueue the next page of a re-judging run; each page enqueues the following one.
+    Target function: app.services.orchestrator.rejudge_job
+    """
+    rejudge_q.enqueue( # type: ignore
+        "app.services.orchestrator.rejudge_job",
+        run_id=run_id,
+        trace_context=current_context(),
+        job_timeout=REJUDGE_JOB_TIMEOUT
+    )
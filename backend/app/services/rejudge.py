@@ -0,0 +1,217 @@
+import time
+import asyncio
+import uuid
+from contextlib import asynccontextmanager
+from datetime import datetime, timezone
+from typing import Any, AsyncIterator, Dict, List, NamedTuple, Optional, Tuple
+from sqlalchemy import tuple_
+from sqlalchemy.orm import Session as DBSession
+
+from app.core.config import settings
+from app.models.models import Debate, RejudgeRun, Turn, TurnArchive, Verdict
+from app.services.archive import read_archived_turns
+from app.services.context import format_history
+from app.services.estimator import VERDICT_MAX_TOKENS
+from app.services.judges import parse_vote
+from app.services.metrics import observe_generation
+from app.services.openrouter_client import OpenRouterClient, usage_record
+from app.services.prompt_builder import prompt_builder
+
+# Re-judging of stored debates, e.g. to score a new judge model against the
+# past. A run (rejudge_runs row) walks completed debates in (created_at, id)
+# order, one page of REJUDGE_BATCH_SIZE debates at a time: transcripts are
+# loaded for the whole page (archived debates from their archive), every
+# judge model votes on every debate with the panel prompt, and the results
+# go to the verdicts table; the debates' own turns and winner are untouched.
+#
+# Calls run concurrently within a page, at most REJUDGE_CONCURRENCY_PER_MODEL
+# at a time per judge model and no faster than REJUDGE_REQUESTS_PER_MINUTE.
+# The run's cursor is committed with the page's verdicts, so an interrupted
+# run resumes at the first unfinished page; verdicts that already exist are
+# not requested again. Failed calls are counted, and the cursor stops before
+# the first debate with a failed call, so the next page asks again; after
+# REJUDGE_MAX_ATTEMPTS failures (failed_attempts) a pair is skipped.
+#
+# The worker runs one page per job (rejudge_job on the "rejudge" queue,
+# chained like turns); scripts/rejudge_debates.py runs pages in-process.
+
+REJUDGE_QUEUE = "rejudge"
+# One page of calls, rate limits included
+REJUDGE_JOB_TIMEOUT = "30m"
+
+
+class TranscriptTurn(NamedTuple):
+    seq_index: int
+    speaker_name: str
+    text: str
+
+
+class ModelLimiter:
+    """Per-model concurrency and request rate limits, shared by all calls of a page."""
+
+    def __init__(self, concurrency: int, per_minute: float):
+        self.concurrency = max(concurrency, 1)
+        self.interval = 60.0 / per_minute if per_minute else 0.0
+        self.semaphores: Dict[str, asyncio.Semaphore] = {}
+        self.next_start: Dict[str, float] = {}
+
+    @asynccontextmanager
+    async def slot(self, model_id: str) -> AsyncIterator[None]:
+        semaphore = self.semaphores.setdefault(model_id, asyncio.Semaphore(self.concurrency))
+        async with semaphore:
+            if self.interval:
+                now = time.monotonic()
+                start = max(now, self.next_start.get(model_id, now))
+                self.next_start[model_id] = start + self.interval
+                if start > now:
+                    await asyncio.sleep(start - now)
+            yield
+
+
+def debate_page(db: DBSession, run: RejudgeRun, limit: int) -> List[Debate]:
+    """The next `limit` completed debates of a run after its cursor."""
+    query = db.query(Debate).filter(Debate.status == "completed")
+    if run.since:
+        query = query.filter(Debate.created_at >= run.since)
+    if run.until:
+        query = query.filter(Debate.created_at < run.until)
+    if run.cursor_created_at is not None:
+        query = query.filter(
+            tuple_(Debate.created_at, Debate.id) > tuple_(run.cursor_created_at, run.cursor_debate_id)
+        )
+    return query.order_by(Debate.created_at, Debate.id).limit(limit).all()
+
+
+def load_transcripts(db: DBSession, debates: List[Debate]) -> Dict[uuid.UUID, List[TranscriptTurn]]:
+    """Turns before the verdict of each debate, live or archived."""
+    transcripts: Dict[uuid.UUID, List[TranscriptTurn]] = {d.id: [] for d in debates}
+    if not debates:
+        return transcripts
+    ids = [d.id for d in debates]
+    # Partition pruning: no turn predates its debate
+    turns = db.query(Turn.debate_id, Turn.seq_index, Turn.speaker_name, Turn.text).filter(
+        Turn.debate_id.in_(ids), Turn.created_at >= min(d.created_at for d in debates), Turn.turn_type != "verdict"
+    ).order_by(Turn.debate_id, Turn.seq_index).all()
+    for debate_id, seq_index, speaker_name, text in turns:
+        transcripts[debate_id].append(TranscriptTurn(seq_index, speaker_name, text))
+    for entry in db.query(TurnArchive).filter(TurnArchive.debate_id.in_(ids)).all():
+        transcripts[entry.debate_id] = [
+            TranscriptTurn(t["seq_index"], t["speaker_name"], t["text"])
+            for t in read_archived_turns(entry) if t.get("turn_type") != "verdict"
+        ]
+    return transcripts
+
+
+async def judge_debate(
+    client: OpenRouterClient, limiter: ModelLimiter, model_id: str, messages: List[Dict[str, Any]]
+) -> Tuple[Optional[str], Dict[str, Any], Dict[str, float]]:
+    """(verdict text or None on failure, usage, timing) of one judge call."""
+    usage: Dict[str, Any] = {}
+    timing: Dict[str, float] = {}
+    async with limiter.slot(model_id):
+        text = ""
+        timing['started'] = time.perf_counter()
+        try:
+            async for chunk in client.create_chat_completion(
+                model_id, messages, usage=usage, params={"max_tokens": VERDICT_MAX_TOKENS}
+            ):
+                timing.setdefault('first_chunk', time.perf_counter())
+                text += chunk
+        except Exception as ex:
+            print(f"Rejudge call to {model_id} failed: {ex}")
+            return None, usage, timing
+        finally:
+            timing['finished'] = time.perf_counter()
+    return text, usage, timing
+
+
+def attempt_key(debate_id: uuid.UUID, model_id: str) -> str:
+    """Key of a (debate, judge model) pair in rejudge_runs.failed_attempts."""
+    return f"{debate_id} {model_id}"
+
+
+def rejudge_page(db: DBSession, run: RejudgeRun, client: Optional[OpenRouterClient] = None) -> int:
+    """
+    Judge the next page of a run and checkpoint it. Returns the number of
+    debates in the page; 0 means the run is completed.
+    """
+    debates = debate_page(db, run, settings.REJUDGE_BATCH_SIZE)
+    if not debates:
+        run.status = "completed"
+        run.updated_at = datetime.now(timezone.utc).replace(tzinfo=None)
+        db.commit()
+        return 0
+
+    transcripts = load_transcripts(db, debates)
+    attempts: Dict[str, int] = dict(run.failed_attempts or {})
+    done = set(db.query(Verdict.debate_id, Verdict.judge_model).filter(
+        Verdict.run_id == run.id, Verdict.debate_id.in_([d.id for d in debates])
+    ).all())
+    # (debate_id, config, judge model, messages)
+    work: List[Tuple[uuid.UUID, Dict[str, Any], str, List[Dict[str, Any]]]] = []
+    for debate in debates:
+        if not transcripts[debate.id]:
+            continue
+        conf = debate.config_json or {}
+        messages = prompt_builder.build_verdict_messages(conf, format_history(transcripts[debate.id]), vote=True)
+        work.extend(
+            (debate.id, conf, model_id, messages) for model_id in run.judge_models
+            if (debate.id, model_id) not in done
+            and attempts.get(attempt_key(debate.id, model_id), 0) < settings.REJUDGE_MAX_ATTEMPTS
+        )
+    page_size = len(debates)
+    positions = [(d.created_at, d.id) for d in debates]
+    page_index = {debate_id: i for i, (_, debate_id) in enumerate(positions)}
+    # End the read transaction: the calls below take minutes
+    db.commit()
+
+    client = client or OpenRouterClient()
+    limiter = ModelLimiter(settings.REJUDGE_CONCURRENCY_PER_MODEL, settings.REJUDGE_REQUESTS_PER_MINUTE)
+
+    async def judge_all():
+        return await asyncio.gather(*(judge_debate(client, limiter, model_id, messages) for _, _, model_id, messages in work))
+
+    results = asyncio.run(judge_all()) if work else []
+
+    verdicts = 0
+    # Debates from the first one with a call to retry on are judged again next page
+    retry_from = page_size
+    for (debate_id, conf, model_id, _), (text, usage, timing) in zip(work, results):
+        observe_generation(model_id, "rejudge", usage, timing, text is None)
+        if text is None:
+            run.failures += 1
+            key = attempt_key(debate_id, model_id)
+            attempts[key] = attempts.get(key, 0) + 1
+            if attempts[key] < settings.REJUDGE_MAX_ATTEMPTS:
+                retry_from = min(retry_from, page_index[debate_id])
+            continue
+        debaters = [p for p in conf.get('participants', []) if p.get('role') == 'debater']
+        winner, confidence = parse_vote(text, [p["display_name"] for p in debaters])
+        record = usage_record(usage, timing)
+        db.add(Verdict(
+            run_id=run.id,
+            debate_id=debate_id,
+            judge_model=model_id,
+            winner=winner,
+            winner_model_id=next((p.get("model_id") for p in debaters if p["display_name"] == winner), None),
+            confidence=confidence,
+            text=text,
+            usage_json=record,
+        ))
+        run.cost += record["cost"]
+        verdicts += 1
+
+    if retry_from:
+        run.cursor_created_at, run.cursor_debate_id = positions[retry_from - 1]
+    run.debates_done += retry_from
+    run.failed_attempts = attempts
+    run.verdicts_done += verdicts
+    run.updated_at = datetime.now(timezone.utc).replace(tzinfo=None)
+    db.commit()
+    return page_size
+
+
+def run_is_stale(run: RejudgeRun) -> bool:
+    """A "running" run whose worker stopped checkpointing (e.g. it was killed)."""
+    idle = datetime.now(timezone.utc).replace(tzinfo=None) - run.updated_at
+    return idle.total_seconds() > settings.REJUDGE_STALE_SECONDS
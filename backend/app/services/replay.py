@@ -0,0 +1,188 @@
+import re
+import uuid
+import asyncio
+from typing import AsyncGenerator, Dict, Any, List, Optional, Set, Tuple
+from sqlalchemy.future import select
+from starlette.concurrency import run_in_threadpool
+
+from app.core.config import settings
+from app.core.serialization import dumps_str
+from app.core.db import AsyncSessionLocal
+from app.models.models import Turn, TurnArchive
+from app.services.snapshots import read_snapshot
+from app.services.archive import read_archived_turns
+
+# Split after whitespace so replayed deltas look like streamed tokens
+_CHUNK_RE = re.compile(r"\S+\s*|\s+")
+
+
+def chunk_text(text: str, chunk_chars: int) -> List[str]:
+    """
+    Split turn text into deltas of roughly chunk_chars, on word boundaries.
+    """
+    chunks: List[str] = []
+    current = ""
+    for word in _CHUNK_RE.findall(text):
+        current += word
+        if len(current) >= chunk_chars:
+            chunks.append(current)
+            current = ""
+    if current:
+        chunks.append(current)
+    return chunks
+
+
+async def load_replay_turns(debate_id: str) -> Optional[List[Dict[str, Any]]]:
+    """
+    Stored turns ordered by seq_index: from the static snapshot if present,
+    otherwise from the database or the turn archive. Returns None for
+    unknown debates.
+    """
+    snapshot = read_snapshot(debate_id)
+    if snapshot is not None:
+        return [
+            {"seq_index": t["seq_index"], "speaker_name": t["speaker_name"], "text": t["text"]}
+            for t in snapshot.get("turns", [])
+        ]
+
+    async with AsyncSessionLocal() as db:
+        stmt = (
+            select(Turn.seq_index, Turn.speaker_name, Turn.text)
+            .where(Turn.debate_id == uuid.UUID(debate_id))
+            .order_by(Turn.seq_index)
+        )
+        rows = (await db.execute(stmt)).all()
+        archive = None if rows else await db.get(TurnArchive, uuid.UUID(debate_id))
+    if archive:
+        rows = await run_in_threadpool(read_archived_turns, archive)
+        return [{"seq_index": r["seq_index"], "speaker_name": r["speaker_name"], "text": r["text"]} for r in rows]
+    if not rows:
+        return None
+    return [{"seq_index": r.seq_index, "speaker_name": r.speaker_name, "text": r.text} for r in rows]
+
+
+class ReplayBroadcast:
+    """
+    One paced replay of a debate, fanned out to every subscribed viewer.
+    Late joiners are caught up with the turns already replayed.
+    """
+    def __init__(self, key: Tuple[str, float], turns: List[Dict[str, Any]], speed: float):
+        self.key = key
+        self.turns = turns
+        self.speed = speed
+        self.subscribers: Set["asyncio.Queue[Optional[Dict[str, str]]]"] = set()
+        self.completed: List[Dict[str, Any]] = []
+        self.current: Optional[Dict[str, Any]] = None  # turn being replayed, with partial text
+        self.task: Optional["asyncio.Task[None]"] = None
+        self.closed = False
+
+    def _emit(self, event: str, data: Dict[str, Any]):
+        # Encoded once, however many viewers
+        message = {"event": event, "data": dumps_str(data)}
+        for queue in self.subscribers:
+            queue.put_nowait(message)
+
+    async def run(self):
+        chars_per_second = settings.REPLAY_CHARS_PER_SECOND * self.speed
+        try:
+            for turn in self.turns:
+                self.current = {"seq_index": turn["seq_index"], "speaker_name": turn["speaker_name"], "text": ""}
+                self._emit("turn_started", {"seq_index": turn["seq_index"], "speaker_name": turn["speaker_name"]})
+
+                for chunk in chunk_text(turn["text"] or "", settings.REPLAY_CHUNK_CHARS):
+                    await asyncio.sleep(len(chunk) / chars_per_second)
+                    self.current["text"] += chunk
+                    self._emit("turn_delta", {
+                        "seq_index": turn["seq_index"],
+                        "delta": chunk,
+                        "speaker_name": turn["speaker_name"]
+                    })
+
+                completed = {"seq_index": turn["seq_index"], "text": turn["text"], "speaker_name": turn["speaker_name"]}
+                self.completed.append(completed)
+                self.current = None
+                self._emit("turn_completed", completed)
+                await asyncio.sleep(settings.REPLAY_TURN_GAP_SECONDS / self.speed)
+
+            self._emit("debate_completed", {"debate_id": self.key[0], "replay": True})
+        finally:
+            self.closed = True
+            for queue in self.subscribers:
+                queue.put_nowait(None)
+            replay_hub.discard(self)
+
+    def subscribe(self) -> "asyncio.Queue[Optional[Dict[str, str]]]":
+        queue: "asyncio.Queue[Optional[Dict[str, str]]]" = asyncio.Queue()
+        # Catch-up for viewers joining an in-progress replay
+        for completed in self.completed:
+            queue.put_nowait({"event": "turn_completed", "data": dumps_str(completed)})
+        if self.current is not None:
+            queue.put_nowait({"event": "turn_started", "data": dumps_str({
+                "seq_index": self.current["seq_index"], "speaker_name": self.current["speaker_name"]
+            })})
+            if self.current["text"]:
+                queue.put_nowait({"event": "turn_delta", "data": dumps_str({
+                    "seq_index": self.current["seq_index"],
+                    "delta": self.current["text"],
+                    "speaker_name": self.current["speaker_name"]
+                })})
+        self.subscribers.add(queue)
+        if self.task is None:
+            self.task = asyncio.create_task(self.run())
+        return queue
+
+    def unsubscribe(self, queue: "asyncio.Queue[Optional[Dict[str, str]]]"):
+        self.subscribers.discard(queue)
+        # Nobody watching: stop pacing instead of replaying into the void
+        if not self.subscribers and self.task is not None and not self.task.done():
+            self.closed = True
+            self.task.cancel()
+
+
+class ReplayHub:
+    """
+    Registry of running replays, keyed by (debate_id, speed), so concurrent
+    viewers of the same replay share one paced generator.
+    """
+    def __init__(self):
+        self._broadcasts: Dict[Tuple[str, float], ReplayBroadcast] = {}
+        self._lock = asyncio.Lock()
+
+    async def get_or_create(self, debate_id: str, speed: float) -> Optional[ReplayBroadcast]:
+        speed = round(speed, 2)
+        key = (debate_id, speed)
+        async with self._lock:
+            broadcast = self._broadcasts.get(key)
+            if broadcast is None or broadcast.closed:
+                turns = await load_replay_turns(debate_id)
+                if turns is None:
+                    return None
+                broadcast = ReplayBroadcast(key, turns, speed)
+                self._broadcasts[key] = broadcast
+            return broadcast
+
+    def discard(self, broadcast: ReplayBroadcast):
+        if self._broadcasts.get(broadcast.key) is broadcast:
+            del self._broadcasts[broadcast.key]
+
+    async def stream(self, debate_id: str, speed: float) -> AsyncGenerator[Dict[str, str], None]:
+        """
+        Yield SSE-ready events ({event, data: json}) for one replay viewer.
+        """
+        broadcast = await self.get_or_create(debate_id, speed)
+        if broadcast is None:
+            yield {"event": "error", "data": dumps_str({"message": "Debate has no stored turns"})}
+            return
+
+        queue = broadcast.subscribe()
+        try:
+            while True:
+                message = await queue.get()
+                if message is None:
+                    break
+                yield message
+        finally:
+            broadcast.unsubscribe(queue)
+
+
+replay_hub = ReplayHub()
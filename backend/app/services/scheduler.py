@@ -0,0 +1,104 @@
+import time
+import hashlib
+from typing import Any, Dict, List, Optional, Tuple
+from redis import Redis
+from rq import Queue
+from sqlalchemy import update
+from sqlalchemy.orm import Session as DBSession
+
+from app.core.config import settings
+from app.models.models import Debate, Tournament
+from app.services.tracing import start_debate_trace
+
+# Concurrency slots for scheduled (tournament) debates. Each model and each
+# API key has a sorted set of the debates currently holding a slot, scored
+# by acquisition time; stale members expire so a crashed debate cannot
+# hold a slot forever. Interactive debates are never throttled.
+SLOT_KEY_PREFIX = "sched:slots"
+# Scheduled debates considered per dispatch pass
+DISPATCH_BATCH_SIZE = 200
+
+# Take a slot in every set, or in none: KEYS are the slot sets,
+# ARGV = member, now, stale_before, cap for each key
+_ACQUIRE_LUA = """
+for i, key in ipairs(KEYS) do
+    redis.call('ZREMRANGEBYSCORE', key, '-inf', ARGV[3])
+    if not redis.call('ZSCORE', key, ARGV[1]) and redis.call('ZCARD', key) >= tonumber(ARGV[3 + i]) then
+        return 0
+    end
+end
+for _, key in ipairs(KEYS) do
+    redis.call('ZADD', key, ARGV[2], ARGV[1])
+end
+return 1
+"""
+
+
+def _key_id(api_key: Optional[str]) -> str:
+    # Never put raw keys in Redis
+    return hashlib.sha256(api_key.encode()).hexdigest()[:16] if api_key else "server"
+
+
+def debate_slots(debate_config: Dict[str, Any], tournament_config: Optional[Dict[str, Any]] = None) -> List[Tuple[str, int]]:
+    """(slot set, cap) pairs a debate needs: one per distinct model plus its API key."""
+    tournament_config = tournament_config or {}
+    model_cap = min(settings.TOURNAMENT_MAX_CONCURRENT_PER_MODEL, tournament_config.get("max_concurrent_per_model") or 10**6)
+    key_cap = min(settings.TOURNAMENT_MAX_CONCURRENT_PER_KEY, tournament_config.get("max_concurrent_per_key") or 10**6)
+
+    models = sorted({p["model_id"] for p in debate_config.get("participants", []) if p.get("model_id")})
+    slots = [(f"{SLOT_KEY_PREFIX}:model:{m}", model_cap) for m in models]
+    slots.append((f"{SLOT_KEY_PREFIX}:key:{_key_id(debate_config.get('user_provider_key'))}", key_cap))
+    return slots
+
+
+def acquire_slots(redis_conn: Redis, debate_id: str, slots: List[Tuple[str, int]]) -> bool:
+    now = time.time()
+    script = redis_conn.register_script(_ACQUIRE_LUA)
+    return bool(script(
+        keys=[key for key, _ in slots],
+        args=[debate_id, now, now - settings.TOURNAMENT_SLOT_TTL_SECONDS, *[cap for _, cap in slots]]
+    ))
+
+
+def release_slots(redis_conn: Redis, debate_id: str, debate_config: Dict[str, Any]):
+    """Idempotent: releasing a debate that holds no slot is a no-op."""
+    pipe = redis_conn.pipeline()
+    for key, _ in debate_slots(debate_config):
+        pipe.zrem(key, debate_id)
+    pipe.execute()
+
+
+def dispatch_scheduled_debates(db: DBSession, queue: Queue, batch_size: int = DISPATCH_BATCH_SIZE) -> int:
+    """
+    Start as many scheduled debates as the concurrency caps allow, oldest
+    first. Rows are claimed with SKIP LOCKED so concurrent dispatchers never
+    start the same debate twice. Returns the number started.
+    """
+    rows = (
+        db.query(Debate.id, Debate.config_json, Tournament.config_json)
+        .join(Tournament, Tournament.id == Debate.tournament_id)
+        .filter(Debate.status == "scheduled")
+        .order_by(Debate.created_at, Debate.id)
+        .limit(batch_size)
+        .with_for_update(of=Debate, skip_locked=True)
+        .all()
+    )
+    started = [
+        debate_id for debate_id, debate_config, tournament_config in rows
+        if acquire_slots(queue.connection, str(debate_id), debate_slots(debate_config, tournament_config))
+    ]
+    if started:
+        db.execute(update(Debate).where(Debate.id.in_(started)).values(status="queued"))
+    db.commit()
+
+    if started:
+        # One pipelined round trip for the whole batch
+        queue.enqueue_many([
+            Queue.prepare_data(
+                "app.services.orchestrator.start_debate_job",
+                kwargs={"debate_id": str(debate_id), "trace_context": start_debate_trace(str(debate_id))},
+                timeout=300
+            )
+            for debate_id in started
+        ])
+    return len(started)
@@ -0,0 +1,109 @@
+from typing import Any, Dict, List, Optional
+from sqlalchemy import cast, func, literal
+from sqlalchemy.dialects.postgresql import REGCONFIG
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.future import select
+
+from app.models.models import Debate, Turn
+
+# Debate `language` -> Postgres text search configuration
+LANGUAGE_TS_CONFIG: Dict[str, str] = {
+    "English": "english",
+    "Russian": "russian",
+    "Spanish": "spanish",
+    "French": "french",
+    "German": "german",
+    "Italian": "italian",
+    "Portuguese": "portuguese",
+    "Dutch": "dutch",
+}
+DEFAULT_TS_CONFIG = "simple"  # No stemming; used for e.g. Chinese
+
+HEADLINE_OPTIONS = "MaxFragments=2, MaxWords=30, MinWords=10, FragmentDelimiter= … , StartSel=<mark>, StopSel=</mark>"
+
+
+def ts_config_for(language: Optional[str]) -> str:
+    return LANGUAGE_TS_CONFIG.get(language or "", DEFAULT_TS_CONFIG)
+
+
+def _tsquery(q: str, language: Optional[str]) -> Any:
+    """
+    Constant tsquery so the GIN index is usable. Without a language filter,
+    the query is parsed under every configuration and OR-ed together.
+    """
+    configs = [ts_config_for(language)] if language else sorted(set(LANGUAGE_TS_CONFIG.values()) | {DEFAULT_TS_CONFIG})
+    queries = [func.websearch_to_tsquery(cast(literal(cfg), REGCONFIG), q) for cfg in configs]
+    tsq = queries[0]
+    for query in queries[1:]:
+        tsq = tsq.op("||")(query)
+    return tsq
+
+
+async def search_debates(db: AsyncSession, q: str, language: Optional[str] = None, limit: int = 20) -> List[Dict[str, Any]]:
+    """
+    Full-text search over turn text and debate title/topic.
+    Returns hits ordered by rank, with highlighted snippets.
+    """
+    tsq = _tsquery(q, language)
+
+    # Turns: every GIN index match is ranked (a top-N sort, no truncation
+    # before ranking); only the top `limit` get the costly headline
+    rank = func.ts_rank_cd(Turn.search_vector, tsq).label("rank")
+    top_turns = (
+        select(Turn.debate_id, Turn.seq_index, Turn.speaker_name, Turn.text, Turn.search_config, rank)
+        .where(Turn.search_vector.op("@@")(tsq))
+        .order_by(rank.desc())
+        .limit(limit)
+        .subquery()
+    )
+    turns_stmt = (
+        select(
+            top_turns.c.debate_id, top_turns.c.seq_index, top_turns.c.speaker_name, top_turns.c.rank,
+            func.ts_headline(top_turns.c.search_config, top_turns.c.text, tsq, HEADLINE_OPTIONS).label("snippet"),
+            Debate.title
+        )
+        .join(Debate, Debate.id == top_turns.c.debate_id)
+        .order_by(top_turns.c.rank.desc())
+    )
+
+    # Debates: title and topic, ranked the same way
+    debate_rank = func.ts_rank_cd(Debate.search_vector, tsq).label("rank")
+    top_debates = (
+        select(Debate.id, Debate.title, Debate.search_config, debate_rank)
+        .where(Debate.search_vector.op("@@")(tsq))
+        .order_by(debate_rank.desc())
+        .limit(limit)
+        .subquery()
+    )
+    debates_stmt = (
+        select(
+            top_debates.c.id, top_debates.c.title, top_debates.c.rank,
+            func.ts_headline(top_debates.c.search_config, func.coalesce(top_debates.c.title, ""), tsq, HEADLINE_OPTIONS).label("snippet")
+        )
+        .order_by(top_debates.c.rank.desc())
+    )
+
+    hits: List[Dict[str, Any]] = []
+    for row in (await db.execute(debates_stmt)).all():
+        hits.append({
+            "debate_id": str(row.id),
+            "title": row.title,
+            "match": "debate",
+            "seq_index": None,
+            "speaker_name": None,
+            "rank": float(row.rank),
+            "snippet": row.snippet
+        })
+    for row in (await db.execute(turns_stmt)).all():
+        hits.append({
+            "debate_id": str(row.debate_id),
+            "title": row.title,
+            "match": "turn",
+            "seq_index": row.seq_index,
+            "speaker_name": row.speaker_name,
+            "rank": float(row.rank),
+            "snippet": row.snippet
+        })
+
+    hits.sort(key=lambda h: h["rank"], reverse=True)
+    return hits[:limit]
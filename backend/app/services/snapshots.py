@@ -0,0 +1,150 @@
+import os
+import gzip
+import json
+import hashlib
+from typing import Any, Dict, List, Optional, Tuple
+from app.core.config import settings
+
+try:
+    import brotli  # type: ignore
+except ImportError:  # Optional: snapshots are still written as gzip
+    brotli = None
+
+# Layout under SNAPSHOT_DIR:
+#   {hash}.json, {hash}.json.gz, {hash}.json.br   immutable, content-addressed
+#   debates/{debate_id}.json(.gz|.br)            hard links to the current snapshot
+#   debates/{debate_id}.sha                      content hash of the current snapshot
+ENCODINGS: List[Tuple[str, str]] = [("br", ".br"), ("gzip", ".gz")]
+
+
+def _by_debate_path(debate_id: str, suffix: str = "") -> str:
+    return os.path.join(settings.SNAPSHOT_DIR, "debates", f"{debate_id}.json{suffix}")
+
+
+def _hash_path(debate_id: str) -> str:
+    return os.path.join(settings.SNAPSHOT_DIR, "debates", f"{debate_id}.sha")
+
+
+def _write_atomic(path: str, data: bytes):
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "wb") as f:
+        f.write(data)
+    os.replace(tmp_path, path)
+
+
+def _link(src: str, dst: str):
+    tmp_path = f"{dst}.tmp"
+    if os.path.exists(tmp_path):
+        os.unlink(tmp_path)
+    os.link(src, tmp_path)
+    os.replace(tmp_path, dst)
+
+
+def render_snapshot(debate: Any, participants: List[Any], turns: List[Any]) -> bytes:
+    """
+    Canonical JSON document of a finished debate: sorted keys, no whitespace,
+    turns ordered by seq_index. Identical debates produce identical bytes.
+    """
+    doc: Dict[str, Any] = {
+        "id": str(debate.id),
+        "status": debate.status,
+        "title": debate.title,
+        "language": (debate.config_json or {}).get("language"),
+        "topic": (debate.config_json or {}).get("topic"),
+        "created_at": debate.created_at.isoformat() if debate.created_at else None,
+        "started_at": debate.started_at.isoformat() if debate.started_at else None,
+        "ended_at": debate.ended_at.isoformat() if debate.ended_at else None,
+        "totals": debate.totals_json or {},
+        "participants": [
+            {"name": p.persona_name, "role": p.role, "model": p.model_id, "voice_name": p.voice_name, "avatar": p.avatar_url}
+            for p in participants
+        ],
+        "turns": [
+            {
+                "seq_index": t.seq_index,
+                "turn_type": t.turn_type,
+                "speaker_name": t.speaker_name,
+                "model": t.model_used,
+                "text": t.text,
+                "word_count": t.word_count,
+                "created_at": t.created_at.isoformat() if t.created_at else None
+            }
+            for t in sorted(turns, key=lambda t: t.seq_index)
+        ]
+    }
+    return json.dumps(doc, sort_keys=True, separators=(",", ":"), ensure_ascii=False).encode("utf-8")
+
+
+def write_snapshot(debate_id: str, body: bytes) -> str:
+    """
+    Store the snapshot under its content hash, precompressed, and point the
+    per-debate alias at it. Returns the content hash.
+    """
+    content_hash = hashlib.sha256(body).hexdigest()[:32]
+    os.makedirs(os.path.join(settings.SNAPSHOT_DIR, "debates"), exist_ok=True)
+
+    base_path = os.path.join(settings.SNAPSHOT_DIR, f"{content_hash}.json")
+    variants: Dict[str, bytes] = {"": body, ".gz": gzip.compress(body, compresslevel=9, mtime=0)}
+    if brotli is not None:
+        variants[".br"] = brotli.compress(body, quality=11)
+
+    for suffix, data in variants.items():
+        path = base_path + suffix
+        if not os.path.exists(path):
+            _write_atomic(path, data)
+        _link(path, _by_debate_path(debate_id, suffix))
+    _write_atomic(_hash_path(debate_id), content_hash.encode())
+
+    return content_hash
+
+
+def find_snapshot(debate_id: str, accept_encoding: str = "") -> Optional[Tuple[str, Optional[str]]]:
+    """
+    Return (path, content_encoding) of the best stored variant for the client,
+    or None if the debate has no snapshot.
+    """
+    accepted = {e.split(";")[0].strip() for e in accept_encoding.lower().split(",")}
+    for encoding, suffix in ENCODINGS:
+        if encoding in accepted:
+            path = _by_debate_path(debate_id, suffix)
+            if os.path.exists(path):
+                return path, encoding
+    path = _by_debate_path(debate_id)
+    if os.path.exists(path):
+        return path, None
+    return None
+
+
+def read_snapshot(debate_id: str) -> Optional[Dict[str, Any]]:
+    """
+    Load the stored snapshot document, or None if the debate has none.
+    """
+    try:
+        with open(_by_debate_path(debate_id), "rb") as f:
+            return json.loads(f.read())
+    except FileNotFoundError:
+        return None
+
+
+def snapshot_hash(debate_id: str) -> Optional[str]:
+    try:
+        with open(_hash_path(debate_id), "r") as f:
+            return f.read().strip()
+    except FileNotFoundError:
+        return None
+
+
+def delete_snapshot(debate_id: str):
+    """
+    Remove the per-debate aliases and the content-addressed files behind them.
+    """
+    content_hash = snapshot_hash(debate_id)
+    paths = [_by_debate_path(debate_id, suffix) for suffix in ("", ".gz", ".br")] + [_hash_path(debate_id)]
+    if content_hash:
+        base_path = os.path.join(settings.SNAPSHOT_DIR, f"{content_hash}.json")
+        paths += [base_path + suffix for suffix in ("", ".gz", ".br")]
+    for path in paths:
+        try:
+            os.unlink(path)
+        except FileNotFoundError:
+            pass
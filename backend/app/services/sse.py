@@ -0,0 +1,163 @@
+from typing import Any, AsyncGenerator, AsyncIterable, Dict, List, Optional, Tuple
+import orjson
+
+# Incremental text/event-stream decoding for provider streams, on raw body
+# bytes (https://html.spec.whatwg.org/multipage/server-sent-events.html):
+# lines end in \n, \r\n or \r (also across chunk boundaries), "data" fields
+# of one event are joined with \n, lines starting with ":" are comments
+# (OpenRouter's keep-alives), and a blank line dispatches the event.
+# Values stay bytes until a caller decodes them, usually straight to JSON.
+# Events are plain (event, data, id) tuples: the decoder sits on the
+# per-token path, where an object per event is measurable.
+
+# Kinds yielded by completion_deltas
+CONTENT = "content"
+REASONING = "reasoning"
+USAGE = "usage"
+ERROR = "error"
+FINISH = "finish"
+
+DONE = b"[DONE]"
+
+
+# (event type, data, last event id)
+SSEEvent = Tuple[bytes, bytes, Optional[bytes]]
+
+
+class SSEDecoder:
+    def __init__(self):
+        self._buffer = b""
+        self._data: List[bytes] = []
+        self._event = b""
+        self._id: Optional[bytes] = None
+        # Stream start (BOM check) or a chunk that ended in \r, whose \n
+        # may start the next one
+        self._at_start = True
+        self._pending_cr = False
+
+    def _skip_prefix(self, chunk: bytes) -> bytes:
+        if self._at_start and chunk:
+            self._at_start = False
+            if chunk.startswith(b"\xef\xbb\xbf"):
+                chunk = chunk[3:]
+        if self._pending_cr and chunk:
+            self._pending_cr = False
+            if chunk.startswith(b"\n"):
+                chunk = chunk[1:]
+        return chunk
+
+    def feed(self, chunk: bytes) -> List[SSEEvent]:
+        """Decode one body chunk; returns the events completed by it."""
+        if self._at_start or self._pending_cr:
+            chunk = self._skip_prefix(chunk)
+        buffer = self._buffer + chunk if self._buffer else chunk
+        events: List[SSEEvent] = []
+
+        if b"\r" not in buffer:
+            # Fast path: plain \n line endings (every provider we have seen)
+            lines = buffer.split(b"\n")
+            self._buffer = lines.pop()
+            data = self._data
+            for line in lines:
+                if line[:6] == b"data: ":
+                    data.append(line[6:])
+                elif line:
+                    self._line(line, events)
+                elif data:
+                    events.append((self._event or b"message", data[0] if len(data) == 1 else b"\n".join(data), self._id))
+                    data.clear()
+                    self._event = b""
+                else:
+                    self._event = b""
+            return events
+
+        start, end = 0, len(buffer)
+        while start < end:
+            lf = buffer.find(b"\n", start)
+            cr = buffer.find(b"\r", start, lf if lf >= 0 else end)
+            if cr >= 0:
+                self._line(buffer[start:cr], events)
+                if cr + 1 == end:
+                    self._pending_cr = True
+                    start = end
+                else:
+                    start = cr + 2 if buffer[cr + 1] == 0x0A else cr + 1
+            elif lf >= 0:
+                self._line(buffer[start:lf], events)
+                start = lf + 1
+            else:
+                break
+        self._buffer = buffer[start:]
+        return events
+
+    def _line(self, line: bytes, events: List[SSEEvent]):
+        if not line:
+            if self._data:
+                events.append((self._event or b"message", b"\n".join(self._data), self._id))
+                self._data.clear()
+            self._event = b""
+            return
+        if line[0] == 0x3A:  # ":" comment / keep-alive
+            return
+        field, sep, value = line.partition(b":")
+        if sep and value[:1] == b" ":
+            value = value[1:]
+        if field == b"data":
+            self._data.append(value)
+        elif field == b"event":
+            self._event = value
+        elif field == b"id":
+            if b"\0" not in value:
+                self._id = value
+        # "retry" and unknown fields are ignored
+
+
+async def sse_events(chunks: AsyncIterable[bytes]) -> AsyncGenerator[SSEEvent, None]:
+    decoder = SSEDecoder()
+    async for chunk in chunks:
+        for event in decoder.feed(chunk):
+            yield event
+
+
+def parse_chunk(data: bytes) -> Optional[Dict[str, Any]]:
+    try:
+        chunk = orjson.loads(data)
+    except orjson.JSONDecodeError:
+        return None
+    return chunk if isinstance(chunk, dict) else None
+
+
+async def completion_deltas(chunks: AsyncIterable[bytes]) -> AsyncGenerator[Tuple[str, Any], None]:
+    """
+    (kind, value) pairs from an OpenAI-style chat completion stream:
+    CONTENT and REASONING text deltas, the USAGE record (usually on the last
+    chunk), the FINISH reason and ERROR objects sent mid-stream. Stops at
+    [DONE].
+    """
+    decoder = SSEDecoder()
+    async for piece in chunks:
+        for _, data, _ in decoder.feed(piece):
+            if data == DONE:
+                return
+            try:
+                chunk = orjson.loads(data)
+            except orjson.JSONDecodeError:
+                continue
+            if type(chunk) is not dict:
+                continue
+            if "error" in chunk and chunk["error"]:
+                yield ERROR, chunk["error"]
+            if "usage" in chunk and chunk["usage"]:
+                yield USAGE, chunk["usage"]
+            choices = chunk.get("choices")
+            if choices:
+                delta = choices[0].get("delta") or {}
+                reasoning = delta.get("reasoning")
+                if reasoning:
+                    yield REASONING, reasoning
+                content = delta.get("content")
+                if content:
+                    yield CONTENT, content
+                finish_reason = choices[0].get("finish_reason")
+                if finish_reason:
+                    yield FINISH, finish_reason
@@ -0,0 +1,51 @@
+from typing import Any, Dict, List, Optional, Sequence
+from app.services.context import format_history
+
+# Rolling summary of long debates. After each round, summarize_debate_job
+# (on the "summaries" queue, served by its own worker so it runs while the
+# next turns generate) folds the turns older than the last
+# SUMMARY_RECENT_TURNS into debates.summary_json:
+#
+#   {"text", "through_seq", "model", "tokens_in", "tokens_out", "cost", "updated_at"}
+#
+# Turn prompts then carry the summary plus the turns after through_seq
+# instead of the whole transcript. The verdict always reads the raw turns.
+
+SUMMARY_SYSTEM_PROMPT = (
+    "You maintain the running summary of a debate for its participants. "
+    "Merge the previous summary with the new turns into one updated summary. "
+    "For each speaker keep their position, their main arguments and evidence, "
+    "and which points of others they rebutted or conceded. Keep open questions. "
+    "Be factual and neutral, attribute every point to its speaker, and do not add "
+    "arguments of your own. Plain prose or short bullet lists, at most {words} words. "
+    "Write in {language}."
+)
+
+
+def build_summary_messages(topic: str, previous: Optional[str], turns: Sequence, language: str, words: int) -> List[Dict[str, Any]]:
+    user_content = f"The debate topic is: {topic}\n\n"
+    if previous:
+        user_content += f"Previous summary:\n{previous}\n\n"
+    else:
+        user_content += "There is no previous summary yet.\n\n"
+    user_content += f"New turns:\n{format_history(turns)}"
+    user_content += "Write the updated summary now."
+    return [
+        {"role": "system", "content": SUMMARY_SYSTEM_PROMPT.format(words=words, language=language)},
+        {"role": "user", "content": user_content},
+    ]
+
+
+def summary_through(summary: Optional[Dict[str, Any]]) -> int:
+    """Last seq_index covered by a debate's summary_json (-1 when there is none)."""
+    if not summary or not summary.get("text"):
+        return -1
+    return int(summary.get("through_seq", -1))
+
+
+def history_with_summary(summary: Dict[str, Any], later_history: str) -> str:
+    """Turn prompt history: the summary, then the turns it does not cover yet."""
+    return (
+        f"(Summary of turns 0-{summary['through_seq']})\n{summary['text']}\n\n"
+        f"(Later turns, in full)\n\n{later_history}"
+    )
@@ -0,0 +1,178 @@
+import uuid
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, List, Optional, Tuple
+from sqlalchemy import update
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.orm import Session as DBSession
+
+from app.models.models import Debate, Tournament, TournamentStanding
+from app.schemas.schemas import TournamentConfig
+from app.services.leaderboard import DRAW
+from app.services.search import ts_config_for
+
+
+def round_robin_rounds(models: List[str]) -> List[List[Tuple[str, str]]]:
+    """
+    Circle-method schedule: every pair meets once and, within a round, each
+    model plays at most once, so consecutive debates spread across models.
+    """
+    players: List[Optional[str]] = list(models)
+    if len(players) % 2:
+        players.append(None)  # bye
+    n = len(players)
+    rounds: List[List[Tuple[str, str]]] = []
+    for r in range(n - 1):
+        pairs = []
+        for i in range(n // 2):
+            a, b = players[i], players[n - 1 - i]
+            if a is None or b is None:
+                continue
+            # Alternate sides so nobody always opens
+            pairs.append((a, b) if (r + i) % 2 == 0 else (b, a))
+        rounds.append(pairs)
+        players = [players[0], players[-1]] + players[1:-1]
+    return rounds
+
+
+def generate_pairings(config: TournamentConfig) -> List[Tuple[str, str, str]]:
+    """(topic, first debater model, second debater model) in scheduling order."""
+    models = list(dict.fromkeys(config.models))
+    rounds = round_robin_rounds(models)
+    if config.format == "double_round_robin":
+        rounds += [[(b, a) for a, b in pairs] for pairs in rounds]
+
+    return [(topic, a, b) for topic in config.topics for pairs in rounds for a, b in pairs]
+
+
+def display_names(models: List[str]) -> Dict[str, str]:
+    """Short model names ("openai/gpt-4o" -> "gpt-4o"), full ids where short ones collide."""
+    short = {m: m.split("/")[-1] for m in models}
+    counts: Dict[str, int] = {}
+    for name in short.values():
+        counts[name] = counts.get(name, 0) + 1
+    return {m: name if counts[name] == 1 else m for m, name in short.items()}
+
+
+def build_tournament_rows(
+    tournament_id: uuid.UUID, config: TournamentConfig
+) -> Tuple[List[Dict[str, Any]], List[Dict[str, Any]]]:
+    """
+    Debate and participant rows for every pairing, ready for bulk insert.
+    created_at is staggered by a microsecond so the scheduler dispatches
+    debates in pairing order.
+    """
+    names = display_names(config.models)
+    now = datetime.now(timezone.utc).replace(tzinfo=None)
+    debates: List[Dict[str, Any]] = []
+    participants: List[Dict[str, Any]] = []
+
+    for i, (topic, model_a, model_b) in enumerate(generate_pairings(config)):
+        debate_id = uuid.uuid4()
+        people = [{"role": "debater", "model_id": m, "display_name": names[m]} for m in (model_a, model_b)]
+        if config.moderator_model_id:
+            people.insert(0, {"role": "moderator", "model_id": config.moderator_model_id, "display_name": "Moderator"})
+
+        debate_config = {
+            "topic": topic,
+            "description": None,
+            "language": config.language,
+            "participants": [
+                {"avatar_url": None, "voice_name": None, "persona_preset": None, "persona_custom": None, **p}
+                for p in people
+            ],
+            "debate_preset_id": config.debate_preset_id,
+            "length_preset": config.length_preset,
+            "num_rounds": config.num_rounds,
+            "intensity": config.intensity,
+            "user_provider_key": config.user_provider_key,
+        }
+        debates.append({
+            "id": debate_id,
+            "tournament_id": tournament_id,
+            "title": f"Debate: {topic}",
+            "config_json": debate_config,
+            "status": "scheduled",
+            "totals_json": {},
+            "search_config": ts_config_for(config.language),
+            "created_at": now + timedelta(microseconds=i),
+        })
+        participants.extend(
+            {"debate_id": debate_id, "role": p["role"], "model_id": p["model_id"], "persona_name": p["display_name"]}
+            for p in people
+        )
+
+    return debates, participants
+
+
+def apply_tournament_result(db: DBSession, debate: Debate, turns: List[Any]):
+    """
+    Add one finished debate to its tournament's standings and progress.
+    Called next to apply_debate_rollup, in the transaction that marks the
+    debate completed, so each debate is counted exactly once.
+    """
+    now = datetime.now(timezone.utc).replace(tzinfo=None)
+    debaters = [p for p in (debate.config_json or {}).get("participants", []) if p.get("role") == "debater"]
+    cost_by_model: Dict[str, float] = {}
+    for t in turns:
+        cost_by_model[t.model_used] = cost_by_model.get(t.model_used, 0.0) + float((t.usage_json or {}).get("cost") or 0.0)
+
+    for p in debaters:
+        inc = {"played": 1, "wins": 0, "losses": 0, "draws": 0, "points": 0.0, "cost": cost_by_model.get(p["model_id"], 0.0)}
+        if debate.winner == DRAW:
+            inc["draws"], inc["points"] = 1, 0.5
+        elif debate.winner == p["display_name"]:
+            inc["wins"], inc["points"] = 1, 1.0
+        elif debate.winner:
+            inc["losses"] = 1
+
+        stmt = insert(TournamentStanding).values(tournament_id=debate.tournament_id, model_id=p["model_id"], **inc)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[TournamentStanding.tournament_id, TournamentStanding.model_id],
+            set_={col: getattr(TournamentStanding, col) + stmt.excluded[col] for col in inc}
+        )
+        db.execute(stmt)
+
+    db.execute(
+        update(Tournament)
+        .where(Tournament.id == debate.tournament_id)
+        .values(debates_completed=Tournament.debates_completed + 1)
+    )
+    _complete_if_done(db, debate.tournament_id, now)
+
+
+def apply_tournament_failure(db: DBSession, debate: Debate):
+    """
+    Count a debate that ended in an error towards its tournament's progress
+    (no standings change). Called in the transaction that marks it errored.
+    """
+    db.execute(
+        update(Tournament)
+        .where(Tournament.id == debate.tournament_id)
+        .values(debates_failed=Tournament.debates_failed + 1)
+    )
+    _complete_if_done(db, debate.tournament_id, datetime.now(timezone.utc).replace(tzinfo=None))
+
+
+def _complete_if_done(db: DBSession, tournament_id: Any, now: datetime):
+    db.execute(
+        update(Tournament)
+        .where(
+            Tournament.id == tournament_id,
+            Tournament.debates_completed + Tournament.debates_failed >= Tournament.debates_total
+        )
+        .values(status="completed", ended_at=now)
+    )
+
+
+def standing_row(standing: TournamentStanding) -> Dict[str, Any]:
+    decided = standing.wins + standing.losses + standing.draws
+    return {
+        "model_id": standing.model_id,
+        "played": standing.played,
+        "wins": standing.wins,
+        "losses": standing.losses,
+        "draws": standing.draws,
+        "points": standing.points,
+        "win_rate": standing.wins / decided if decided else None,
+        "cost": standing.cost,
+    }
@@ -0,0 +1,148 @@
+import time
+import functools
+import contextvars
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Iterator, Optional
+from opentelemetry import trace
+from opentelemetry.propagate import extract, inject
+from sqlalchemy import event
+from app.core.config import settings
+
+# OpenTelemetry tracing of a debate end to end: create_debate (or the
+# tournament dispatcher) starts the trace, every RQ job of the debate is a
+# span in it, with child spans for SQL statements, LLM streams and event
+# publishes, and the SSE endpoint records delivery of each published event.
+#
+# Context travels as a W3C `traceparent` carrier: in the `trace_context`
+# kwarg of jobs (the debate's root context, so the jobs of a debate are
+# siblings rather than a 100-level chain) and in published event payloads.
+# Off unless TRACING_EXPORTER is set; the API calls are then no-ops.
+tracer = trace.get_tracer("ai-debates")
+
+# Carrier of the debate trace the current job belongs to
+_debate_context: contextvars.ContextVar[Dict[str, str]] = contextvars.ContextVar("debate_trace_context", default={})
+
+# Per-token deltas would be thousands of spans per turn: they are counted
+# on the LLM stream span instead
+UNTRACED_EVENTS = {"turn_delta"}
+
+
+def setup_tracing(service_name: str):
+    """Install the exporter for TRACING_EXPORTER ("otlp" or "file"). Call once per process."""
+    if not settings.TRACING_EXPORTER:
+        return
+    from opentelemetry.sdk.resources import Resource
+    from opentelemetry.sdk.trace import TracerProvider
+    from opentelemetry.sdk.trace.export import BatchSpanProcessor, ConsoleSpanExporter
+
+    if settings.TRACING_EXPORTER == "otlp":
+        from opentelemetry.exporter.otlp.proto.http.trace_exporter import OTLPSpanExporter
+        exporter: Any = OTLPSpanExporter(endpoint=settings.TRACING_OTLP_ENDPOINT)
+    elif settings.TRACING_EXPORTER == "file":
+        # One JSON span per line, appended by every process
+        out = open(settings.TRACING_FILE, "a", encoding="utf-8")
+        exporter = ConsoleSpanExporter(out=out, formatter=lambda span: span.to_json(indent=None) + "\n")
+    else:
+        raise ValueError(f"Unknown TRACING_EXPORTER: {settings.TRACING_EXPORTER}")
+
+    provider = TracerProvider(resource=Resource.create({"service.name": service_name}))
+    provider.add_span_processor(BatchSpanProcessor(exporter))
+    trace.set_tracer_provider(provider)
+
+
+def flush():
+    provider = trace.get_tracer_provider()
+    if hasattr(provider, "force_flush"):
+        provider.force_flush()  # type: ignore
+
+
+def current_context() -> Dict[str, str]:
+    carrier: Dict[str, str] = {}
+    inject(carrier)
+    return carrier
+
+
+def debate_trace_context() -> Dict[str, str]:
+    """Carrier to pass as `trace_context` when enqueueing the next job of a debate."""
+    return _debate_context.get() or current_context()
+
+
+def start_debate_trace(debate_id: str) -> Dict[str, str]:
+    """
+    New trace for a debate started without a request of its own (scheduled
+    debates), linked to the current span. Returns its carrier.
+    """
+    links = [trace.Link(trace.get_current_span().get_span_context())] if trace.get_current_span().is_recording() else []
+    span = tracer.start_span("debate", context=trace.set_span_in_context(trace.INVALID_SPAN), links=links, attributes={"debate_id": debate_id})
+    carrier: Dict[str, str] = {}
+    inject(carrier, context=trace.set_span_in_context(span))
+    span.end()
+    return carrier
+
+
+def traced_job(fn: Callable) -> Callable:
+    """
+    Runs an RQ job in a span of the trace given by its `trace_context`
+    kwarg (which the job itself never sees). Spans are flushed at the end
+    of the job: RQ work horses exit without running atexit handlers.
+    """
+    @functools.wraps(fn)
+    def wrapper(*args, trace_context: Optional[Dict[str, str]] = None, **kwargs):
+        token = _debate_context.set(trace_context or {})
+        attributes = {k: str(v) for k, v in kwargs.items()}
+        try:
+            with tracer.start_as_current_span(f"job {fn.__name__}", context=extract(trace_context or {}), attributes=attributes):
+                return fn(*args, **kwargs)
+        finally:
+            _debate_context.reset(token)
+            flush()
+    return wrapper
+
+
+@contextmanager
+def publish_span(event_type: str, debate_id: str) -> Iterator[Dict[str, str]]:
+    """Span around an event publish; yields the carrier to embed in the event data."""
+    if not trace.get_current_span().is_recording():
+        yield {}
+        return
+    with tracer.start_as_current_span(f"publish {event_type}", attributes={"debate_id": debate_id}):
+        yield current_context()
+
+
+def record_delivery(event_type: str, data: Dict[str, Any]):
+    """Span from publish (data.ts) to SSE delivery of an event, in the publisher's trace."""
+    if event_type in UNTRACED_EVENTS or "traceparent" not in data:
+        return
+    published_ns = int(float(data.get("ts", time.time())) * 1e9)
+    span = tracer.start_span(f"sse {event_type}", context=extract(data), start_time=published_ns)
+    span.end()
+
+
+def instrument_engine(engine):
+    """Span per SQL statement on a (sync) SQLAlchemy engine; for async engines pass .sync_engine."""
+    if not settings.TRACING_EXPORTER:
+        return
+
+    @event.listens_for(engine, "before_cursor_execute")
+    def _before(conn, cursor, statement, parameters, context, executemany):
+        if not trace.get_current_span().is_recording():
+            return
+        context._trace_span = tracer.start_span(
+            statement.split(None, 1)[0].upper() if statement else "SQL",
+            attributes={"db.system": conn.dialect.name, "db.statement": statement[:2000]},
+        )
+
+    @event.listens_for(engine, "after_cursor_execute")
+    def _after(conn, cursor, statement, parameters, context, executemany):
+        span = getattr(context, "_trace_span", None)
+        if span is not None:
+            span.set_attribute("db.rowcount", cursor.rowcount)
+            span.end()
+
+    @event.listens_for(engine, "handle_error")
+    def _error(exception_context):
+        span = getattr(exception_context.execution_context, "_trace_span", None)
+        if span is not None:
+            span.record_exception(exception_context.original_exception)
+            span.set_status(trace.Status(trace.StatusCode.ERROR))
+            span.end()
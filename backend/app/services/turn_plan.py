@@ -0,0 +1,23 @@
+from typing import Any, Dict, List, Tuple
+
+# Who speaks when: rounds of moderator (if any) then each debater in order,
+# num_rounds times, then the verdict. Shared by the orchestrator and the
+# pre-flight estimator.
+
+# Speakers and judges without a model_id
+DEFAULT_MODEL_ID = "google/gemini-2.0-flash-exp:free"
+
+
+def round_order(conf: Dict[str, Any]) -> List[Tuple[Dict[str, Any], str]]:
+    """(participant, turn_type) for each turn of one round."""
+    participants = conf.get('participants', [])
+    debaters = [p for p in participants if p['role'] == 'debater']
+    moderator = next((p for p in participants if p['role'] == 'moderator'), None)
+    order = [(moderator, "moderator_comment")] if moderator else []
+    return order + [(d, "argument") for d in debaters]
+
+
+def total_turns(conf: Dict[str, Any]) -> int:
+    """Turns before the verdict (whose seq_index is this number)."""
+    num_rounds = conf.get('num_rounds')
+    return (3 if num_rounds is None else num_rounds) * len(round_order(conf))
@@ -1,12 +1,18 @@
 import os
+import sys
+import shutil
 import redis
 from redis import Redis
 from rq import Worker, Queue
 from typing import Optional
 
-listen = ['default']
+# Queues to serve, in priority order: `python -m app.worker summaries` runs a
+# worker for rolling summaries only, so they never wait behind turns (and
+# `rejudge` one for batch re-judging, so it never delays live debates)
+listen = sys.argv[1:] or ['default']
 
 redis_url = os.getenv('REDIS_URL', 'redis://redis:6379/0')
+metrics_port = int(os.getenv('WORKER_METRICS_PORT', '9100'))
 
 try:
     conn: Optional[Redis] = redis.from_url(redis_url)
@@ -14,8 +20,33 @@ except Exception as e:
     print(f"Error connecting to Redis: {e}")
     conn = None
 
+def start_metrics_exporter(port: int):
+    """
+    Serve Prometheus metrics recorded by jobs (app.services.metrics).
+    RQ forks a work horse per job, so jobs write to PROMETHEUS_MULTIPROC_DIR
+    and the exporter merges the files. Horses of one worker run one at a
+    time, so they all share this worker's files rather than leaving a set
+    per job behind.
+    """
+    path = os.environ.setdefault('PROMETHEUS_MULTIPROC_DIR', '/tmp/rq_metrics')
+    shutil.rmtree(path, ignore_errors=True)
+    os.makedirs(path)
+
+    from prometheus_client import CollectorRegistry, multiprocess, start_http_server, values
+    worker_pid = os.getpid()
+    values.ValueClass = values.MultiProcessValue(lambda: worker_pid)
+    registry = CollectorRegistry()
+    multiprocess.MultiProcessCollector(registry)
+    start_http_server(port, registry=registry)
+    print(f"Worker metrics on :{port}/metrics")
+
 if __name__ == '__main__':
     if conn:
+        if metrics_port:
+            start_metrics_exporter(metrics_port)
+        # Before forking any work horse: they inherit the tracer provider
+        from app.services.tracing import setup_tracing
+        setup_tracing("ai-debates-worker")
         # Create queues with explicit connection
         queues = [Queue(name, connection=conn) for name in listen]
         worker = Worker(queues, connection=conn)
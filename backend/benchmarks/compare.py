@@ -0,0 +1,42 @@
+import os
+import sys
+import argparse
+
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from results_io import load_results
+
+# Diff two result files (e.g. baseline vs. this branch):
+#   python benchmarks/compare.py benchmarks/baselines/micro.json benchmarks/results/micro-....json
+# Exits non-zero when a metric regresses by more than --threshold.
+
+
+def compare(base_path: str, new_path: str, threshold: float) -> int:
+    base, new = load_results(base_path), load_results(new_path)
+    print(f"base: {base['meta'].get('git_sha')} {base['meta'].get('timestamp')}")
+    print(f"new:  {new['meta'].get('git_sha')} {new['meta'].get('timestamp')}\n")
+    print(f"{'metric':<44} {'base':>12} {'new':>12} {'change':>9}")
+
+    regressions = 0
+    for name in sorted(set(base["metrics"]) | set(new["metrics"])):
+        b, n = base["metrics"].get(name), new["metrics"].get(name)
+        if not b or not n or b["value"] is None or n["value"] is None:
+            print(f"{name:<44} {'-' if not b else b['value']!s:>12} {'-' if not n else n['value']!s:>12}")
+            continue
+        change = (n["value"] - b["value"]) / b["value"] if b["value"] else 0.0
+        worse = change > threshold if n.get("better", "lower") == "lower" else change < -threshold
+        regressions += worse
+        flag = "  REGRESSION" if worse else ""
+        print(f"{name:<44} {b['value']:>12.4g} {n['value']:>12.4g} {change:>+8.1%}{flag}  {n.get('unit', '')}")
+
+    print(f"\n{regressions} regression(s) beyond {threshold:.0%}")
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Compare two benchmark result files")
+    parser.add_argument("base")
+    parser.add_argument("new")
+    parser.add_argument("--threshold", type=float, default=0.10, help="Relative change counted as a regression")
+    args = parser.parse_args()
+    sys.exit(compare(args.base, args.new, args.threshold))
@@ -0,0 +1,96 @@
+import json
+import random
+from datetime import datetime, timedelta
+from types import SimpleNamespace
+from typing import Any, Dict, List
+
+# Realistic inputs for the microbenchmarks. Seeded, so every run (and every
+# commit) measures the same data.
+
+_rng = random.Random(1234)
+_WORDS = (
+    "evidence policy cost benefit risk freedom market state history data argument "
+    "however therefore moreover clearly opponent claims fails ignores shows proves"
+).split()
+
+
+def _sentence(words: int) -> str:
+    return " ".join(_rng.choice(_WORDS) for _ in range(words)).capitalize() + "."
+
+
+def debate_turns(n: int = 100, words_per_turn: int = 250) -> List[SimpleNamespace]:
+    """Stand-ins for Turn rows of an n-turn debate (only the fields the code reads)."""
+    speakers = ["Moderator", "Alice", "Bob"]
+    return [
+        SimpleNamespace(
+            seq_index=i,
+            speaker_name=speakers[i % 3],
+            text=" ".join(_sentence(12) for _ in range(words_per_turn // 12)),
+        )
+        for i in range(n)
+    ]
+
+
+def sse_stream(chunks: int = 10000) -> List[bytes]:
+    """
+    An OpenRouter chat completion stream with `chunks` content deltas, usage
+    and [DONE], as the body pieces a client receives (one event each, like
+    token streaming over the network).
+    """
+    lines = [b": OPENROUTER PROCESSING\n\n"]
+    for i in range(chunks):
+        delta = {"id": "gen-bench", "model": "openai/gpt-4o-mini", "object": "chat.completion.chunk",
+                 "choices": [{"index": 0, "delta": {"role": "assistant", "content": _rng.choice(_WORDS) + " "}, "finish_reason": None}]}
+        lines.append(b"data: " + json.dumps(delta).encode() + b"\n\n")
+    usage = {"prompt_tokens": 1800, "completion_tokens": chunks, "total_tokens": 1800 + chunks, "cost": 0.0123}
+    lines.append(b"data: " + json.dumps({"id": "gen-bench", "choices": [], "usage": usage}).encode() + b"\n\n")
+    lines.append(b"data: [DONE]\n\n")
+    return lines
+
+
+def model_catalog(n: int = 600) -> Dict[str, Any]:
+    """An OpenRouter /models response with n models."""
+    data = []
+    for i in range(n):
+        free = i % 7 == 0
+        data.append({
+            "id": f"vendor{i % 40}/model-{i}" + (":free" if free else ""),
+            "name": f"Vendor {i % 40}: Model {i}",
+            "created": 1700000000 + i,
+            "description": _sentence(40),
+            "context_length": _rng.choice([8192, 32768, 128000, 200000, 1000000]),
+            "architecture": {"modality": "text->text", "input_modalities": ["text"], "output_modalities": ["text"], "tokenizer": "Other"},
+            "pricing": {"prompt": "0" if free else f"{_rng.uniform(1e-7, 1e-5):.10f}",
+                        "completion": "0" if free else f"{_rng.uniform(1e-7, 3e-5):.10f}",
+                        "request": "0", "image": "0"},
+            "top_provider": {"context_length": 128000, "max_completion_tokens": 16384, "is_moderated": False},
+            "supported_parameters": ["max_tokens", "temperature", "top_p", "stop", "seed"],
+        })
+    return {"data": data}
+
+
+def debate_payload(n: int = 100) -> Dict[str, Any]:
+    """A full GET /api/debates/{id} payload for an n-turn debate."""
+    created_at = datetime(2025, 10, 9, 12, 0, 0, 123456)
+    return {
+        "id": "4f1c2d9e-8a7b-4c3d-9e2f-1a2b3c4d5e6f",
+        "status": "completed",
+        "title": "Should cities ban private cars?",
+        "created_at": created_at,
+        "latest_seq": n - 1,
+        "participants": [
+            {"name": name, "role": role, "model": "openai/gpt-4o-mini", "voice_name": None, "avatar": None}
+            for name, role in (("Moderator", "moderator"), ("Alice", "debater"), ("Bob", "debater"))
+        ],
+        "turns": [
+            {"seq_index": t.seq_index, "speaker_name": t.speaker_name, "text": t.text, "created_at": created_at + timedelta(seconds=20 * t.seq_index)}
+            for t in debate_turns(n)
+        ],
+    }
+
+
+def delta_message(seq_index: int = 7) -> str:
+    """A turn_delta pub/sub message as published by publish_event."""
+    return "turn_delta\n" + json.dumps({
+        "seq_index": seq_index, "delta": "persuasive ", "speaker_name": "Alice", "ts": 1760000000.123456
+    })
@@ -0,0 +1,53 @@
+import os
+import json
+import subprocess
+from datetime import datetime, timezone
+from typing import Any, Dict, List, Optional
+
+# Shared result format for every benchmark in this directory:
+#   {"meta": {benchmark, git_sha, timestamp, ...},
+#    "metrics": {name: {"value": float, "unit": str, "better": "lower"|"higher"}}}
+# so any two runs can be diffed with compare.py.
+
+RESULTS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "results")
+
+
+def git_sha() -> str:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True,
+            cwd=os.path.dirname(os.path.abspath(__file__))
+        ).stdout.strip()
+    except Exception:
+        return "unknown"
+
+
+def percentile(values: List[float], pct: float) -> Optional[float]:
+    if not values:
+        return None
+    ordered = sorted(values)
+    k = (len(ordered) - 1) * pct / 100
+    lo, hi = int(k), min(int(k) + 1, len(ordered) - 1)
+    return ordered[lo] + (ordered[hi] - ordered[lo]) * (k - lo)
+
+
+def metric(value: Optional[float], unit: str, better: str = "lower") -> Dict[str, Any]:
+    return {"value": value, "unit": unit, "better": better}
+
+
+def write_results(benchmark: str, metrics: Dict[str, Dict[str, Any]], meta: Dict[str, Any], out: Optional[str] = None) -> str:
+    sha = git_sha()
+    now = datetime.now(timezone.utc)
+    path = out or os.path.join(RESULTS_DIR, f"{benchmark}-{now:%Y%m%dT%H%M%S}-{sha}.json")
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    with open(path, "w") as f:
+        json.dump({
+            "meta": {"benchmark": benchmark, "git_sha": sha, "timestamp": now.isoformat(), **meta},
+            "metrics": metrics,
+        }, f, indent=2, sort_keys=True)
+    return path
+
+
+def load_results(path: str) -> Dict[str, Any]:
+    with open(path) as f:
+        return json.load(f)
@@ -0,0 +1,34 @@
+"""Debate listing indexes
+
+Revision ID: 000000000002
+Revises: 000000000001
+Create Date: 2026-10-19 10:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = '000000000002'
+down_revision: Union[str, None] = '000000000001'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Composite indexes backing keyset pagination on (created_at, id).
+    # Built CONCURRENTLY so large debates tables are not locked during deploys.
+    with op.get_context().autocommit_block():
+        op.create_index('ix_debates_created_at_id', 'debates', ['created_at', 'id'],
+                        unique=False, postgresql_concurrently=True, if_not_exists=True)
+        op.create_index('ix_debates_status_created_at_id', 'debates', ['status', 'created_at', 'id'],
+                        unique=False, postgresql_concurrently=True, if_not_exists=True)
+        op.create_index('ix_debates_session_created_at_id', 'debates', ['session_id', 'created_at', 'id'],
+                        unique=False, postgresql_concurrently=True, if_not_exists=True)
+
+
+def downgrade() -> None:
+    op.drop_index('ix_debates_session_created_at_id', table_name='debates')
+    op.drop_index('ix_debates_status_created_at_id', table_name='debates')
+    op.drop_index('ix_debates_created_at_id', table_name='debates')
@@ -0,0 +1,27 @@
+"""Turns (debate_id, seq_index) index
+
+Revision ID: 000000000003
+Revises: 000000000002
+Create Date: 2026-10-19 11:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = '000000000003'
+down_revision: Union[str, None] = '000000000002'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Backs since_seq fetches and max(seq_index) lookups for ETags
+    with op.get_context().autocommit_block():
+        op.create_index('ix_turns_debate_id_seq_index', 'turns', ['debate_id', 'seq_index'],
+                        unique=False, postgresql_concurrently=True, if_not_exists=True)
+
+
+def downgrade() -> None:
+    op.drop_index('ix_turns_debate_id_seq_index', table_name='turns')
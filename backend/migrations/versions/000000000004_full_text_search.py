@@ -0,0 +1,73 @@
+"""Full-text search over debates and turns
+
+Revision ID: 000000000004
+Revises: 000000000003
+Create Date: 2026-10-19 12:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision: str = '000000000004'
+down_revision: Union[str, None] = '000000000003'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Keep in sync with app.services.search.LANGUAGE_TS_CONFIG
+LANGUAGE_TS_CONFIG = {
+    "English": "english",
+    "Russian": "russian",
+    "Spanish": "spanish",
+    "French": "french",
+    "German": "german",
+    "Italian": "italian",
+    "Portuguese": "portuguese",
+    "Dutch": "dutch",
+}
+
+
+def upgrade() -> None:
+    # 1. Per-row text search configuration
+    op.add_column('debates', sa.Column('search_config', postgresql.REGCONFIG(), server_default='simple', nullable=False))
+    op.add_column('turns', sa.Column('search_config', postgresql.REGCONFIG(), server_default='simple', nullable=False))
+
+    # 2. Backfill from the debate language
+    cases = " ".join(f"WHEN '{lang}' THEN '{cfg}'::regconfig" for lang, cfg in LANGUAGE_TS_CONFIG.items())
+    op.execute(f"UPDATE debates SET search_config = CASE config_json->>'language' {cases} ELSE 'simple'::regconfig END")
+    op.execute("UPDATE turns SET search_config = d.search_config FROM debates d WHERE turns.debate_id = d.id")
+
+    # 3. Generated vectors (maintained by Postgres whenever a row is written)
+    op.add_column('debates', sa.Column(
+        'search_vector', postgresql.TSVECTOR(),
+        sa.Computed(
+            "setweight(to_tsvector(search_config, coalesce(title, '')), 'A') || "
+            "setweight(to_tsvector(search_config, coalesce(config_json->>'topic', '')), 'B')",
+            persisted=True
+        ),
+        nullable=True
+    ))
+    op.add_column('turns', sa.Column(
+        'search_vector', postgresql.TSVECTOR(),
+        sa.Computed("to_tsvector(search_config, coalesce(text, ''))", persisted=True),
+        nullable=True
+    ))
+
+    # 4. GIN indexes
+    with op.get_context().autocommit_block():
+        op.create_index('ix_debates_search_vector', 'debates', ['search_vector'], unique=False,
+                        postgresql_using='gin', postgresql_concurrently=True, if_not_exists=True)
+        op.create_index('ix_turns_search_vector', 'turns', ['search_vector'], unique=False,
+                        postgresql_using='gin', postgresql_concurrently=True, if_not_exists=True)
+
+
+def downgrade() -> None:
+    op.drop_index('ix_turns_search_vector', table_name='turns')
+    op.drop_index('ix_debates_search_vector', table_name='debates')
+    op.drop_column('turns', 'search_vector')
+    op.drop_column('debates', 'search_vector')
+    op.drop_column('turns', 'search_config')
+    op.drop_column('debates', 'search_config')
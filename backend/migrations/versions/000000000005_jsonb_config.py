@@ -0,0 +1,75 @@
+"""JSONB config/usage storage with analytics indexes
+
+Revision ID: 000000000005
+Revises: 000000000004
+Create Date: 2026-10-19 13:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision: str = '000000000005'
+down_revision: Union[str, None] = '000000000004'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+DEBATE_SEARCH_VECTOR = (
+    "setweight(to_tsvector(search_config, coalesce(title, '')), 'A') || "
+    "setweight(to_tsvector(search_config, coalesce(config_json->>'topic', '')), 'B')"
+)
+
+
+def _recreate_debate_search_vector() -> None:
+    op.add_column('debates', sa.Column(
+        'search_vector', postgresql.TSVECTOR(),
+        sa.Computed(DEBATE_SEARCH_VECTOR, persisted=True),
+        nullable=True
+    ))
+    op.create_index('ix_debates_search_vector', 'debates', ['search_vector'], unique=False, postgresql_using='gin')
+
+
+def upgrade() -> None:
+    # debates.search_vector is generated from config_json, which blocks ALTER TYPE
+    op.drop_index('ix_debates_search_vector', table_name='debates')
+    op.drop_column('debates', 'search_vector')
+
+    op.alter_column('debates', 'config_json', type_=postgresql.JSONB(), postgresql_using='config_json::jsonb')
+    op.alter_column('turns', 'usage_json', type_=postgresql.JSONB(), postgresql_using='usage_json::jsonb')
+
+    _recreate_debate_search_vector()
+
+    with op.get_context().autocommit_block():
+        # Containment queries (config_json @> '{...}')
+        op.create_index('ix_debates_config_json', 'debates', ['config_json'], unique=False,
+                        postgresql_using='gin', postgresql_ops={'config_json': 'jsonb_path_ops'},
+                        postgresql_concurrently=True, if_not_exists=True)
+        # Targeted expression indexes on the commonly filtered keys
+        op.create_index('ix_debates_config_language', 'debates', [sa.text("(config_json->>'language')")],
+                        unique=False, postgresql_concurrently=True, if_not_exists=True)
+        op.create_index('ix_debates_config_preset_id', 'debates', [sa.text("(config_json->>'debate_preset_id')")],
+                        unique=False, postgresql_concurrently=True, if_not_exists=True)
+        op.create_index('ix_debates_config_length_preset', 'debates', [sa.text("(config_json->>'length_preset')")],
+                        unique=False, postgresql_concurrently=True, if_not_exists=True)
+        op.create_index('ix_debates_config_model_ids', 'debates',
+                        [sa.text("jsonb_path_query_array(config_json, '$.participants[*].model_id')")],
+                        unique=False, postgresql_using='gin', postgresql_concurrently=True, if_not_exists=True)
+
+
+def downgrade() -> None:
+    op.drop_index('ix_debates_config_model_ids', table_name='debates')
+    op.drop_index('ix_debates_config_length_preset', table_name='debates')
+    op.drop_index('ix_debates_config_preset_id', table_name='debates')
+    op.drop_index('ix_debates_config_language', table_name='debates')
+    op.drop_index('ix_debates_config_json', table_name='debates')
+
+    op.drop_index('ix_debates_search_vector', table_name='debates')
+    op.drop_column('debates', 'search_vector')
+
+    op.alter_column('turns', 'usage_json', type_=sa.JSON(), postgresql_using='usage_json::json')
+    op.alter_column('debates', 'config_json', type_=sa.JSON(), postgresql_using='config_json::json')
+
+    _recreate_debate_search_vector()
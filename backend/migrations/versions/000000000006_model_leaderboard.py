@@ -0,0 +1,46 @@
+"""Structured verdict winner and model_stats rollups
+
+Revision ID: 000000000006
+Revises: 000000000005
+Create Date: 2026-10-19 14:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = '000000000006'
+down_revision: Union[str, None] = '000000000005'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column('debates', sa.Column('winner', sa.String(), nullable=True))
+    op.add_column('debates', sa.Column('winner_model_id', sa.String(), nullable=True))
+
+    op.create_table('model_stats',
+        sa.Column('model_id', sa.String(), nullable=False),
+        sa.Column('role', sa.String(), nullable=False),
+        sa.Column('debates', sa.Integer(), nullable=False),
+        sa.Column('wins', sa.Integer(), nullable=False),
+        sa.Column('losses', sa.Integer(), nullable=False),
+        sa.Column('draws', sa.Integer(), nullable=False),
+        sa.Column('turns', sa.Integer(), nullable=False),
+        sa.Column('total_latency_ms', sa.BigInteger(), nullable=False),
+        sa.Column('tokens_in', sa.BigInteger(), nullable=False),
+        sa.Column('tokens_out', sa.BigInteger(), nullable=False),
+        sa.Column('cost', sa.Float(), nullable=False),
+        sa.Column('updated_at', sa.DateTime(), nullable=False),
+        sa.PrimaryKeyConstraint('model_id', 'role')
+    )
+    op.create_index('ix_model_stats_role_wins', 'model_stats', ['role', 'wins'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index('ix_model_stats_role_wins', table_name='model_stats')
+    op.drop_table('model_stats')
+    op.drop_column('debates', 'winner_model_id')
+    op.drop_column('debates', 'winner')
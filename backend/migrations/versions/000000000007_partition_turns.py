@@ -0,0 +1,109 @@
+"""Monthly range partitioning of turns and the turn archive index
+
+Revision ID: 000000000007
+Revises: 000000000006
+Create Date: 2026-10-19 15:00:00.000000
+
+"""
+from datetime import datetime, timezone
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision: str = '000000000007'
+down_revision: Union[str, None] = '000000000006'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+TURN_COLUMNS = (
+    "id, debate_id, seq_index, round_id, turn_type, speaker_id, speaker_name, "
+    "text, word_count, model_used, usage_json, retake_count, created_at, search_config"
+)
+
+
+def _add_months(dt: datetime, months: int) -> datetime:
+    month_index = dt.year * 12 + dt.month - 1 + months
+    return datetime(month_index // 12, month_index % 12 + 1, 1)
+
+
+def _create_turns_table(name: str, partitioned: bool) -> None:
+    op.execute(f"""
+        CREATE TABLE {name} (
+            id UUID NOT NULL,
+            debate_id UUID NOT NULL REFERENCES debates (id),
+            seq_index INTEGER NOT NULL,
+            round_id VARCHAR NOT NULL,
+            turn_type VARCHAR NOT NULL,
+            speaker_id VARCHAR NOT NULL,
+            speaker_name VARCHAR NOT NULL,
+            text TEXT NOT NULL,
+            word_count INTEGER NOT NULL,
+            model_used VARCHAR NOT NULL,
+            usage_json JSONB NOT NULL,
+            retake_count INTEGER NOT NULL,
+            created_at TIMESTAMP WITHOUT TIME ZONE NOT NULL,
+            search_config REGCONFIG DEFAULT 'simple' NOT NULL,
+            search_vector TSVECTOR GENERATED ALWAYS AS (to_tsvector(search_config, coalesce(text, ''))) STORED,
+            PRIMARY KEY ({'id, created_at' if partitioned else 'id'})
+        ) {'PARTITION BY RANGE (created_at)' if partitioned else ''}
+    """)
+
+
+def upgrade() -> None:
+    conn = op.get_bind()
+
+    # 1. Partitioned replacement table with monthly partitions covering existing
+    #    data and the next two months, plus a default partition as a safety net
+    _create_turns_table('turns_partitioned', partitioned=True)
+
+    oldest = conn.execute(sa.text("SELECT min(created_at) FROM turns")).scalar()
+    now = datetime.now(timezone.utc).replace(tzinfo=None)
+    month = datetime((oldest or now).year, (oldest or now).month, 1)
+    last = _add_months(datetime(now.year, now.month, 1), 2)
+    while month <= last:
+        end = _add_months(month, 1)
+        op.execute(
+            f"CREATE TABLE turns_{month:%Y_%m} PARTITION OF turns_partitioned "
+            f"FOR VALUES FROM ('{month:%Y-%m-%d}') TO ('{end:%Y-%m-%d}')"
+        )
+        month = end
+    op.execute("CREATE TABLE turns_default PARTITION OF turns_partitioned DEFAULT")
+
+    # 2. Copy, swap
+    op.execute(f"INSERT INTO turns_partitioned ({TURN_COLUMNS}) SELECT {TURN_COLUMNS} FROM turns")
+    op.drop_table('turns')
+    op.rename_table('turns_partitioned', 'turns')
+
+    # 3. Partitioned indexes (propagate to every partition)
+    op.create_index('ix_turns_debate_id_seq_index', 'turns', ['debate_id', 'seq_index'], unique=False)
+    op.create_index('ix_turns_search_vector', 'turns', ['search_vector'], unique=False, postgresql_using='gin')
+
+    # 4. Index of archived debates
+    op.create_table('turn_archives',
+        sa.Column('debate_id', sa.UUID(), nullable=False),
+        sa.Column('path', sa.String(), nullable=False),
+        sa.Column('offset', sa.BigInteger(), nullable=False),
+        sa.Column('length', sa.BigInteger(), nullable=False),
+        sa.Column('turns_count', sa.Integer(), nullable=False),
+        sa.Column('last_seq', sa.Integer(), nullable=True),
+        sa.Column('archived_at', sa.DateTime(), nullable=False),
+        sa.ForeignKeyConstraint(['debate_id'], ['debates.id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('debate_id')
+    )
+
+
+def downgrade() -> None:
+    # Archived turns stay in their NDJSON files; only hot rows are copied back
+    op.drop_table('turn_archives')
+
+    _create_turns_table('turns_unpartitioned', partitioned=False)
+    op.execute(f"INSERT INTO turns_unpartitioned ({TURN_COLUMNS}) SELECT {TURN_COLUMNS} FROM turns")
+    op.drop_table('turns')
+    op.rename_table('turns_unpartitioned', 'turns')
+
+    op.create_index('ix_turns_debate_id', 'turns', ['debate_id'], unique=False)
+    op.create_index('ix_turns_debate_id_seq_index', 'turns', ['debate_id', 'seq_index'], unique=False)
+    op.create_index('ix_turns_search_vector', 'turns', ['search_vector'], unique=False, postgresql_using='gin')
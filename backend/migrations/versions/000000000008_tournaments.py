@@ -0,0 +1,57 @@
+"""Tournaments, standings and scheduled debates
+
+Revision ID: 000000000008
+Revises: 000000000007
+Create Date: 2026-10-19 16:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision: str = '000000000008'
+down_revision: Union[str, None] = '000000000007'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table('tournaments',
+        sa.Column('id', sa.UUID(), nullable=False),
+        sa.Column('name', sa.String(), nullable=False),
+        sa.Column('format', sa.String(), nullable=False),
+        sa.Column('status', sa.String(), nullable=False),
+        sa.Column('config_json', postgresql.JSONB(astext_type=sa.Text()), nullable=False),
+        sa.Column('debates_total', sa.Integer(), nullable=False),
+        sa.Column('debates_completed', sa.Integer(), nullable=False),
+        sa.Column('created_at', sa.DateTime(), nullable=False),
+        sa.Column('ended_at', sa.DateTime(), nullable=True),
+        sa.PrimaryKeyConstraint('id')
+    )
+    op.create_table('tournament_standings',
+        sa.Column('tournament_id', sa.UUID(), nullable=False),
+        sa.Column('model_id', sa.String(), nullable=False),
+        sa.Column('played', sa.Integer(), nullable=False),
+        sa.Column('wins', sa.Integer(), nullable=False),
+        sa.Column('losses', sa.Integer(), nullable=False),
+        sa.Column('draws', sa.Integer(), nullable=False),
+        sa.Column('points', sa.Float(), nullable=False),
+        sa.Column('cost', sa.Float(), nullable=False),
+        sa.ForeignKeyConstraint(['tournament_id'], ['tournaments.id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('tournament_id', 'model_id')
+    )
+
+    op.add_column('debates', sa.Column('tournament_id', sa.UUID(), nullable=True))
+    op.create_foreign_key('debates_tournament_id_fkey', 'debates', 'tournaments', ['tournament_id'], ['id'], ondelete='CASCADE')
+    op.create_index('ix_debates_tournament_id', 'debates', ['tournament_id'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index('ix_debates_tournament_id', table_name='debates')
+    op.drop_constraint('debates_tournament_id_fkey', 'debates', type_='foreignkey')
+    op.drop_column('debates', 'tournament_id')
+    op.drop_table('tournament_standings')
+    op.drop_table('tournaments')
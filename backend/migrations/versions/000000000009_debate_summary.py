@@ -0,0 +1,25 @@
+"""Rolling summary of long debates
+
+Revision ID: 000000000009
+Revises: 000000000008
+Create Date: 2026-10-19 18:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = '000000000009'
+down_revision: Union[str, None] = '000000000008'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column('debates', sa.Column('summary_json', sa.JSON(), nullable=True))
+
+
+def downgrade() -> None:
+    op.drop_column('debates', 'summary_json')
@@ -0,0 +1,25 @@
+"""Debate budgets
+
+Revision ID: 000000000010
+Revises: 000000000009
+Create Date: 2026-10-19 19:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = '000000000010'
+down_revision: Union[str, None] = '000000000009'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column('debates', sa.Column('budget_json', sa.JSON(), nullable=True))
+
+
+def downgrade() -> None:
+    op.drop_column('debates', 'budget_json')
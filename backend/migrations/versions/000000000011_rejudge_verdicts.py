@@ -0,0 +1,63 @@
+"""Re-judging runs and their verdicts
+
+Revision ID: 000000000011
+Revises: 000000000010
+Create Date: 2026-10-19 20:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision: str = '000000000011'
+down_revision: Union[str, None] = '000000000010'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table('rejudge_runs',
+        sa.Column('id', sa.String(), nullable=False),
+        sa.Column('judge_models', sa.JSON(), nullable=False),
+        sa.Column('status', sa.String(), nullable=False),
+        sa.Column('since', sa.DateTime(), nullable=True),
+        sa.Column('until', sa.DateTime(), nullable=True),
+        sa.Column('cursor_created_at', sa.DateTime(), nullable=True),
+        sa.Column('cursor_debate_id', sa.UUID(), nullable=True),
+        sa.Column('debates_done', sa.Integer(), nullable=False),
+        sa.Column('verdicts_done', sa.Integer(), nullable=False),
+        sa.Column('failures', sa.Integer(), nullable=False),
+        sa.Column('cost', sa.Float(), nullable=False),
+        sa.Column('error', sa.Text(), nullable=True),
+        sa.Column('created_at', sa.DateTime(), nullable=False),
+        sa.Column('updated_at', sa.DateTime(), nullable=False),
+        sa.PrimaryKeyConstraint('id')
+    )
+    op.create_table('verdicts',
+        sa.Column('id', sa.UUID(), nullable=False),
+        sa.Column('run_id', sa.String(), nullable=False),
+        sa.Column('debate_id', sa.UUID(), nullable=False),
+        sa.Column('judge_model', sa.String(), nullable=False),
+        sa.Column('winner', sa.String(), nullable=True),
+        sa.Column('winner_model_id', sa.String(), nullable=True),
+        sa.Column('confidence', sa.Float(), nullable=True),
+        sa.Column('text', sa.Text(), nullable=False),
+        sa.Column('usage_json', postgresql.JSONB(astext_type=sa.Text()), nullable=False),
+        sa.Column('created_at', sa.DateTime(), nullable=False),
+        sa.ForeignKeyConstraint(['run_id'], ['rejudge_runs.id'], ondelete='CASCADE'),
+        sa.ForeignKeyConstraint(['debate_id'], ['debates.id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('id'),
+        sa.UniqueConstraint('run_id', 'debate_id', 'judge_model', name='uq_verdicts_run_debate_judge')
+    )
+    op.create_index('ix_verdicts_debate_id', 'verdicts', ['debate_id'], unique=False)
+    op.create_index('ix_verdicts_judge_model', 'verdicts', ['judge_model'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index('ix_verdicts_judge_model', table_name='verdicts')
+    op.drop_index('ix_verdicts_debate_id', table_name='verdicts')
+    op.drop_table('verdicts')
+    op.drop_table('rejudge_runs')
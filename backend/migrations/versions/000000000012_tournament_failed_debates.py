@@ -0,0 +1,25 @@
+"""Failed debates of tournaments
+
+Revision ID: 000000000012
+Revises: 000000000011
+Create Date: 2026-10-19 21:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = '000000000012'
+down_revision: Union[str, None] = '000000000011'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column('tournaments', sa.Column('debates_failed', sa.Integer(), server_default='0', nullable=False))
+
+
+def downgrade() -> None:
+    op.drop_column('tournaments', 'debates_failed')
@@ -0,0 +1,25 @@
+"""Retries of failed rejudge calls
+
+Revision ID: 000000000013
+Revises: 000000000012
+Create Date: 2026-10-19 22:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = '000000000013'
+down_revision: Union[str, None] = '000000000012'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column('rejudge_runs', sa.Column('failed_attempts', sa.JSON(), server_default='{}', nullable=False))
+
+
+def downgrade() -> None:
+    op.drop_column('rejudge_runs', 'failed_attempts')
@@ -0,0 +1,43 @@
+import os
+import sys
+import argparse
+
+# Add parent directory (backend) to path to allow importing app
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from app.core.config import settings
+from app.services.archive import archive_cold_debates
+
+# Moves turns of debates older than the retention window into the NDJSON
+# archive and drops turn partitions that became empty. The worker runs the
+# same logic as archive_debates_job, enqueued by the cron service; use this
+# for backfills.
+
+SYNC_DB_URL = settings.DATABASE_URL.replace("postgresql+asyncpg", "postgresql")
+
+
+def archive(retention_days: int, batch_size: int):
+    engine = create_engine(SYNC_DB_URL)
+    SessionLocal = sessionmaker(bind=engine)
+    db = SessionLocal()
+    try:
+        total = 0
+        while True:
+            count = archive_cold_debates(db, retention_days=retention_days, batch_size=batch_size)
+            total += count
+            if count < batch_size:
+                break
+            print(f"Archived {total} debates...")
+        print(f"Archived {total} debates.")
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Archive turns of old debates")
+    parser.add_argument("--retention-days", type=int, default=settings.ARCHIVE_RETENTION_DAYS)
+    parser.add_argument("--batch-size", type=int, default=100)
+    args = parser.parse_args()
+    archive(args.retention_days, args.batch_size)
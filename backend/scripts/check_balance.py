@@ -19,7 +19,7 @@ async def check_balance():
     print("Checking /credits...")
     try:
         async with httpx.AsyncClient() as client:
-            resp = await client.get("https://openrouter.ai/api/v1/credits", headers=headers)
+            resp = await client.get(f"{settings.OPENROUTER_BASE_URL}/credits", headers=headers)
             print(f"Status: {resp.status_code}")
             print(f"Body: {resp.text}")
     except Exception as e:
@@ -29,7 +29,7 @@ async def check_balance():
     print("\nChecking /auth/key...")
     try:
         async with httpx.AsyncClient() as client:
-            resp = await client.get("https://openrouter.ai/api/v1/auth/key", headers=headers)
+            resp = await client.get(f"{settings.OPENROUTER_BASE_URL}/auth/key", headers=headers)
             print(f"Status: {resp.status_code}")
             print(f"Body: {resp.text}")
     except Exception as e:
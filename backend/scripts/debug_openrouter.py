@@ -91,7 +91,7 @@ async def test():
     try:
         print("Streaming response...")
         async with httpx.AsyncClient(timeout=30.0) as client:
-            async with client.stream("POST", "https://openrouter.ai/api/v1/chat/completions", json=payload, headers=headers) as response:
+            async with client.stream("POST", f"{settings.OPENROUTER_BASE_URL}/chat/completions", json=payload, headers=headers) as response:
                 if response.status_code != 200:
                     err = await response.aread()
                     print(f"Error {response.status_code}: {err}")
@@ -0,0 +1,55 @@
+import os
+import sys
+import argparse
+from datetime import datetime
+
+# Add parent directory (backend) to path to allow importing app
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from app.core.config import settings
+from app.services.export import EXPORT_FORMATS, EXPORT_TABLES, default_until, export_filename, iter_export, make_encoder, naive_utc
+
+# Bulk export straight from the database, for offline evaluation.
+# Same output as GET /api/export/{table}, without the HTTP hop:
+#   python scripts/export_debates.py --out exports/ --format parquet
+#   python scripts/export_debates.py --out exports/ --since 2026-10-01T00:00:00
+# Each run prints the `until` it used; pass it as --since next time.
+
+SYNC_DB_URL = settings.DATABASE_URL.replace("postgresql+asyncpg", "postgresql")
+
+
+def export(out_dir: str, tables, fmt: str, since, until, compress: bool):
+    engine = create_engine(SYNC_DB_URL)
+    SessionLocal = sessionmaker(bind=engine)
+    os.makedirs(out_dir, exist_ok=True)
+    for table in tables:
+        encoder = make_encoder(table, fmt, compress)
+        path = os.path.join(out_dir, export_filename(table, fmt, encoder.compress, until))
+        db = SessionLocal()
+        try:
+            size = 0
+            with open(path, "wb") as f:
+                for chunk in iter_export(db, encoder, table, fmt, since, until):
+                    f.write(chunk)
+                    size += len(chunk)
+            print(f"{table}: {path} ({size / 1e6:.1f} MB)")
+        finally:
+            db.close()
+    print(f"until={until.isoformat()}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Export debates, participants and turns")
+    parser.add_argument("--out", default="exports")
+    parser.add_argument("--table", action="append", choices=EXPORT_TABLES, help="Repeatable; defaults to all tables")
+    parser.add_argument("--format", choices=EXPORT_FORMATS, default="ndjson")
+    parser.add_argument("--since", type=datetime.fromisoformat, help="Only rows created (debates: ended) at or after this time (UTC)")
+    parser.add_argument("--until", type=datetime.fromisoformat, help="Only rows created (debates: ended) before this time (UTC)")
+    parser.add_argument("--no-compress", action="store_true", help="Write plain NDJSON instead of gzip")
+    args = parser.parse_args()
+    export(
+        args.out, args.table or EXPORT_TABLES, args.format,
+        naive_utc(args.since), naive_utc(args.until) or default_until(), not args.no_compress
+    )
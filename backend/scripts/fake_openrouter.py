@@ -0,0 +1,265 @@
+import os
+import sys
+import json
+import math
+import time
+import uuid
+import random
+import asyncio
+import fnmatch
+import hashlib
+import argparse
+from typing import Any, AsyncGenerator, Dict, List, Optional
+
+import uvicorn
+from fastapi import FastAPI, Request
+from fastapi.responses import JSONResponse, StreamingResponse
+
+# Local stand-in for the OpenRouter API, for load tests without real credits.
+# Point the stack at it with OPENROUTER_BASE_URL=http://<host>:8090/api/v1
+#
+#   python scripts/fake_openrouter.py --port 8090 [--profiles profiles.json] [--seed 42]
+#
+# Latency and failure behaviour is set per model by profiles: the "default"
+# profile, overridden by the first matching entry (fnmatch pattern) in
+# "models". Profile keys:
+#   ttft_ms               {"median": ms, "p95": ms}, lognormal time to first token
+#   tokens_per_second     decode rate; tps_jitter is the +/- fraction per request
+#   completion_tokens     [min, max] reply length (capped by max_tokens)
+#   error_rate            probability of a 500 before streaming
+#   stream_error_rate     probability of an error event mid-stream
+#   reject_system_prompt  400 on any system message (like some providers)
+#   rate_limit            {"burst_every_s": s, "burst_length_s": s}: 429s during bursts
+#   pricing               {"prompt": $/token, "completion": $/token}
+#   context_length
+# Responses are deterministic for a given seed and request sequence: each
+# request is seeded by its content and how many times it has been seen.
+
+DEFAULT_PROFILES: Dict[str, Any] = {
+    "default": {
+        "ttft_ms": {"median": 600, "p95": 2000},
+        "tokens_per_second": 60,
+        "tps_jitter": 0.2,
+        "completion_tokens": [150, 450],
+        "error_rate": 0.0,
+        "stream_error_rate": 0.0,
+        "reject_system_prompt": False,
+        "rate_limit": None,
+        "pricing": {"prompt": 0.000001, "completion": 0.000002},
+        "context_length": 128000,
+    },
+    "models": {
+        "*:free": {
+            "ttft_ms": {"median": 1500, "p95": 6000},
+            "tokens_per_second": 30,
+            "rate_limit": {"burst_every_s": 60, "burst_length_s": 5},
+            "pricing": {"prompt": 0, "completion": 0},
+        },
+        "openai/*": {"ttft_ms": {"median": 400, "p95": 1200}, "tokens_per_second": 90},
+        "anthropic/*": {"ttft_ms": {"median": 800, "p95": 2000}, "tokens_per_second": 70},
+        "*parasail*": {"reject_system_prompt": True},
+    },
+}
+
+# Listed by /models in addition to the exact (non-pattern) profile names
+LISTED_MODELS = [
+    "openai/gpt-4o-mini",
+    "anthropic/claude-3.5-haiku",
+    "google/gemini-2.0-flash-exp:free",
+    "meta-llama/llama-3.3-70b-instruct",
+    "mistralai/mistral-small-3.1-24b-instruct",
+]
+
+WORDS = (
+    "the argument rests on evidence that shows a clear pattern across cases while critics "
+    "point to costs and risks that remain uncertain so we must weigh benefits against harms "
+    "consider history policy incentives outcomes fairness efficiency freedom responsibility "
+    "data suggests however moreover therefore in contrast my opponent overlooks key facts"
+).split()
+
+
+class FakeOpenRouter:
+    def __init__(self, profiles: Dict[str, Any], seed: int = 0):
+        self.profiles = profiles
+        self.seed = seed
+        self.started = time.monotonic()
+        self.seen: Dict[str, int] = {}
+        self.stats: Dict[str, Any] = {"requests": 0, "by_status": {}, "tokens_out": 0, "cost": 0.0}
+
+    def profile(self, model: str) -> Dict[str, Any]:
+        merged = dict(self.profiles.get("default", {}))
+        for pattern, overrides in self.profiles.get("models", {}).items():
+            if fnmatch.fnmatch(model, pattern):
+                merged.update(overrides)
+                break
+        return merged
+
+    def rng(self, payload: Dict[str, Any]) -> random.Random:
+        digest = hashlib.sha256(json.dumps(
+            {"model": payload.get("model"), "messages": payload.get("messages")}, sort_keys=True
+        ).encode()).hexdigest()
+        count = self.seen.get(digest, 0)
+        self.seen[digest] = count + 1
+        return random.Random(f"{self.seed}:{digest}:{count}")
+
+    def in_rate_limit_burst(self, profile: Dict[str, Any]) -> bool:
+        limit = profile.get("rate_limit")
+        if not limit:
+            return False
+        return (time.monotonic() - self.started) % limit["burst_every_s"] < limit["burst_length_s"]
+
+    def count(self, status: int):
+        self.stats["requests"] += 1
+        self.stats["by_status"][str(status)] = self.stats["by_status"].get(str(status), 0) + 1
+
+    def models(self) -> List[Dict[str, Any]]:
+        names = list(LISTED_MODELS) + [
+            m for m in self.profiles.get("models", {}) if not any(c in m for c in "*?[")
+        ]
+        data = []
+        for name in dict.fromkeys(names):
+            profile = self.profile(name)
+            pricing = profile.get("pricing") or {}
+            data.append({
+                "id": name,
+                "name": name.split("/")[-1],
+                "context_length": profile.get("context_length", 0),
+                "pricing": {"prompt": str(pricing.get("prompt", 0)), "completion": str(pricing.get("completion", 0))},
+            })
+        return data
+
+
+def _ttft_seconds(profile: Dict[str, Any], rng: random.Random) -> float:
+    ttft = profile.get("ttft_ms") or {}
+    median = max(float(ttft.get("median", 500)), 1.0)
+    p95 = max(float(ttft.get("p95", median)), median)
+    sigma = (math.log(p95) - math.log(median)) / 1.645
+    return rng.lognormvariate(math.log(median), sigma) / 1000
+
+
+def _prompt_tokens(messages: List[Dict[str, Any]]) -> int:
+    return sum(len(str(m.get("content", ""))) for m in messages) // 4 + 1
+
+
+def _error(status: int, message: str) -> JSONResponse:
+    return JSONResponse(status_code=status, content={"error": {"code": status, "message": message}})
+
+
+def _sse(data: Any) -> bytes:
+    return f"data: {json.dumps(data)}\n\n".encode()
+
+
+def create_app(fake: FakeOpenRouter) -> FastAPI:
+    app = FastAPI(title="Fake OpenRouter")
+
+    @app.post("/api/v1/chat/completions")
+    async def chat_completions(request: Request):
+        payload = await request.json()
+        model = payload.get("model", "")
+        messages = payload.get("messages") or []
+        profile = fake.profile(model)
+        rng = fake.rng(payload)
+
+        if fake.in_rate_limit_burst(profile):
+            fake.count(429)
+            return _error(429, f"{model} is temporarily rate-limited upstream")
+        if profile.get("reject_system_prompt") and any(m.get("role") == "system" for m in messages):
+            fake.count(400)
+            return _error(400, "Provider returned error: system messages are not supported")
+        if rng.random() < profile.get("error_rate", 0.0):
+            fake.count(500)
+            return _error(500, "Internal Server Error")
+
+        low, high = profile.get("completion_tokens", [150, 450])
+        n_tokens = rng.randint(low, high)
+        if payload.get("max_tokens"):
+            n_tokens = min(n_tokens, int(payload["max_tokens"]))
+        tps = profile.get("tokens_per_second", 60) * (1 + rng.uniform(-1, 1) * profile.get("tps_jitter", 0.0))
+        ttft = _ttft_seconds(profile, rng)
+        fail_at = rng.randint(1, max(n_tokens - 1, 1)) if rng.random() < profile.get("stream_error_rate", 0.0) else None
+        tokens = [rng.choice(WORDS) + " " for _ in range(n_tokens)]
+        tokens[0] = tokens[0].capitalize()
+
+        pricing = profile.get("pricing") or {}
+        prompt_tokens = _prompt_tokens(messages)
+        usage = {
+            "prompt_tokens": prompt_tokens,
+            "completion_tokens": n_tokens,
+            "total_tokens": prompt_tokens + n_tokens,
+            "cost": prompt_tokens * float(pricing.get("prompt", 0)) + n_tokens * float(pricing.get("completion", 0)),
+        }
+        completion_id = f"gen-fake-{uuid.UUID(int=rng.getrandbits(128)).hex}"
+        fake.count(200)
+
+        if not payload.get("stream"):
+            await asyncio.sleep(ttft + n_tokens / tps)
+            fake.stats["tokens_out"] += n_tokens
+            fake.stats["cost"] += usage["cost"]
+            return {
+                "id": completion_id,
+                "model": model,
+                "choices": [{"index": 0, "message": {"role": "assistant", "content": "".join(tokens)}, "finish_reason": "stop"}],
+                "usage": usage,
+            }
+
+        async def stream() -> AsyncGenerator[bytes, None]:
+            yield b": OPENROUTER PROCESSING\n\n"
+            start = time.monotonic() + ttft
+            for i, token in enumerate(tokens):
+                # Absolute schedule, so sleep jitter does not accumulate
+                delay = start + i / tps - time.monotonic()
+                if delay > 0:
+                    await asyncio.sleep(delay)
+                if fail_at is not None and i == fail_at:
+                    yield _sse({"id": completion_id, "error": {"code": 502, "message": "Upstream provider disconnected"}, "choices": []})
+                    return
+                yield _sse({"id": completion_id, "model": model, "choices": [{"index": 0, "delta": {"role": "assistant", "content": token}}]})
+                fake.stats["tokens_out"] += 1
+            yield _sse({"id": completion_id, "model": model, "choices": [{"index": 0, "delta": {}, "finish_reason": "stop"}]})
+            yield _sse({"id": completion_id, "model": model, "choices": [], "usage": usage})
+            fake.stats["cost"] += usage["cost"]
+            yield b"data: [DONE]\n\n"
+
+        return StreamingResponse(stream(), media_type="text/event-stream")
+
+    @app.get("/api/v1/models")
+    async def list_models():
+        return {"data": fake.models()}
+
+    @app.get("/api/v1/credits")
+    async def credits():
+        return {"data": {"total_credits": 1000.0, "total_usage": round(fake.stats["cost"], 6)}}
+
+    @app.get("/api/v1/auth/key")
+    async def auth_key():
+        return {"data": {"label": "fake-openrouter", "usage": round(fake.stats["cost"], 6), "limit": None, "is_free_tier": False}}
+
+    @app.get("/_stats")
+    async def stats():
+        return fake.stats
+
+    return app
+
+
+def load_profiles(path: Optional[str]) -> Dict[str, Any]:
+    if not path:
+        return DEFAULT_PROFILES
+    with open(path) as f:
+        custom = json.load(f)
+    return {
+        "default": {**DEFAULT_PROFILES["default"], **custom.get("default", {})},
+        "models": custom.get("models", DEFAULT_PROFILES["models"]),
+    }
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Fake OpenRouter server for offline load tests")
+    parser.add_argument("--host", default=os.getenv("FAKE_OPENROUTER_HOST", "127.0.0.1"))
+    parser.add_argument("--port", type=int, default=int(os.getenv("FAKE_OPENROUTER_PORT", "8090")))
+    parser.add_argument("--profiles", default=os.getenv("FAKE_OPENROUTER_PROFILES"), help="JSON file with latency profiles")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    app = create_app(FakeOpenRouter(load_profiles(args.profiles), seed=args.seed))
+    print(f"Fake OpenRouter on http://{args.host}:{args.port}/api/v1", file=sys.stderr)
+    uvicorn.run(app, host=args.host, port=args.port, log_level="warning")
@@ -0,0 +1,55 @@
+import os
+import sys
+
+# Add parent directory (backend) to path to allow importing app
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sqlalchemy import create_engine, delete
+from sqlalchemy.orm import sessionmaker
+from app.core.config import settings
+from app.models.models import Debate, ModelStats, Turn
+from app.services.leaderboard import resolve_winner, apply_debate_rollup
+
+# Rebuilds model_stats from scratch. Normally the rollups are maintained
+# incrementally by finish_debate_job; run this once after the migration to
+# include debates that finished before it, or after changing the parser.
+
+SYNC_DB_URL = settings.DATABASE_URL.replace("postgresql+asyncpg", "postgresql")
+BATCH_SIZE = 500
+
+
+def rebuild():
+    engine = create_engine(SYNC_DB_URL)
+    SessionLocal = sessionmaker(bind=engine)
+    db = SessionLocal()
+    try:
+        db.execute(delete(ModelStats))
+
+        count = 0
+        query = (
+            db.query(Debate)
+            .filter(Debate.status == "completed")
+            .order_by(Debate.created_at)
+            .yield_per(BATCH_SIZE)
+        )
+        for debate in query:
+            turns = db.query(Turn).filter(Turn.debate_id == debate.id, Turn.created_at >= debate.created_at).order_by(Turn.seq_index).all()
+
+            if debate.winner is None:
+                verdict = next((t for t in turns if t.turn_type == "verdict"), None)
+                if verdict:
+                    debate.winner, debate.winner_model_id = resolve_winner(debate.config_json or {}, verdict.text)
+
+            apply_debate_rollup(db, debate, turns)
+            count += 1
+            if count % BATCH_SIZE == 0:
+                print(f"Processed {count} debates...")
+
+        db.commit()
+        print(f"Rebuilt leaderboard from {count} debates.")
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    rebuild()
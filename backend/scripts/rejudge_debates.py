@@ -0,0 +1,70 @@
+import os
+import sys
+import argparse
+from datetime import datetime
+
+# Add parent directory (backend) to path to allow importing app
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from app.core.config import settings
+from app.models.models import RejudgeRun
+from app.services.export import naive_utc
+from app.services.rejudge import rejudge_page, run_is_stale
+
+# Re-judge stored debates with new judge models, in-process (the rejudger
+# worker does the same for POST /api/rejudge). Progress is checkpointed per
+# page; after an interruption run the same command again to resume:
+#   python scripts/rejudge_debates.py --run-id new-judge --judge openai/gpt-4o --judge anthropic/claude-3.5-sonnet
+#   python scripts/rejudge_debates.py --run-id new-judge   # resume
+# Verdicts go to the verdicts table; debates and turns are not modified.
+
+SYNC_DB_URL = settings.DATABASE_URL.replace("postgresql+asyncpg", "postgresql")
+
+
+def rejudge(run_id: str, judges, since, until, force: bool):
+    engine = create_engine(SYNC_DB_URL)
+    SessionLocal = sessionmaker(bind=engine)
+    db = SessionLocal()
+    try:
+        run = db.get(RejudgeRun, run_id)
+        if run is None:
+            if not judges:
+                sys.exit(f"Run {run_id} does not exist: pass --judge to create it")
+            run = RejudgeRun(id=run_id, judge_models=list(dict.fromkeys(judges)), since=since, until=until)
+            db.add(run)
+        elif run.status == "completed":
+            print(f"Run {run_id} is already completed.")
+            return
+        elif run.status == "running" and not run_is_stale(run) and not force:
+            sys.exit(f"Run {run_id} is being processed elsewhere (use --force if that process is gone)")
+        else:
+            print(f"Resuming {run_id} after {run.debates_done} debates...")
+        run.status = "running"
+        run.error = None
+        db.commit()
+
+        try:
+            while rejudge_page(db, run):
+                print(f"{run.debates_done} debates, {run.verdicts_done} verdicts, {run.failures} failures, ${run.cost:.4f}")
+        except BaseException:
+            # Ctrl-C or a crash: the last checkpoint stays; rerun to resume
+            db.rollback()
+            run.status = "paused"
+            db.commit()
+            raise
+        print(f"Rejudged {run.debates_done} debates: {run.verdicts_done} verdicts, {run.failures} failures, ${run.cost:.4f}.")
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Re-judge stored debates with new judge models")
+    parser.add_argument("--run-id", required=True, help="Name of the run; rerun with it to resume")
+    parser.add_argument("--judge", action="append", help="Judge model (repeatable); required for a new run")
+    parser.add_argument("--since", type=datetime.fromisoformat, help="Only debates created at or after this time (UTC)")
+    parser.add_argument("--until", type=datetime.fromisoformat, help="Only debates created before this time (UTC)")
+    parser.add_argument("--force", action="store_true", help="Resume a run marked as running")
+    args = parser.parse_args()
+    rejudge(args.run_id, args.judge, naive_utc(args.since), naive_utc(args.until), args.force)